@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""atr-ingress: pre-forked ingress workers, one per physical core.
+
+SIGHUP rolls the workers one at a time; SIGTERM/SIGINT drain and stop them.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "python"))
+
+from atr_core.api.supervisor import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
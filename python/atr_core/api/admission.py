@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import logging
+import math
+import random
+import time
+import zlib
+from enum import IntEnum
+from collections import Counter
+from typing import Callable, Iterable, Mapping, Sequence
+
+from atr_core.metrics import BP_STATE, BP_STATE_CHANGES
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressureState(IntEnum):
+    GREEN = 0
+    YELLOW = 1
+    ORANGE = 2
+    RED = 3
+
+
+# specs/backpressure_model.md: queue fill and latency (as a multiple of the
+# budget) at which each state is entered, and for recovery the fill a shard
+# must stay under, for how many consecutive windows, to step down one level.
+FILL_THRESHOLDS = (0.50, 0.80, 0.95)
+LATENCY_THRESHOLDS = (1.25, 2.0, 5.0)
+RECOVERY = {
+    BackpressureState.YELLOW: (0.30, 3),
+    BackpressureState.ORANGE: (0.60, 5),
+    BackpressureState.RED: (0.85, 10),
+}
+# A window in which at least this share of publishes failed puts the shard in RED.
+ERROR_RATE_RED = 0.5
+# Transport fill assumed when it reports itself overloaded (ORANGE) or cannot be reached (RED).
+OVERLOADED_FILL = 0.9
+UNREACHABLE_FILL = 1.0
+# The latency signal is this quantile of the window's handling latencies.
+# Past LATENCY_SAMPLES completions, reservoir sampling keeps the samples a
+# uniform draw from the window.
+LATENCY_QUANTILE = 0.99
+LATENCY_SAMPLES = 1024
+
+# Priority classes: P0 system/health, P1 governance, P2 normal, P3 best effort.
+# Lowest class (highest number) each state still admits.
+ADMITTED_PRIORITY = {
+    BackpressureState.GREEN: 3,
+    BackpressureState.YELLOW: 2,
+    BackpressureState.ORANGE: 1,
+    BackpressureState.RED: 0,
+}
+DEFAULT_PRIORITIES = {"system": 0, "health": 0, "governance": 1, "telemetry": 3}
+DEFAULT_PRIORITY = 2
+
+
+class AdmissionRejected(RuntimeError):
+    def __init__(self, shard: int, state: BackpressureState, reason: str, retry_after_s: int) -> None:
+        super().__init__(f"shard {shard} {state.name.lower()}: {reason}")
+        self.shard = shard
+        self.state = state
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class _Shard:
+    __slots__ = (
+        "state",
+        "in_flight",
+        "latency_s",
+        "window_end",
+        "peak_fill",
+        "latencies",
+        "completed",
+        "failed",
+        "calm_windows",
+    )
+
+    def __init__(self) -> None:
+        self.state = BackpressureState.GREEN
+        self.in_flight = 0
+        self.latency_s = 0.0
+        self.window_end = 0.0
+        self.peak_fill = 0.0
+        self.latencies: list[float] = []
+        self.completed = 0
+        self.failed = 0
+        self.calm_windows = 0
+
+
+class AdmissionController:
+    """Per-shard admission control for ingress, following the escalation ladder.
+
+    Each event type hashes to a shard. A shard's state comes from its own
+    in-flight fill and p99 handling latency over the last window, plus the
+    transport backlog reported by the sidecar or the tachyon queue. Escalation
+    is immediate; recovery steps down one level at a time after enough calm
+    windows. Higher states shed lower priority classes, and a shard at
+    capacity rejects everything. All state is plain attributes touched from
+    the event loop, so the request path takes no locks.
+    """
+
+    def __init__(
+        self,
+        shards: int = 8,
+        shard_capacity: int = 128,
+        latency_budget_s: float = 0.05,
+        window_s: float = 0.1,
+        priorities: Mapping[str, int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._capacity = max(1, shard_capacity)
+        self._budget = latency_budget_s
+        self._window = window_s
+        self._priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self._clock = clock
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._classes: dict[str, tuple[int, int]] = {}
+        self._transport: dict[str, float] = {}
+        self._transport_fill = 0.0
+        for shard in range(len(self._shards)):
+            BP_STATE.labels(shard=str(shard)).set(BackpressureState.GREEN)
+
+    def state(self, shard: int) -> BackpressureState:
+        return self._shards[shard].state
+
+    def classify(self, event_type: str) -> tuple[int, int]:
+        cached = self._classes.get(event_type)
+        if cached is None:
+            shard = zlib.crc32(event_type.encode("utf-8")) % len(self._shards)
+            priority = self._priorities.get(event_type.split(".", 1)[0], DEFAULT_PRIORITY)
+            cached = self._classes[event_type] = (shard, priority)
+        return cached
+
+    def admit(self, event_type: str) -> int:
+        """Reserve an in-flight slot and return the shard, or raise ``AdmissionRejected``."""
+        index = self._check(event_type)
+        self._shards[index].in_flight += 1
+        return index
+
+    def admit_batch(self, event_types: Sequence[str]) -> dict[str, int | AdmissionRejected]:
+        """Admit a batch: the shard, or the rejection, for each event type in it.
+
+        Every type is judged against the shards as they were before the batch,
+        and the batch then holds one in-flight slot per shard it lands on, so
+        a large batch is not rejected or escalated by its own size. Each item
+        is reported with ``observe`` and the slots returned with
+        ``release_batch``.
+        """
+        decisions: dict[str, int | AdmissionRejected] = {}
+        for event_type in Counter(event_types):
+            try:
+                decisions[event_type] = self._check(event_type)
+            except AdmissionRejected as exc:
+                decisions[event_type] = exc
+        for index in {decision for decision in decisions.values() if isinstance(decision, int)}:
+            self._shards[index].in_flight += 1
+        return decisions
+
+    def release(self, shard_index: int, latency_s: float, ok: bool = True) -> None:
+        self._shards[shard_index].in_flight -= 1
+        self.observe(shard_index, latency_s, ok)
+
+    def release_batch(self, shard_indexes: Iterable[int]) -> None:
+        for index in set(shard_indexes):
+            self._shards[index].in_flight -= 1
+
+    def observe(self, shard_index: int, latency_s: float, ok: bool = True) -> None:
+        """Record one handled item's latency and outcome."""
+        shard = self._shards[shard_index]
+        shard.completed += 1
+        if len(shard.latencies) < LATENCY_SAMPLES:
+            shard.latencies.append(latency_s)
+        else:
+            slot = random.randrange(shard.completed)
+            if slot < LATENCY_SAMPLES:
+                shard.latencies[slot] = latency_s
+        if not ok:
+            shard.failed += 1
+
+    def _check(self, event_type: str) -> int:
+        index, priority = self.classify(event_type)
+        shard = self._shards[index]
+        now = self._clock()
+        if now >= shard.window_end:
+            self._roll_window(index, shard, now)
+
+        fill = max(shard.in_flight / self._capacity, self._transport_fill)
+        if fill > shard.peak_fill:
+            shard.peak_fill = fill
+        fill_level = _level(fill, FILL_THRESHOLDS)
+        latency_level = _level(shard.latency_s / self._budget, LATENCY_THRESHOLDS)
+        if max(fill_level, latency_level) > shard.state:
+            reason = "queue" if fill_level >= latency_level else "latency"
+            self._transition(index, shard, BackpressureState(max(fill_level, latency_level)), reason)
+
+        if shard.in_flight >= self._capacity:
+            raise AdmissionRejected(index, shard.state, "queue_full", self._retry_after(shard))
+        if priority > ADMITTED_PRIORITY[shard.state]:
+            raise AdmissionRejected(index, shard.state, "shed", self._retry_after(shard))
+        return index
+
+    def observe_transport(self, source: str, fill: float, overloaded: bool = False) -> None:
+        """Record backlog of a shared transport as a fraction of its capacity."""
+        self._transport[source] = max(fill, OVERLOADED_FILL) if overloaded else fill
+        self._transport_fill = max(self._transport.values())
+
+    def _roll_window(self, index: int, shard: _Shard, now: float) -> None:
+        elapsed = 1 if shard.window_end == 0.0 else 1 + int((now - shard.window_end) / self._window)
+        shard.latency_s = _quantile(shard.latencies, LATENCY_QUANTILE)
+        error_rate = shard.failed / shard.completed if shard.completed else 0.0
+        peak_fill = max(shard.peak_fill, shard.in_flight / self._capacity, self._transport_fill)
+        shard.latencies, shard.completed, shard.failed = [], 0, 0
+        shard.peak_fill = 0.0
+        shard.window_end = now + self._window
+
+        if error_rate >= ERROR_RATE_RED:
+            shard.calm_windows = 0
+            if shard.state < BackpressureState.RED:
+                self._transition(index, shard, BackpressureState.RED, "transport")
+            return
+        if shard.state == BackpressureState.GREEN:
+            return
+        threshold, windows = RECOVERY[shard.state]
+        latency_level = _level(shard.latency_s / self._budget, LATENCY_THRESHOLDS)
+        if peak_fill < threshold and latency_level < shard.state:
+            # Idle windows since the last request count as calm ones.
+            shard.calm_windows += elapsed
+        else:
+            shard.calm_windows = 0
+        if shard.calm_windows >= windows:
+            shard.calm_windows = 0
+            self._transition(index, shard, BackpressureState(shard.state - 1), "recovered")
+
+    def _transition(self, index: int, shard: _Shard, state: BackpressureState, reason: str) -> None:
+        logger.warning(
+            "shard %d backpressure %s -> %s (%s; in_flight=%d/%d, latency=%.1fms, transport=%.0f%%)",
+            index,
+            shard.state.name,
+            state.name,
+            reason,
+            shard.in_flight,
+            self._capacity,
+            shard.latency_s * 1000,
+            self._transport_fill * 100,
+        )
+        BP_STATE_CHANGES.labels(shard=str(index), **{"from": shard.state.name, "to": state.name}).inc()
+        BP_STATE.labels(shard=str(index)).set(state)
+        shard.state = state
+        shard.calm_windows = 0
+
+    def _retry_after(self, shard: _Shard) -> int:
+        # Earliest a shard in this state can have stepped down one level.
+        windows = RECOVERY[shard.state][1] if shard.state else 1
+        return max(1, math.ceil(windows * self._window + shard.latency_s))
+
+
+def _quantile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _level(value: float, thresholds: tuple[float, float, float]) -> int:
+    level = 0
+    for threshold in thresholds:
+        if value > threshold:
+            level += 1
+    return level
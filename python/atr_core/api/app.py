@@ -1,64 +1,643 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from nacl.signing import SigningKey
+from starlette.concurrency import run_in_threadpool
 
-from atr_core.config import load_config
-from atr_core.core.immune import ImmunePipeline
-from atr_core.api.quarantine import serialize_for_quarantine
-from atr_core.transport.client import AtrTransportClient
+from atr_core.config import (
+    DEDUP_RUN_JOURNAL_ENV,
+    DEFAULT_CONFIG_PATH,
+    SHARD_COUNT_ENV,
+    SHARD_ENV,
+    load_config,
+    shard_config,
+)
+from atr_core.core.canonicalization import canonical_input, canonicalize_json
+from atr_core.core.dedup import IngressDedupStore
+from atr_core.core.immune import ImmunePipeline, ImmuneResult
+from atr_core.core.security import canonical_hash
+from atr_core.api.admission import UNREACHABLE_FILL, AdmissionController, AdmissionRejected
+from atr_core.api.ingest import decode_json, read_body
+from atr_core.api.quarantine import QuarantineSink, serialize_for_quarantine
+from atr_core.metrics import CP_SUBMIT_CALLS, TX_DISPATCH_DURATION, StageSampler, make_asgi_app
+from atr_core.store.ledger import LedgerStore, LedgerWriteError
+from atr_core.store.state import StateStore
+from atr_core.transport.aio import AsyncAtrTransportClient
+from atr_core.transport.tachyon import TachyonEgress, configure_packet_queue, packet_queue_depth
 
-config = load_config()
-immune = ImmunePipeline(config.envelope.schema_path, config.immune.ruleset_path)
-transport = AtrTransportClient(config.transport.target, config.transport.timeout_ms)
+if TYPE_CHECKING:
+    from atr_core.transport.batcher import PublishBatcher
+    from atr_core.transport.client import EnvelopeFrame
 
-app = FastAPI(title="ATR Core Server")
+logger = logging.getLogger(__name__)
 
+config = load_config(os.environ.get("ATR_CONFIG", DEFAULT_CONFIG_PATH))
+if SHARD_ENV in os.environ:
+    config = shard_config(
+        config,
+        int(os.environ[SHARD_ENV]),
+        int(os.environ.get(SHARD_COUNT_ENV, "1")),
+        os.environ.get(DEDUP_RUN_JOURNAL_ENV, ""),
+    )
+immune = ImmunePipeline(
+    config.envelope.schema_path,
+    config.immune.ruleset_path,
+    signature_cache_size=config.immune.signature_cache_size,
+    signature_cache_ttl_s=config.immune.signature_cache_ttl_s,
+    verify_workers=config.immune.verify_workers,
+    fast_schema_validation=config.immune.fast_schema_validation,
+    ruleset_reload_interval_s=config.immune.ruleset_reload_interval_s,
+    stage_sample_rate=config.metrics.stage_sample_rate,
+)
+transport: AsyncAtrTransportClient | PublishBatcher = AsyncAtrTransportClient(
+    config.transport.target,
+    config.transport.timeout_ms,
+    pool_size=config.transport.pool_size,
+    max_in_flight=config.transport.max_in_flight,
+    keepalive_ms=config.transport.keepalive_ms,
+    reconnect_backoff_ms=config.transport.reconnect_backoff_ms,
+    reconnect_backoff_max_ms=config.transport.reconnect_backoff_max_ms,
+)
+dedup: IngressDedupStore | None = (
+    IngressDedupStore(
+        window_s=config.dedup.window_s,
+        bucket_s=config.dedup.bucket_s,
+        max_entries=config.dedup.max_entries,
+        path=config.dedup.path or None,
+        shared=config.dedup.shared,
+    )
+    if config.dedup.enabled
+    else None
+)
+state_store = StateStore(
+    config.state.snapshot_path or None,
+    update_every_events=config.state.update_every_events,
+    update_every_seconds=config.state.update_every_seconds,
+)
+ledger: LedgerStore | None = (
+    LedgerStore(config.ledger.path, max_segment_bytes=config.ledger.max_segment_bytes, peers=config.ledger.peers)
+    if config.ledger.path
+    else None
+)
+sidecar = transport
+if config.transport.batch_publish:
+    from atr_core.transport.batcher import PublishBatcher
+
+    transport = PublishBatcher(
+        transport,
+        max_batch_size=config.transport.batch_max_size or None,
+        max_delay_us=config.transport.batch_max_delay_us or None,
+    )
+# The tachyon profile queues accepted envelopes in tachyon_core and persists
+# them to JetStream in the background instead of publishing per request.
+tachyon_egress: TachyonEgress | None = None
+if config.profile == "tachyon":
+    configure_packet_queue(config.backpressure.tachyon_queue_capacity)
+    tachyon_egress = TachyonEgress(shard=int(os.environ.get(SHARD_ENV, "0")))
+
+quarantine_sink: QuarantineSink | None = None
+if config.immune.quarantine_queue_size > 0:
+    quarantine_sink = QuarantineSink(
+        lambda canonical_envelope, correlation_id: _dispatch(
+            canonical_envelope, config.immune.quarantine_subject, correlation_id, "quarantine"
+        ),
+        max_queue=config.immune.quarantine_queue_size,
+        batch_size=config.immune.quarantine_batch_size,
+        spill_path=config.immune.quarantine_spill_path or None,
+        retry_interval_s=config.immune.quarantine_retry_interval_s,
+        max_spill_bytes=config.immune.quarantine_spill_max_bytes,
+    )
+admission: AdmissionController | None = (
+    AdmissionController(
+        shards=config.backpressure.shards,
+        shard_capacity=config.backpressure.shard_capacity,
+        latency_budget_s=config.backpressure.latency_budget_ms / 1000.0,
+        window_s=config.backpressure.window_ms / 1000.0,
+        priorities=config.backpressure.priorities or None,
+    )
+    if config.backpressure.enabled
+    else None
+)
+_dispatch_stages = StageSampler(TX_DISPATCH_DURATION, config.metrics.stage_sample_rate, transport="grpc")
+_egress_stages = StageSampler(TX_DISPATCH_DURATION, config.metrics.stage_sample_rate, transport="tachyon")
+
+
+def warm_up() -> None:
+    """Run a throwaway signed envelope through the batch and single paths so
+    the first real request does not pay for lazy initialization."""
+    signing_key = SigningKey.generate()
+    envelope: dict[str, Any] = {
+        "header": {
+            "id": "00000000-0000-7000-8000-000000000000",
+            "timestamp": time.time_ns(),
+            "source_agent": signing_key.verify_key.encode().hex(),
+            "type": "system.warm_up",
+            "version": "2.0.0",
+        },
+        "meta": {"security_level": "public", "correlation_id": "warm-up"},
+        "payload": {"warm_up": True},
+    }
+    digest = canonical_hash(canonicalize_json(canonical_input(envelope)))
+    envelope["signature"] = base64.urlsafe_b64encode(signing_key.sign(digest).signature).decode().rstrip("=")
+    immune.evaluate_many([envelope])
+    immune.evaluate(envelope)
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if quarantine_sink is not None:
+        quarantine_sink.start()  # replays envelopes spilled by a previous run
+    if tachyon_egress is not None:
+        tachyon_egress.start(sidecar.publish_batch)
+    health_poller = asyncio.create_task(_poll_sidecar_health()) if admission is not None else None
+    follower = asyncio.create_task(_follow_stream()) if config.state.subscribe_subject else None
+    yield
+    for task in (health_poller, follower):
+        if task is not None:
+            task.cancel()
+    if quarantine_sink is not None:
+        await quarantine_sink.close()
+    if tachyon_egress is not None:
+        await tachyon_egress.close()
+    await transport.close()
+    immune.close()
+    if dedup is not None:
+        dedup.close()
+    state_store.close()
+    if ledger is not None:
+        ledger.close()
+
+
+async def _poll_sidecar_health() -> None:
+    # Feeds the sidecar backlog into admission control; an unreachable
+    # sidecar puts every shard in RED instead of letting publishes time out.
+    assert admission is not None
+    interval = config.backpressure.health_poll_interval_ms / 1000.0
+    while True:
+        try:
+            health = await sidecar.health()
+        except Exception as exc:  # noqa: BLE001 - any failure means no capacity
+            logger.debug("sidecar health poll failed: %s", exc)
+            admission.observe_transport("sidecar", UNREACHABLE_FILL)
+        else:
+            admission.observe_transport(
+                "sidecar",
+                health.backlog_msgs / config.backpressure.sidecar_backlog_high_watermark,
+                overloaded=health.overloaded,
+            )
+        if tachyon_egress is not None:
+            # Lets the tachyon fill fall again while submissions are shed.
+            admission.observe_transport("tachyon", packet_queue_depth() / config.backpressure.tachyon_queue_capacity)
+        await asyncio.sleep(interval)
+
+
+async def _follow_stream() -> None:
+    # Materializes /v1/state from the stream, resuming after the last
+    # sequence already applied (e.g. restored from the snapshot). A
+    # subscription that ends or fails is reopened with backoff.
+    subject = config.state.subscribe_subject
+    backoff = config.transport.reconnect_backoff_ms / 1000.0
+    backoff_max = config.transport.reconnect_backoff_max_ms / 1000.0
+    failures = 0
+    while True:
+        applied = state_store.stream_sequence
+        subscription = sidecar.subscribe(
+            subject,
+            durable_name=config.state.subscribe_durable,
+            max_in_flight=config.state.subscribe_max_in_flight,
+            resume_after=applied,
+        )
+        try:
+            await subscription.run(_apply_frames)
+        except Exception:  # noqa: BLE001 - logged; the subscription is reopened
+            logger.exception("state stream subscription on %r failed", subject)
+        else:
+            logger.warning("state stream subscription on %r ended", subject)
+        finally:
+            await subscription.close()
+        failures = 1 if state_store.stream_sequence > applied else failures + 1
+        delay = min(backoff_max, backoff * (2 ** (failures - 1)))
+        logger.info("reopening state stream subscription on %r in %.2fs", subject, delay)
+        await asyncio.sleep(delay)
+
+
+async def _apply_frames(frames: list[EnvelopeFrame]) -> None:
+    for frame in frames:
+        state_store.apply_frame(frame.canonical_envelope, frame.stream_sequence)
+
+
+app = FastAPI(title="ATR Core Server", lifespan=_lifespan)
+if make_asgi_app is not None:
+    app.mount("/metrics", make_asgi_app())
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+# Pre-canonicalized submissions: the body is the canonical bytes of
+# {header, meta, payload} and the signature travels in SIGNATURE_HEADER.
+CANONICAL_MEDIA_TYPE = "application/octet-stream"
+SIGNATURE_HEADER = "x-atr-signature"
+# Raw body limits enforced before JSON decoding.
+MAX_ENVELOPE_BYTES = config.envelope.max_payload_bytes + config.envelope.envelope_overhead_bytes
+MAX_BATCH_BYTES = MAX_ENVELOPE_BYTES * config.envelope.max_batch_envelopes
+
+
+def _correlation_id(envelope: Any) -> str:
+    meta = envelope.get("meta") if isinstance(envelope, dict) else None
+    correlation_id = meta.get("correlation_id", "") if isinstance(meta, dict) else ""
+    return correlation_id if isinstance(correlation_id, str) else ""
+
+
+def _dedup_key(envelope: Any) -> tuple[str, str] | None:
+    if dedup is None or not isinstance(envelope, dict):
+        return None
+    header = envelope.get("header")
+    event_id = header.get("id") if isinstance(header, dict) else None
+    signature = envelope.get("signature")
+    if isinstance(event_id, str) and isinstance(signature, str):
+        return event_id, signature
+    return None
+
+
+def _lookup_duplicates(keys: list[tuple[str, str] | None]) -> list[int | None]:
+    return [None if key is None or dedup is None else dedup.lookup(*key) for key in keys]
+
+
+async def _duplicate_sequences(keys: list[tuple[str, str] | None]) -> list[int | None]:
+    # A shared journal takes a file lock and may replay other workers'
+    # appends, so its lookups leave the event loop.
+    if dedup is not None and dedup.shared:
+        return await run_in_threadpool(_lookup_duplicates, keys)
+    return _lookup_duplicates(keys)
+
+
+async def _record_published(
+    envelope: dict[str, Any],
+    canonical_envelope: bytes,
+    stream_sequence: int,
+    dedup_key: tuple[str, str] | None,
+) -> None:
+    if dedup_key is not None and dedup is not None:
+        if dedup.shared:
+            await run_in_threadpool(dedup.record, *dedup_key, stream_sequence)
+        else:
+            dedup.record(*dedup_key, stream_sequence)
+    if ledger is not None and ledger.healthy:
+        # The envelope is published either way; a failed ledger was logged by its writer.
+        try:
+            ledger.enqueue(envelope["header"]["id"], stream_sequence, canonical_envelope)
+        except LedgerWriteError:
+            pass
+
+
+async def _dispatch(canonical_envelope: bytes, subject: str, correlation_id: str, phase: str) -> Any:
+    clock = _dispatch_stages.start()
+    ack = await transport.publish(
+        canonical_envelope=canonical_envelope,
+        subject=subject,
+        correlation_id=correlation_id,
+    )
+    if clock is not None:
+        clock.mark(phase)
+    return ack
+
+
+async def _publish_accepted(envelope: dict[str, Any], canonical_envelope: bytes, correlation_id: str) -> Any:
+    subject = f"aether.stream.core.{envelope['header']['type']}"
+    if tachyon_egress is None:
+        return await _dispatch(canonical_envelope, subject, correlation_id, "publish")
+    clock = _egress_stages.start()
+    ack = tachyon_egress.publish(envelope["header"], canonical_envelope, subject, correlation_id)
+    if clock is not None:
+        clock.mark("publish")
+    if admission is not None:
+        fill = ack.queue_depth / config.backpressure.tachyon_queue_capacity if ack.accepted else UNREACHABLE_FILL
+        admission.observe_transport("tachyon", fill)
+    return ack
+
+
+def _enqueue_quarantine(quarantine_bytes: bytes, correlation_id: str) -> bool:
+    # The sink publishes in the background; False means publish inline.
+    return quarantine_sink is not None and quarantine_sink.submit(quarantine_bytes, correlation_id)
+
+
+def _event_type(envelope: Any) -> str:
+    header = envelope.get("header") if isinstance(envelope, dict) else None
+    event_type = header.get("type", "") if isinstance(header, dict) else ""
+    return event_type if isinstance(event_type, str) else ""
+
+
+def _admit(envelope: Any) -> int | None:
+    # Returns the reserved shard (None without admission control); raises
+    # AdmissionRejected when that shard is overloaded.
+    if admission is None:
+        return None
+    return admission.admit(_event_type(envelope))
+
+
+def _admit_batch(envelopes: list[Any]) -> list[int | AdmissionRejected | None]:
+    # Per envelope: the shard, or the rejection; None without admission control.
+    if admission is None:
+        return [None] * len(envelopes)
+    event_types = [_event_type(envelope) for envelope in envelopes]
+    decisions = admission.admit_batch(event_types)
+    return [decisions[event_type] for event_type in event_types]
+
+
+def _release(shard: int | None, started: float, failed: bool) -> None:
+    if admission is not None and shard is not None:
+        admission.release(shard, time.perf_counter() - started, ok=not failed)
+
+
+def _observe(shard: int | None, started: float, failed: bool) -> None:
+    if admission is not None and shard is not None:
+        admission.observe(shard, time.perf_counter() - started, ok=not failed)
+
+
+def _count_submit(mode: str, decision: str) -> None:
+    CP_SUBMIT_CALLS.labels(mode=mode, decision=decision).inc()
+
+
+def _reject_status(reason: str) -> int:
+    return 403 if "signature" in reason or "ruleset" in reason else 400
 
 
 @app.post("/v1/submit", status_code=202)
-def submit_envelope(envelope: dict[str, Any]) -> dict[str, Any]:
-    result = immune.evaluate(envelope)
-    correlation_id = envelope.get("meta", {}).get("correlation_id", "")
+async def submit(request: Request) -> dict[str, Any]:
+    body = await read_body(request, MAX_ENVELOPE_BYTES)
+    try:
+        envelope = decode_json(body)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"malformed envelope body: {exc}") from exc
+    if not isinstance(envelope, dict):
+        raise HTTPException(status_code=422, detail="envelope must be a JSON object")
+
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if content_type != CANONICAL_MEDIA_TYPE:
+        return await submit_envelope(envelope)
+    signature = request.headers.get(SIGNATURE_HEADER)
+    if not signature:
+        raise HTTPException(status_code=400, detail=f"canonical submissions need a {SIGNATURE_HEADER} header")
+    envelope["signature"] = signature
+    return await submit_envelope(envelope, canonical_bytes=body)
+
+
+async def submit_envelope(envelope: dict[str, Any], canonical_bytes: bytes | None = None) -> dict[str, Any]:
+    # Retries of an already published event skip the immune pipeline entirely.
+    dedup_key = _dedup_key(envelope)
+    (duplicate_sequence,) = await _duplicate_sequences([dedup_key])
+    if duplicate_sequence is not None:
+        _count_submit("single", "duplicate")
+        return {"accepted": True, "stream_sequence": duplicate_sequence, "duplicate": True}
+
+    try:
+        shard = _admit(envelope)
+    except AdmissionRejected as exc:
+        _count_submit("single", "throttled")
+        raise HTTPException(
+            status_code=429,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after_s)},
+        ) from exc
+    started = time.perf_counter()
+    failed = False
+    try:
+        return await _submit_admitted(envelope, canonical_bytes, dedup_key)
+    except HTTPException as exc:
+        failed = exc.status_code == 503
+        raise
+    finally:
+        _release(shard, started, failed)
+
+
+async def _submit_admitted(
+    envelope: dict[str, Any],
+    canonical_bytes: bytes | None,
+    dedup_key: tuple[str, str] | None,
+) -> dict[str, Any]:
+    # Schema, canonicalization and signature checks are CPU work; keep them off the event loop.
+    if canonical_bytes is None:
+        result = await run_in_threadpool(immune.evaluate, envelope)
+    else:
+        result = await run_in_threadpool(immune.evaluate, envelope, canonical_bytes)
+    correlation_id = _correlation_id(envelope)
 
     if result.accepted:
         try:
-            ack = transport.publish(
-                canonical_envelope=result.canonical_envelope,
-                subject=f"aether.stream.core.{envelope['header']['type']}",
-                correlation_id=correlation_id,
-            )
+            ack = await _publish_accepted(envelope, result.canonical_envelope, correlation_id)
         except Exception as exc:  # pragma: no cover - defensive transport boundary
+            _count_submit("single", "unavailable")
             raise HTTPException(status_code=503, detail=f"publish unavailable: {exc}") from exc
         if not ack.accepted:
+            _count_submit("single", "unavailable")
             raise HTTPException(status_code=503, detail=ack.error_message or "publish rejected")
+        await _record_published(envelope, result.canonical_envelope, ack.stream_sequence, dedup_key)
+        _count_submit("single", "accepted")
         return {"accepted": True, "stream_sequence": ack.stream_sequence}
 
     quarantine_bytes = serialize_for_quarantine(envelope, result.canonical_envelope)
-    try:
-        quarantine_ack = transport.publish(
-            canonical_envelope=quarantine_bytes,
-            subject=config.immune.quarantine_subject,
-            correlation_id=correlation_id,
-        )
-    except Exception as exc:  # pragma: no cover - defensive transport boundary
-        raise HTTPException(status_code=503, detail=f"quarantine publish unavailable: {exc}") from exc
-    if not quarantine_ack.accepted:
+    if not _enqueue_quarantine(quarantine_bytes, correlation_id):
+        try:
+            quarantine_ack = await _dispatch(
+                quarantine_bytes,
+                config.immune.quarantine_subject,
+                correlation_id,
+                "quarantine",
+            )
+        except Exception as exc:  # pragma: no cover - defensive transport boundary
+            _count_submit("single", "unavailable")
+            raise HTTPException(status_code=503, detail=f"quarantine publish unavailable: {exc}") from exc
+        if not quarantine_ack.accepted:
+            _count_submit("single", "unavailable")
+            raise HTTPException(
+                status_code=503,
+                detail=quarantine_ack.error_message or "quarantine publish rejected",
+            )
+
+    _count_submit("single", "rejected")
+    raise HTTPException(status_code=_reject_status(result.reason), detail=result.reason)
+
+
+@app.post("/v1/submit/batch")
+async def submit_batch(request: Request, response: Response) -> dict[str, Any]:
+    body = await read_body(request, MAX_BATCH_BYTES)
+    envelopes = _parse_batch(body, request.headers.get("content-type", ""))
+    if len(envelopes) > config.envelope.max_batch_envelopes:
         raise HTTPException(
-            status_code=503,
-            detail=quarantine_ack.error_message or "quarantine publish rejected",
+            status_code=413,
+            detail=f"batch exceeds {config.envelope.max_batch_envelopes} envelopes",
         )
+    keys = [_dedup_key(envelope) for envelope in envelopes]
+    duplicates = await _duplicate_sequences(keys)
+    shards: dict[int, int | None] = {}
+    throttled: dict[int, AdmissionRejected] = {}
+    pending = [index for index, sequence in enumerate(duplicates) if sequence is None]
+    for index, decision in zip(pending, _admit_batch([envelopes[index] for index in pending])):
+        if isinstance(decision, AdmissionRejected):
+            throttled[index] = decision
+        else:
+            shards[index] = decision
+    started = time.perf_counter()
+    try:
+        evaluated = dict(zip(shards, await immune.evaluate_many_async([envelopes[index] for index in shards])))
+        results = await asyncio.gather(
+            *(
+                _duplicate_result(index, sequence)
+                if sequence is not None
+                else _throttled_result(index, throttled[index])
+                if index in throttled
+                else _admitted_result(index, envelopes[index], evaluated[index], keys[index], shards[index], started)
+                for index, sequence in enumerate(duplicates)
+            )
+        )
+    finally:
+        if admission is not None:
+            admission.release_batch(shard for shard in shards.values() if shard is not None)
+    for item in results:
+        _count_submit("batch", "duplicate" if item.get("duplicate") else item["status"])
+    if throttled:
+        response.headers["Retry-After"] = str(max(exc.retry_after_s for exc in throttled.values()))
+    return {
+        "accepted": sum(1 for item in results if item["status"] == "accepted"),
+        "rejected": sum(1 for item in results if item["status"] == "rejected"),
+        "results": results,
+    }
+
+
+def _parse_batch(body: bytes, content_type: str) -> list[Any]:
+    try:
+        if content_type.split(";", 1)[0].strip().lower() in NDJSON_MEDIA_TYPES:
+            return [decode_json(line) for line in body.splitlines() if line.strip()]
+        envelopes = decode_json(body)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"malformed batch body: {exc}") from exc
+    if not isinstance(envelopes, list):
+        raise HTTPException(status_code=400, detail="batch body must be a JSON array or NDJSON stream")
+    return envelopes
+
+
+async def _duplicate_result(index: int, stream_sequence: int) -> dict[str, Any]:
+    return {
+        "index": index,
+        "status": "accepted",
+        "status_code": 202,
+        "stream_sequence": stream_sequence,
+        "duplicate": True,
+    }
+
+
+async def _throttled_result(index: int, rejected: AdmissionRejected) -> dict[str, Any]:
+    return {
+        "index": index,
+        "status": "throttled",
+        "status_code": 429,
+        "reason": str(rejected),
+        "retry_after_s": rejected.retry_after_s,
+    }
+
+
+async def _admitted_result(
+    index: int,
+    envelope: Any,
+    result: ImmuneResult,
+    dedup_key: tuple[str, str] | None,
+    shard: int | None,
+    started: float,
+) -> dict[str, Any]:
+    failed = True
+    try:
+        item = await _publish_result(index, envelope, result, dedup_key)
+        failed = item["status"] == "unavailable"
+        return item
+    finally:
+        _observe(shard, started, failed)
+
+
+async def _publish_result(
+    index: int,
+    envelope: Any,
+    result: ImmuneResult,
+    dedup_key: tuple[str, str] | None = None,
+) -> dict[str, Any]:
+    correlation_id = _correlation_id(envelope)
+
+    if result.accepted:
+        try:
+            ack = await _publish_accepted(envelope, result.canonical_envelope, correlation_id)
+        except Exception as exc:  # pragma: no cover - defensive transport boundary
+            return {
+                "index": index,
+                "status": "unavailable",
+                "status_code": 503,
+                "reason": f"publish unavailable: {exc}",
+            }
+        if not ack.accepted:
+            return {
+                "index": index,
+                "status": "unavailable",
+                "status_code": 503,
+                "reason": ack.error_message or "publish rejected",
+            }
+        await _record_published(envelope, result.canonical_envelope, ack.stream_sequence, dedup_key)
+        return {"index": index, "status": "accepted", "status_code": 202, "stream_sequence": ack.stream_sequence}
+
+    quarantine_bytes = serialize_for_quarantine(envelope, result.canonical_envelope)
+    if not _enqueue_quarantine(quarantine_bytes, correlation_id):
+        try:
+            quarantine_ack = await _dispatch(
+                quarantine_bytes,
+                config.immune.quarantine_subject,
+                correlation_id,
+                "quarantine",
+            )
+        except Exception as exc:  # pragma: no cover - defensive transport boundary
+            return {
+                "index": index,
+                "status": "unavailable",
+                "status_code": 503,
+                "reason": f"quarantine publish unavailable: {exc}",
+            }
+        if not quarantine_ack.accepted:
+            return {
+                "index": index,
+                "status": "unavailable",
+                "status_code": 503,
+                "reason": quarantine_ack.error_message or "quarantine publish rejected",
+            }
 
-    status = 403 if "signature" in result.reason or "ruleset" in result.reason else 400
-    raise HTTPException(status_code=status, detail=result.reason)
+    return {
+        "index": index,
+        "status": "rejected",
+        "status_code": _reject_status(result.reason),
+        "reason": result.reason,
+        "quarantined": True,
+    }
 
 
 @app.get("/v1/state/{key}")
 def query_state(key: str) -> dict[str, Any]:
-    return {"key": key, "state": None, "status": "stub"}
+    found, value = state_store.lookup(key)
+    if not found:
+        raise HTTPException(status_code=404, detail=f"no state for key {key!r}")
+    return {"key": key, "state": value, "stream_sequence": state_store.stream_sequence}
 
 
 @app.get("/v1/ledger/{event_id}")
 def query_ledger(event_id: str) -> dict[str, Any]:
-    return {"event_id": event_id, "entry": None, "status": "stub"}
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="ledger is not configured")
+    entry = ledger.get(event_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"no ledger entry for {event_id}")
+    return {
+        "event_id": entry.event_id,
+        "stream_sequence": entry.stream_sequence,
+        "entry": json.loads(entry.canonical_envelope),
+    }
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi import HTTPException, Request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+async def read_body(request: Request, limit: int) -> bytes:
+    """Read the raw request body, refusing anything larger than ``limit`` bytes.
+
+    A declared ``Content-Length`` is checked before any byte is read; chunked
+    bodies are cut off as soon as the running count passes the limit.
+    """
+    declared = request.headers.get("content-length")
+    if declared is not None:
+        try:
+            length = int(declared)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="invalid Content-Length") from exc
+        if length > limit:
+            raise HTTPException(status_code=413, detail=f"request body exceeds {limit} bytes")
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"request body exceeds {limit} bytes")
+    return bytes(body)
+
+
+def decode_json(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity literals and >64-bit integers: let json decide
+    return json.loads(data)
@@ -1,8 +1,30 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
 
 from atr_core.core.canonicalization import CanonicalizationError, canonical_input, canonicalize_json
+from atr_core.metrics import CP_QUARANTINE_DROPPED
+
+logger = logging.getLogger(__name__)
+
+# envelope length, correlation id length, crc32 of both
+_SPILL_RECORD = struct.Struct("<III")
+# Replay progress: offset in the spill file up to which records are published.
+PROGRESS_SUFFIX = ".pos"
+_PROGRESS = struct.Struct("<Q")
+_SCAN_RECORDS = 256
+
+QuarantineItem = tuple[bytes, str]
+QuarantinePublish = Callable[[bytes, str], Awaitable[Any]]
 
 
 def serialize_for_quarantine(envelope: dict[str, Any], canonical_envelope: bytes) -> bytes:
@@ -12,3 +34,318 @@ def serialize_for_quarantine(envelope: dict[str, Any], canonical_envelope: bytes
         return canonicalize_json(canonical_input(envelope))
     except (KeyError, TypeError, CanonicalizationError):
         return canonicalize_json(envelope)
+
+
+@dataclass(frozen=True)
+class QuarantineStats:
+    queued: int
+    published: int
+    spilled: int
+    replayed: int
+    spill_bytes: int
+    dropped: int = 0
+
+
+class QuarantineSink:
+    """Publishes quarantined envelopes off the request path.
+
+    ``submit`` only appends to a bounded in-memory queue, or to the spill file
+    once the queue is full, and never waits on the sidecar. A background task
+    publishes the queue in batches. Batches the sidecar fails to acknowledge
+    go to the append-only spill file (or are held in memory without one) and
+    are replayed once the retry interval has passed.
+
+    The spill file is capped at ``max_spill_bytes``; records that do not fit
+    are dropped and counted in ``atr_cp_quarantine_dropped_total``. Replay
+    reads it a batch at a time in the default executor and records its
+    progress in a ``.pos`` file after each acknowledged batch prefix, so a
+    restart or close mid-replay does not publish those records again. The
+    file is truncated once fully replayed.
+    """
+
+    def __init__(
+        self,
+        publish: QuarantinePublish,
+        max_queue: int = 10000,
+        batch_size: int = 64,
+        spill_path: str | None = None,
+        retry_interval_s: float = 1.0,
+        max_spill_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self._publish = publish
+        self._max_queue = max(1, max_queue)
+        self._batch_size = max(1, batch_size)
+        self._retry_interval = retry_interval_s
+        self._queue: deque[QuarantineItem] = deque()
+        self._held: list[QuarantineItem] = []
+        self._retry_at = 0.0
+        self._worker: asyncio.Task[None] | None = None
+        self._inflight: asyncio.Future[list[QuarantineItem]] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._published = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._dropped = 0
+        self._max_spill_bytes = max_spill_bytes
+        self._replay_offset = 0
+        self._unsynced = False
+        self._progress_fd: int | None = None
+        self._spill_path = Path(spill_path) if spill_path else None
+        self._spill = None
+        if self._spill_path is not None:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            valid = _truncate_torn_tail(self._spill_path)
+            self._spill = open(self._spill_path, "ab")
+            self._progress_fd = os.open(
+                self._spill_path.with_name(self._spill_path.name + PROGRESS_SUFFIX), os.O_RDWR | os.O_CREAT, 0o644
+            )
+            saved = os.pread(self._progress_fd, _PROGRESS.size, 0)
+            offset = _PROGRESS.unpack(saved)[0] if len(saved) == _PROGRESS.size else 0
+            self._replay_offset = offset if offset <= valid else 0
+
+    def submit(self, canonical_envelope: bytes, correlation_id: str = "") -> bool:
+        # False means the envelope was not taken: the caller must publish it.
+        if len(self._queue) + len(self._held) < self._max_queue:
+            self._queue.append((canonical_envelope, correlation_id))
+        elif self._spill is None or not self._write_spill([(canonical_envelope, correlation_id)], drop=False):
+            return False
+        self.start()
+        assert self._wakeup is not None
+        self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+    def stats(self) -> QuarantineStats:
+        return QuarantineStats(
+            queued=len(self._queue) + len(self._held),
+            published=self._published,
+            spilled=self._spilled,
+            replayed=self._replayed,
+            spill_bytes=self._spill.tell() if self._spill is not None else 0,
+            dropped=self._dropped,
+        )
+
+    async def close(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        # A batch the worker was publishing when cancelled is finished, not lost.
+        unacknowledged = await self._inflight if self._inflight is not None else []
+        self._inflight = None
+        pending = unacknowledged + self._held + list(self._queue)
+        self._held, self._queue = [], deque()
+        failed = await self._publish_batch(pending) if pending else []
+        if failed:
+            if self._spill is not None:
+                self._write_spill(failed)
+            else:
+                logger.error("dropping %d quarantined envelopes: sidecar unavailable at shutdown", len(failed))
+                self._drop(len(failed), "shutdown")
+        if self._spill is not None:
+            self._spill.flush()
+            os.fsync(self._spill.fileno())
+            self._spill.close()
+            self._spill = None
+        if self._progress_fd is not None:
+            os.close(self._progress_fd)
+            self._progress_fd = None
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if self._unsynced:
+                await self._sync_spill()
+            delay = self._retry_at - time.monotonic()
+            if delay > 0:
+                # Sidecar unavailable: move queued items to disk and wait.
+                if self._spill is not None and self._queue:
+                    self._write_spill(self._drain(len(self._queue)))
+                    await self._sync_spill()
+                await asyncio.sleep(delay)
+                continue
+            if self._held or self._spill_pending():
+                if not await self._replay():
+                    self._retry_at = time.monotonic() + self._retry_interval
+                continue
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            failed = await self._publish_shielded(self._drain(self._batch_size))
+            if failed:
+                self._hold(failed)
+                self._retry_at = time.monotonic() + self._retry_interval
+
+    def _drain(self, count: int) -> list[QuarantineItem]:
+        return [self._queue.popleft() for _ in range(min(count, len(self._queue)))]
+
+    async def _publish_shielded(self, items: list[QuarantineItem]) -> list[QuarantineItem]:
+        self._inflight = asyncio.ensure_future(self._publish_batch(items))
+        failed = await asyncio.shield(self._inflight)
+        self._inflight = None
+        return failed
+
+    async def _publish_batch(self, items: list[QuarantineItem]) -> list[QuarantineItem]:
+        acked = await self._send(items)
+        return [item for item, ok in zip(items, acked) if not ok]
+
+    async def _send(self, items: list[QuarantineItem]) -> list[bool]:
+        acks = await asyncio.gather(
+            *(self._publish(envelope, correlation_id) for envelope, correlation_id in items),
+            return_exceptions=True,
+        )
+        acked = [not isinstance(ack, BaseException) and getattr(ack, "accepted", False) for ack in acks]
+        self._published += sum(acked)
+        return acked
+
+    def _hold(self, items: list[QuarantineItem]) -> None:
+        if self._spill is not None:
+            self._write_spill(items)
+        else:
+            self._held.extend(items)
+
+    async def _replay(self) -> bool:
+        while self._held:
+            batch, self._held = self._held[: self._batch_size], self._held[self._batch_size :]
+            failed = await self._publish_shielded(batch)
+            self._replayed += len(batch) - len(failed)
+            if failed:
+                self._held = failed + self._held
+                return False
+        if not self._spill_pending():
+            return True
+
+        assert self._spill is not None and self._spill_path is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            self._spill.flush()
+            limit = self._spill.tell()
+            if self._replay_offset >= limit:
+                self._reset_spill()
+                return True
+            records, ends = await loop.run_in_executor(
+                None, _read_spill, self._spill_path, self._replay_offset, limit, self._batch_size
+            )
+            if not records:
+                logger.warning("skipping %d corrupt bytes in %s", limit - self._replay_offset, self._spill_path)
+                self._set_replay_offset(limit)
+                continue
+            self._inflight = asyncio.ensure_future(self._replay_batch(records, ends))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+            if self._replay_offset != ends[-1]:
+                return False
+
+    async def _replay_batch(self, records: list[QuarantineItem], ends: list[int]) -> list[QuarantineItem]:
+        # Progress is recorded inside the shielded publish, so a close() that
+        # lands mid-batch keeps it; records past a failure stay in the file.
+        acked = await self._send(records)
+        done = next((index for index, ok in enumerate(acked) if not ok), len(acked))
+        self._replayed += done
+        if done:
+            self._set_replay_offset(ends[done - 1])
+        return []
+
+    def _set_replay_offset(self, offset: int) -> None:
+        assert self._progress_fd is not None
+        self._replay_offset = offset
+        os.pwrite(self._progress_fd, _PROGRESS.pack(offset), 0)
+
+    def _reset_spill(self) -> None:
+        assert self._spill is not None
+        self._spill.truncate(0)
+        self._spill.seek(0)
+        self._set_replay_offset(0)
+
+    def _spill_pending(self) -> bool:
+        return self._spill is not None and self._spill.tell() > self._replay_offset
+
+    def _write_spill(self, items: Iterable[QuarantineItem], drop: bool = True) -> bool:
+        # Appends what fits under max_spill_bytes. The rest is dropped and
+        # counted, or with drop=False nothing is written and False returned.
+        assert self._spill is not None
+        records = [_encode_spill(envelope, correlation_id) for envelope, correlation_id in items]
+        room = self._max_spill_bytes - self._spill.tell()
+        fits = 0
+        for record in records:
+            if len(record) > room:
+                break
+            room -= len(record)
+            fits += 1
+        if fits < len(records) and not drop:
+            return False
+        for record in records[:fits]:
+            self._spill.write(record)
+        self._spill.flush()
+        self._spilled += fits
+        self._unsynced = self._unsynced or fits > 0
+        if fits < len(records):
+            logger.error("spill file %s full: dropping %d quarantined envelopes", self._spill_path, len(records) - fits)
+            self._drop(len(records) - fits, "spill_full")
+        return fits == len(records)
+
+    async def _sync_spill(self) -> None:
+        if self._spill is None:
+            return
+        self._unsynced = False
+        await asyncio.get_running_loop().run_in_executor(None, os.fsync, self._spill.fileno())
+
+    def _drop(self, count: int, reason: str) -> None:
+        self._dropped += count
+        CP_QUARANTINE_DROPPED.labels(reason=reason).inc(count)
+
+
+def _encode_spill(envelope: bytes, correlation_id: str) -> bytes:
+    correlation = correlation_id.encode("utf-8")
+    checksum = zlib.crc32(correlation, zlib.crc32(envelope))
+    return _SPILL_RECORD.pack(len(envelope), len(correlation), checksum) + envelope + correlation
+
+
+def _read_spill(path: Path, offset: int, limit: int, max_records: int) -> tuple[list[QuarantineItem], list[int]]:
+    # Reads up to max_records whole records between offset and limit, with
+    # the end offset of each; stops early at a torn or corrupt record.
+    records: list[QuarantineItem] = []
+    ends: list[int] = []
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        while len(records) < max_records and offset + _SPILL_RECORD.size <= limit:
+            envelope_length, correlation_length, checksum = _SPILL_RECORD.unpack(handle.read(_SPILL_RECORD.size))
+            end = offset + _SPILL_RECORD.size + envelope_length + correlation_length
+            if end > limit:
+                break
+            body = handle.read(envelope_length + correlation_length)
+            envelope, correlation = body[:envelope_length], body[envelope_length:]
+            if zlib.crc32(correlation, zlib.crc32(envelope)) != checksum:
+                break
+            records.append((envelope, correlation.decode("utf-8")))
+            ends.append(end)
+            offset = end
+    return records, ends
+
+
+def _truncate_torn_tail(path: Path) -> int:
+    # A crash mid-append leaves a torn record at the end; cut it off so new
+    # appends start on a record boundary. Returns the resulting size.
+    if not path.exists():
+        return 0
+    size = path.stat().st_size
+    valid = 0
+    while True:
+        _, ends = _read_spill(path, valid, size, _SCAN_RECORDS)
+        if not ends:
+            break
+        valid = ends[-1]
+    if valid != size:
+        logger.warning("discarding %d corrupt bytes at the end of %s", size - valid, path)
+        with open(path, "r+b") as handle:
+            handle.truncate(valid)
+    return valid
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import select
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from atr_core.config import (
+    DEDUP_RUN_JOURNAL_ENV,
+    DEFAULT_CONFIG_PATH,
+    SHARD_COUNT_ENV,
+    SHARD_ENV,
+    ServiceConfig,
+    load_config,
+)
+
+logger = logging.getLogger(__name__)
+
+SYSFS_CPU = Path("/sys/devices/system/cpu")
+# A worker that keeps dying is respawned at most this often.
+RESPAWN_INTERVAL_S = 1.0
+LISTEN_BACKLOG = 2048
+
+
+class WorkerStartError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class WorkerSpec:
+    shard: int
+    shard_count: int
+    cpu: int | None
+    ready_fd: int
+
+    def ready(self) -> None:
+        """Tell the supervisor this worker is serving."""
+        os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+WorkerTarget = Callable[[WorkerSpec], None]
+
+
+def physical_cores(cpus: Iterable[int], sysfs: Path = SYSFS_CPU) -> list[int]:
+    """One logical CPU per physical core among ``cpus`` (SMT siblings dropped).
+
+    Falls back to every CPU in ``cpus`` when the topology is not readable.
+    """
+    seen: set[tuple[str, str]] = set()
+    cores: list[int] = []
+    for cpu in sorted(cpus):
+        topology = sysfs / f"cpu{cpu}" / "topology"
+        try:
+            key = ((topology / "physical_package_id").read_text().strip(), (topology / "core_id").read_text().strip())
+        except OSError:
+            return sorted(cpus)
+        if key not in seen:
+            seen.add(key)
+            cores.append(cpu)
+    return cores
+
+
+def available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class Supervisor:
+    """Pre-forks one worker process per shard and keeps them running.
+
+    Each worker is forked before anything opens a channel or loads the
+    pipeline, is pinned to its own core and signals readiness only
+    once it is serving. ``rolling_restart`` replaces workers one shard at a
+    time, stopping the old process only after its replacement is ready, and
+    keeps the old one if the replacement fails to start.
+    """
+
+    def __init__(
+        self,
+        target: WorkerTarget,
+        workers: int,
+        cpus: list[int] | None = None,
+        ready_timeout_s: float = 60.0,
+        graceful_timeout_s: float = 30.0,
+    ) -> None:
+        self._target = target
+        self._count = max(1, workers)
+        self._cpus = cpus or []
+        self._ready_timeout = ready_timeout_s
+        self._graceful_timeout = graceful_timeout_s
+        self._pids: dict[int, int] = {}
+        self._respawn_at: dict[int, float] = {}
+        self._restart_requested = False
+        self._stop_requested = False
+
+    @property
+    def pids(self) -> dict[int, int]:
+        """Current worker pid per shard."""
+        return dict(self._pids)
+
+    def start(self) -> None:
+        for shard in range(self._count):
+            self._pids[shard] = self._spawn(shard)
+
+    def rolling_restart(self) -> None:
+        for shard in range(self._count):
+            if self._stop_requested:
+                return
+            try:
+                pid = self._spawn(shard)
+            except WorkerStartError as exc:
+                logger.error("shard %d: replacement failed (%s); keeping the running worker", shard, exc)
+                continue
+            old = self._pids.get(shard)
+            self._pids[shard] = pid
+            if old is not None:
+                self._terminate([old])
+
+    def stop(self) -> None:
+        pids, self._pids = list(self._pids.values()), {}
+        self._terminate(pids)
+
+    def request_restart(self) -> None:
+        self._restart_requested = True
+
+    def request_stop(self) -> None:
+        self._stop_requested = True
+
+    def serve_forever(self, poll_interval_s: float = 0.2) -> None:
+        handlers = {
+            signal.SIGHUP: lambda *_: self.request_restart(),
+            signal.SIGTERM: lambda *_: self.request_stop(),
+            signal.SIGINT: lambda *_: self.request_stop(),
+        }
+        previous = {signum: signal.signal(signum, handler) for signum, handler in handlers.items()}
+        try:
+            if not self._pids:
+                self.start()
+            while not self._stop_requested:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    logger.info("rolling restart of %d workers", self._count)
+                    self.rolling_restart()
+                self._reap()
+                time.sleep(poll_interval_s)
+        finally:
+            self.stop()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def _reap(self) -> None:
+        # Only called between restarts, so every pid here is a current worker.
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            shard = next((shard for shard, worker in self._pids.items() if worker == pid), None)
+            if shard is None:
+                continue
+            logger.error("shard %d: worker %d exited with status %d", shard, pid, os.waitstatus_to_exitcode(status))
+            del self._pids[shard]
+            self._respawn_at[shard] = max(time.monotonic(), self._respawn_at.get(shard, 0.0))
+        now = time.monotonic()
+        for shard in [shard for shard in range(self._count) if shard not in self._pids]:
+            if now < self._respawn_at.get(shard, 0.0):
+                continue
+            self._respawn_at[shard] = now + RESPAWN_INTERVAL_S
+            try:
+                self._pids[shard] = self._spawn(shard)
+            except WorkerStartError as exc:
+                logger.error("shard %d: respawn failed (%s)", shard, exc)
+
+    def _spawn(self, shard: int) -> int:
+        cpu = self._cpus[shard % len(self._cpus)] if self._cpus else None
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            os.close(read_fd)
+            code = 0
+            try:
+                for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                    signal.signal(signum, signal.SIG_DFL)
+                if cpu is not None:
+                    os.sched_setaffinity(0, {cpu})
+                self._target(WorkerSpec(shard, self._count, cpu, write_fd))
+            except BaseException:  # noqa: BLE001 - the child must never return into the supervisor
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+
+        os.close(write_fd)
+        try:
+            ready, _, _ = select.select([read_fd], [], [], self._ready_timeout)
+            signalled = bool(ready) and os.read(read_fd, 1) == b"1"
+        finally:
+            os.close(read_fd)
+        if not signalled:
+            self._terminate([pid], graceful_timeout_s=0.0)
+            raise WorkerStartError("worker exited before it was ready" if ready else "worker not ready in time")
+        logger.info("shard %d: worker %d ready%s", shard, pid, "" if cpu is None else f" on cpu {cpu}")
+        return pid
+
+    def _terminate(self, pids: list[int], graceful_timeout_s: float | None = None) -> None:
+        timeout = self._graceful_timeout if graceful_timeout_s is None else graceful_timeout_s
+        for pid in pids:
+            _signal(pid, signal.SIGTERM if timeout > 0 else signal.SIGKILL)
+        deadline = time.monotonic() + timeout
+        killed = timeout <= 0
+        pending = set(pids)
+        while pending:
+            for pid in list(pending):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    pending.discard(pid)
+            if pending and not killed and time.monotonic() >= deadline:
+                for pid in pending:
+                    logger.warning("worker %d did not stop in %.0fs; killing it", pid, timeout)
+                    _signal(pid, signal.SIGKILL)
+                killed = True
+            if pending:
+                time.sleep(0.05)
+
+
+def _signal(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _listen(host: str, port: int) -> socket.socket:
+    # Every worker binds its own listener on the shared port; the kernel
+    # spreads connections across them (SO_REUSEPORT).
+    return socket.create_server((host, port), backlog=LISTEN_BACKLOG, reuse_port=True)
+
+
+def serve_ingress(spec: WorkerSpec, host: str, port: int, log_level: str = "info") -> None:
+    """Worker body: build the app for this shard, warm it up and serve."""
+    os.environ[SHARD_ENV] = str(spec.shard)
+    os.environ[SHARD_COUNT_ENV] = str(spec.shard_count)
+    import uvicorn
+
+    from atr_core.api import app as app_module
+
+    app_module.warm_up()
+    listener = _listen(host, port)
+    server = uvicorn.Server(uvicorn.Config(app_module.app, log_level=log_level, access_log=False))
+    original_startup = server.startup
+
+    async def startup(sockets: list[socket.socket] | None = None) -> None:
+        await original_startup(sockets=sockets)
+        if server.started:
+            spec.ready()
+
+    server.startup = startup  # type: ignore[method-assign]
+    server.run(sockets=[listener])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="atr-ingress", description="Pre-forked ATR ingress workers, one per core")
+    parser.add_argument("--config", default=os.environ.get("ATR_CONFIG", DEFAULT_CONFIG_PATH))
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per physical core)")
+    parser.add_argument("--no-pin", action="store_true", help="do not pin workers to cores")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    os.environ["ATR_CONFIG"] = args.config
+    config = load_config(args.config)
+    service: ServiceConfig = config.service
+    host = args.host or service.host
+    port = args.port if args.port is not None else service.port
+    cores = physical_cores(available_cpus())
+    workers = args.workers or service.workers or len(cores)
+    pin = service.pin_workers and not args.no_pin and hasattr(os, "sched_setaffinity")
+
+    # Fail here, not in every worker, if the port cannot be bound.
+    _listen(host, port).close()
+    supervisor = Supervisor(
+        lambda spec: serve_ingress(spec, host, port, args.log_level),
+        workers,
+        cpus=cores if pin else None,
+        graceful_timeout_s=service.graceful_timeout_s,
+    )
+    run_dir = None
+    if workers > 1 and config.dedup.enabled and not config.dedup.path:
+        # Memory-only dedup: the workers share a journal that lives and dies with this run.
+        run_dir = tempfile.mkdtemp(prefix="atr-ingress-")
+        os.environ[DEDUP_RUN_JOURNAL_ENV] = str(Path(run_dir) / "dedup.journal")
+    logger.info("starting %d ingress workers on %s:%d (SIGHUP: rolling restart)", workers, host, port)
+    try:
+        supervisor.serve_forever()
+    except WorkerStartError as exc:
+        logger.error("ingress workers failed to start: %s", exc)
+        return 1
+    finally:
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
+    return 0
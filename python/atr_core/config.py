@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
 
@@ -11,18 +11,92 @@ import yaml
 class TransportConfig:
     target: str
     timeout_ms: int
+    pool_size: int = 4
+    max_in_flight: int = 1024
+    keepalive_ms: int = 30000
+    reconnect_backoff_ms: int = 100
+    reconnect_backoff_max_ms: int = 5000
+    batch_publish: bool = False
+    batch_max_size: int = 0
+    batch_max_delay_us: int = 0
 
 
 @dataclass(frozen=True)
 class ImmuneConfig:
     ruleset_path: str
     quarantine_subject: str
+    signature_cache_size: int = 65536
+    signature_cache_ttl_s: float = 300.0
+    verify_workers: int = 0
+    fast_schema_validation: bool = True
+    ruleset_reload_interval_s: float = 0.0
+    quarantine_queue_size: int = 0
+    quarantine_batch_size: int = 64
+    quarantine_spill_path: str = ""
+    quarantine_retry_interval_s: float = 1.0
+    quarantine_spill_max_bytes: int = 256 * 1024 * 1024
 
 
 @dataclass(frozen=True)
 class EnvelopeConfig:
     schema_path: str
     max_payload_bytes: int
+    max_batch_envelopes: int = 1024
+    envelope_overhead_bytes: int = 4096
+
+
+@dataclass(frozen=True)
+class DedupConfig:
+    enabled: bool = True
+    window_s: float = 300.0
+    bucket_s: float = 5.0
+    max_entries: int = 1_048_576
+    path: str = ""
+    shared: bool = False
+
+
+@dataclass(frozen=True)
+class StateConfig:
+    snapshot_path: str = ""
+    update_every_events: int = 1000
+    update_every_seconds: float = 300.0
+    subscribe_subject: str = ""
+    subscribe_durable: str = "atr-core-state"
+    subscribe_max_in_flight: int = 1024
+
+
+@dataclass(frozen=True)
+class LedgerConfig:
+    path: str = ""
+    max_segment_bytes: int = 64 * 1024 * 1024
+    peers: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    stage_sample_rate: float = 0.0
+
+
+@dataclass(frozen=True)
+class BackpressureConfig:
+    enabled: bool = False
+    shards: int = 8
+    shard_capacity: int = 128
+    latency_budget_ms: float = 50.0
+    window_ms: float = 100.0
+    health_poll_interval_ms: float = 1000.0
+    sidecar_backlog_high_watermark: int = 100_000
+    tachyon_queue_capacity: int = 65_536
+    priorities: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    host: str = "0.0.0.0"
+    port: int = 8080
+    workers: int = 0
+    pin_workers: bool = True
+    graceful_timeout_s: float = 30.0
 
 
 @dataclass(frozen=True)
@@ -30,23 +104,116 @@ class AppConfig:
     transport: TransportConfig
     immune: ImmuneConfig
     envelope: EnvelopeConfig
+    dedup: DedupConfig = DedupConfig()
+    state: StateConfig = StateConfig()
+    ledger: LedgerConfig = LedgerConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    backpressure: BackpressureConfig = BackpressureConfig()
+    service: ServiceConfig = ServiceConfig()
+    profile: str = "containerized"
 
 
-def load_config(path: str = "configs/default.yaml") -> AppConfig:
+DEFAULT_CONFIG_PATH = "configs/default.yaml"
+# Set by atr-ingress in each worker process.
+SHARD_ENV = "ATR_SHARD_ID"
+SHARD_COUNT_ENV = "ATR_SHARD_COUNT"
+# Journal atr-ingress creates for one run when dedup.path is empty.
+DEDUP_RUN_JOURNAL_ENV = "ATR_DEDUP_RUN_JOURNAL"
+
+
+def load_config(path: str = DEFAULT_CONFIG_PATH) -> AppConfig:
     config_path = _resolve_config_path(path)
     raw: dict[str, Any] = yaml.safe_load(config_path.read_text())
+    profile = raw.get("profile")
+    if "atr" not in raw and profile:
+        # Profile files (configs/tachyon.yaml) only name a profile; the
+        # runtime settings come from the default config.
+        config_path = _resolve_config_path(DEFAULT_CONFIG_PATH)
+        raw = yaml.safe_load(config_path.read_text())
     atr = raw["atr"]
-    return AppConfig(
+    snapshot = atr.get("state", {}).get("snapshot", {})
+    subscribe = atr.get("state", {}).get("subscribe", {})
+    config = AppConfig(
         transport=TransportConfig(**atr["transport_grpc"]),
         immune=ImmuneConfig(
             ruleset_path=_resolve_data_path(atr["immune"]["ruleset_path"], config_path),
             quarantine_subject=atr["immune"]["quarantine_subject"],
+            signature_cache_size=atr["immune"].get("signature_cache_size", 65536),
+            signature_cache_ttl_s=atr["immune"].get("signature_cache_ttl_s", 300.0),
+            verify_workers=atr["immune"].get("verify_workers", 0),
+            fast_schema_validation=atr["immune"].get("fast_schema_validation", True),
+            ruleset_reload_interval_s=atr["immune"].get("ruleset_reload_interval_s", 0.0),
+            quarantine_queue_size=atr["immune"].get("quarantine_queue_size", 0),
+            quarantine_batch_size=atr["immune"].get("quarantine_batch_size", 64),
+            quarantine_spill_path=atr["immune"].get("quarantine_spill_path", ""),
+            quarantine_retry_interval_s=atr["immune"].get("quarantine_retry_interval_s", 1.0),
+            quarantine_spill_max_bytes=atr["immune"].get("quarantine_spill_max_bytes", 256 * 1024 * 1024),
         ),
         envelope=EnvelopeConfig(
             schema_path=_resolve_data_path(atr["envelope"]["schema_path"], config_path),
             max_payload_bytes=atr["envelope"]["max_payload_bytes"],
+            max_batch_envelopes=atr["envelope"].get("max_batch_envelopes", 1024),
+            envelope_overhead_bytes=atr["envelope"].get("envelope_overhead_bytes", 4096),
+        ),
+        dedup=DedupConfig(**atr.get("dedup", {})),
+        state=StateConfig(
+            snapshot_path=snapshot.get("path", ""),
+            update_every_events=snapshot.get("update_every_events", 1000),
+            update_every_seconds=snapshot.get("update_every_seconds", 300.0),
+            subscribe_subject=subscribe.get("subject", ""),
+            subscribe_durable=subscribe.get("durable_name", "atr-core-state"),
+            subscribe_max_in_flight=subscribe.get("max_in_flight", 1024),
         ),
+        ledger=LedgerConfig(**atr.get("ledger", {})),
+        metrics=MetricsConfig(**atr.get("metrics", {})),
+        backpressure=BackpressureConfig(**atr.get("backpressure", {})),
+        service=ServiceConfig(**atr.get("service", {})),
+        profile=profile or atr.get("mode", "containerized"),
     )
+    if config.immune.quarantine_queue_size > 0 and not config.immune.quarantine_spill_path:
+        # Without a spill file, queued quarantine records are lost on a crash
+        # and dropped at shutdown if the sidecar is down.
+        raise ValueError("immune.quarantine_queue_size > 0 requires immune.quarantine_spill_path")
+    return config
+
+
+def shard_config(config: AppConfig, shard_id: int, shard_count: int = 1, run_dedup_path: str = "") -> AppConfig:
+    """Config for one of ``shard_count`` atr-ingress workers.
+
+    File-backed state and the stream durable get a per-shard name. Retries
+    can reach any worker, so with several workers the dedup journal is shared
+    (``run_dedup_path``, scoped to this run, if no path is configured) and
+    each ledger also reads the other shards' ledgers.
+    """
+    dedup = config.dedup
+    if shard_count > 1 and dedup.enabled:
+        path = dedup.path or run_dedup_path
+        if not path:
+            raise ValueError("dedup.path is required when several workers share the dedup window")
+        dedup = replace(dedup, path=path, shared=True)
+    ledger_paths = [_shard_path(config.ledger.path, shard) for shard in range(shard_count)]
+    return replace(
+        config,
+        immune=replace(config.immune, quarantine_spill_path=_shard_path(config.immune.quarantine_spill_path, shard_id)),
+        dedup=dedup,
+        state=replace(
+            config.state,
+            snapshot_path=_shard_path(config.state.snapshot_path, shard_id),
+            subscribe_durable=f"{config.state.subscribe_durable}-shard{shard_id}",
+        ),
+        ledger=replace(
+            config.ledger,
+            path=_shard_path(config.ledger.path, shard_id),
+            peers=tuple(path for shard, path in enumerate(ledger_paths) if path and shard != shard_id),
+        ),
+    )
+
+
+def _shard_path(path: str, shard_id: int) -> str:
+    if not path:
+        return path
+    candidate = Path(path)
+    return str(candidate.with_name(f"{candidate.stem}.shard{shard_id}{candidate.suffix}"))
 
 
 def _resolve_config_path(path: str) -> Path:
@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import json
 import math
+import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Any
+from json.encoder import encode_basestring
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 
 CANONICALIZATION_CODE_ALIASES: dict[str, str] = {
@@ -21,6 +28,156 @@ class CanonicalizationError(ValueError):
     message: str
 
 
+def resolve_canonicalization_code(code: str) -> str:
+    return CANONICALIZATION_CODE_ALIASES.get(code, code)
+
+
+def legacy_canonicalization_code(code: str) -> str:
+    return LEGACY_CANONICALIZATION_CODES.get(code, code)
+
+
+def canonical_input(envelope: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "header": envelope["header"],
+        "meta": envelope.get("meta", {}),
+        "payload": envelope["payload"],
+    }
+
+
+CANONICAL_CHUNK_PARTS = 512
+NOT_CANONICAL_CODE = "CANON_NOT_CANONICAL"
+
+_INT_REPR = int.__repr__
+# Number spellings where orjson and float.__repr__ can disagree: any exponent
+# (1e16 vs 1e+16, 1e-7 vs 1e-07) and magnitudes in [1e-5, 1e-4), which orjson
+# writes out in full and repr in exponent form. False hits inside strings only
+# cost the slow path.
+_ORJSON_DIVERGENT = re.compile(rb"\d[eE]|0\.0000")
+_FLOAT_REPR = float.__repr__
+
+
+def _nfc(value: str) -> str:
+    if value.isascii():
+        return value
+    return unicodedata.normalize("NFC", value)
+
+
+def _emit(
+    value: Any,
+    write: Callable[[str], Any],
+    checkpoint: Callable[[], None] | None = None,
+) -> None:
+    # Single pass: validate, NFC-normalize, sort and encode while walking the
+    # tree once. Code point order of NFC strings equals their UTF-8 byte order,
+    # so keys sort natively without re-encoding.
+    if isinstance(value, str):
+        write(encode_basestring(_nfc(value)))
+    elif value is None:
+        write("null")
+    elif value is True:
+        write("true")
+    elif value is False:
+        write("false")
+    elif isinstance(value, int):
+        write(_INT_REPR(value))
+    elif isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            raise CanonicalizationError("CANON_INVALID_NUMBER", "non-finite number")
+        write(_FLOAT_REPR(value))
+    elif isinstance(value, dict):
+        normalized: dict[str, Any] = {}
+        for key, inner in value.items():
+            if not isinstance(key, str):
+                raise CanonicalizationError("CANON_NON_STRING_KEY", "map key must be string")
+            normalized_key = _nfc(key)
+            if normalized_key in normalized:
+                raise CanonicalizationError(
+                    "CANON_DUPLICATE_KEY_AFTER_NORMALIZATION",
+                    "duplicate map key after NFC normalization",
+                )
+            normalized[normalized_key] = inner
+        write("{")
+        separator = ""
+        for key in sorted(normalized):
+            write(separator)
+            write(encode_basestring(key))
+            write(":")
+            _emit(normalized[key], write, checkpoint)
+            separator = ","
+        write("}")
+        if checkpoint is not None:
+            checkpoint()
+    elif isinstance(value, list):
+        write("[")
+        separator = ""
+        for item in value:
+            write(separator)
+            _emit(item, write, checkpoint)
+            separator = ","
+        write("]")
+        if checkpoint is not None:
+            checkpoint()
+    else:
+        raise CanonicalizationError("CANON_FORBIDDEN_TYPE", f"unsupported type: {type(value)!r}")
+
+
+def canonicalize_json(value: Any) -> bytes:
+    parts: list[str] = []
+    _emit(value, parts.append)
+    try:
+        return "".join(parts).encode("utf-8")
+    except UnicodeEncodeError as exc:
+        raise CanonicalizationError("CANON_ENCODING_ERROR", str(exc)) from exc
+
+
+def canonicalize_json_into(
+    value: Any,
+    sink: Callable[[bytes], Any],
+    chunk_parts: int = CANONICAL_CHUNK_PARTS,
+) -> int:
+    # Streams UTF-8 chunks into sink (e.g. hasher.update) so the full
+    # canonical string is never materialized. Returns the bytes written.
+    parts: list[str] = []
+    written = 0
+
+    def flush() -> None:
+        nonlocal written
+        try:
+            chunk = "".join(parts).encode("utf-8")
+        except UnicodeEncodeError as exc:
+            raise CanonicalizationError("CANON_ENCODING_ERROR", str(exc)) from exc
+        parts.clear()
+        written += len(chunk)
+        sink(chunk)
+
+    def checkpoint() -> None:
+        if len(parts) >= chunk_parts:
+            flush()
+
+    _emit(value, parts.append, checkpoint)
+    flush()
+    return written
+
+
+def is_canonical(data: bytes, value: Any) -> bool:
+    # data is canonical iff it equals the canonical encoding of its own parse.
+    # For ASCII bodies (no NFC concerns) orjson's sorted compact output is
+    # byte-identical to ours except for the float spellings matched by
+    # _ORJSON_DIVERGENT, so a match there is decided in C; anything else
+    # falls back to the full encoder.
+    if orjson is not None and data.isascii() and _ORJSON_DIVERGENT.search(data) is None:
+        try:
+            if orjson.dumps(value, option=orjson.OPT_SORT_KEYS) == data:
+                return True
+        except TypeError:  # orjson.JSONEncodeError, e.g. integers over 64 bits
+            pass
+    return canonicalize_json(value) == data
+
+
+# Reference two-pass encoder (normalize, then encode). Kept as the executable
+# spec for differential tests and benchmarks; not used on the ingress path.
+
+
 def _normalize(value: Any) -> Any:
     if isinstance(value, bool) or value is None:
         return value
@@ -50,22 +207,6 @@ def _normalize(value: Any) -> Any:
     raise CanonicalizationError("CANON_FORBIDDEN_TYPE", f"unsupported type: {type(value)!r}")
 
 
-def resolve_canonicalization_code(code: str) -> str:
-    return CANONICALIZATION_CODE_ALIASES.get(code, code)
-
-
-def legacy_canonicalization_code(code: str) -> str:
-    return LEGACY_CANONICALIZATION_CODES.get(code, code)
-
-
-def canonical_input(envelope: dict[str, Any]) -> dict[str, Any]:
-    return {
-        "header": envelope["header"],
-        "meta": envelope.get("meta", {}),
-        "payload": envelope["payload"],
-    }
-
-
 def _encode_string(value: str) -> str:
     return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
 
@@ -85,7 +226,7 @@ def _encode_canonical(value: Any) -> str:
     )
 
 
-def canonicalize_json(value: Any) -> bytes:
+def canonicalize_json_reference(value: Any) -> bytes:
     normalized = _normalize(value)
     try:
         return _encode_canonical(normalized).encode("utf-8")
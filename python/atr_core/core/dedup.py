@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+JOURNAL_MAGIC = b"ATRDDUP1"
+_HEADER = struct.Struct("<8sQQ")  # magic, capacity, records appended (next slot = appended % capacity)
+_RECORD = struct.Struct("<QQQQ")  # id hash, id timestamp ms, stream sequence, signature hash
+
+
+@dataclass(frozen=True)
+class DedupStats:
+    hits: int
+    misses: int
+    entries: int
+    evictions: int
+
+
+def uuid7_timestamp_ms(event_id: object) -> int | None:
+    # UUIDv7 leads with a 48-bit unix millisecond timestamp.
+    if not isinstance(event_id, str) or len(event_id) != 36:
+        return None
+    try:
+        return int(event_id[:8] + event_id[9:13], 16)
+    except ValueError:
+        return None
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class IngressDedupStore:
+    """Remembers the stream sequence of recently published event ids.
+
+    IDs are hashed into a ring of time buckets keyed by their UUIDv7
+    timestamp, so expiry is dropping whole buckets rather than scanning
+    entries. A duplicate only matches when the signature is identical too.
+
+    With ``shared=True`` several processes (atr-ingress workers) use one
+    journal: appends take an exclusive ``flock`` on it, and a lookup that
+    misses first replays whatever the other processes appended since.
+    Both can block on the lock, so async callers should run them in a thread.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 300.0,
+        bucket_s: float = 5.0,
+        max_entries: int = 1_048_576,
+        path: str | None = None,
+        shared: bool = False,
+    ) -> None:
+        if shared and not path:
+            raise ValueError("a shared dedup store needs a journal path")
+        self._bucket_ms = max(1, int(bucket_s * 1000))
+        self._window_ms = max(self._bucket_ms, int(window_s * 1000))
+        self._bucket_count = -(-self._window_ms // self._bucket_ms) + 1
+        self._bucket_limit = max(1, max_entries // self._bucket_count)
+        self._epochs = [-1] * self._bucket_count
+        self._buckets: list[dict[int, tuple[int, int]]] = [{} for _ in range(self._bucket_count)]
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._journal: mmap.mmap | None = None
+        self._journal_fd: int | None = None
+        self._shared = shared
+        self._capacity = self._bucket_limit * self._bucket_count
+        self._appended = 0
+        if path:
+            self._open_journal(Path(path))
+
+    @property
+    def shared(self) -> bool:
+        return self._shared
+
+    def __len__(self) -> int:
+        oldest = (self._now_ms() - self._window_ms) // self._bucket_ms
+        return sum(len(bucket) for bucket, epoch in zip(self._buckets, self._epochs) if epoch >= oldest)
+
+    def lookup(self, event_id: str, signature: str) -> int | None:
+        timestamp_ms = uuid7_timestamp_ms(event_id)
+        bucket = self._bucket_for(timestamp_ms, self._now_ms()) if timestamp_ms is not None else None
+        if bucket is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        id_hash, signature_hash = _hash64(event_id), _hash64(signature)
+        with self._lock:
+            sequence = self._match(bucket, id_hash, signature_hash)
+            if sequence is None and self._shared:
+                self._catch_up()
+                sequence = self._match(bucket, id_hash, signature_hash)
+            if sequence is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return sequence
+
+    def record(self, event_id: str, signature: str, stream_sequence: int) -> None:
+        timestamp_ms = uuid7_timestamp_ms(event_id)
+        if timestamp_ms is None:
+            return
+        id_hash, signature_hash = _hash64(event_id), _hash64(signature)
+        with self._lock:
+            if not self._shared:
+                if self._insert(timestamp_ms, id_hash, stream_sequence, signature_hash, self._now_ms()):
+                    self._append_journal(id_hash, timestamp_ms, stream_sequence, signature_hash)
+                return
+            with _flock(self._journal_fd, fcntl.LOCK_EX):
+                self._replay_appended()
+                if self._insert(timestamp_ms, id_hash, stream_sequence, signature_hash, self._now_ms()):
+                    self._append_journal(id_hash, timestamp_ms, stream_sequence, signature_hash)
+
+    def stats(self) -> DedupStats:
+        with self._lock:
+            return DedupStats(self._hits, self._misses, len(self), self._evictions)
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.flush()
+            self._journal.close()
+            self._journal = None
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+
+    def _now_ms(self) -> int:
+        return time.time_ns() // 1_000_000
+
+    def _bucket_for(self, timestamp_ms: int, now_ms: int) -> tuple[int, int] | None:
+        # IDs outside [now - window, now + one bucket] are not tracked: older
+        # ones have expired and far-future ones would alias live buckets.
+        if not now_ms - self._window_ms <= timestamp_ms <= now_ms + self._bucket_ms:
+            return None
+        epoch = timestamp_ms // self._bucket_ms
+        return epoch % self._bucket_count, epoch
+
+    def _match(self, bucket: tuple[int, int], id_hash: int, signature_hash: int) -> int | None:
+        if self._epochs[bucket[0]] != bucket[1]:
+            return None
+        entry = self._buckets[bucket[0]].get(id_hash)
+        return entry[0] if entry is not None and entry[1] == signature_hash else None
+
+    def _insert(self, timestamp_ms: int, id_hash: int, sequence: int, signature_hash: int, now_ms: int) -> bool:
+        bucket = self._bucket_for(timestamp_ms, now_ms)
+        if bucket is None:
+            return False
+        index, epoch = bucket
+        entries = self._buckets[index]
+        if self._epochs[index] != epoch:
+            if self._epochs[index] > epoch:
+                return False  # slot already reused by a newer bucket
+            self._evictions += len(entries)
+            entries.clear()
+            self._epochs[index] = epoch
+        entries[id_hash] = (sequence, signature_hash)
+        if len(entries) > self._bucket_limit:
+            del entries[next(iter(entries))]
+            self._evictions += 1
+        return True
+
+    def _open_journal(self, path: Path) -> None:
+        size = _HEADER.size + self._capacity * _RECORD.size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Held while sizing and replaying so concurrent openers of a
+            # shared journal do not reset it under each other.
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            existing = os.fstat(fd).st_size
+            if existing != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            journal = mmap.mmap(fd, size)
+
+            magic, capacity, appended = _HEADER.unpack_from(journal, 0)
+            if magic != JOURNAL_MAGIC or capacity != self._capacity:
+                journal[: _HEADER.size] = _HEADER.pack(JOURNAL_MAGIC, self._capacity, 0)
+                journal[_HEADER.size :] = bytes(size - _HEADER.size)
+                appended = 0
+            now_ms = self._now_ms()
+            # Replay oldest-first so newer records win bucket slots.
+            for offset in range(self._capacity):
+                slot = (appended + offset) % self._capacity
+                id_hash, timestamp_ms, sequence, signature_hash = _RECORD.unpack_from(
+                    journal, _HEADER.size + slot * _RECORD.size
+                )
+                if id_hash or timestamp_ms:
+                    self._insert(timestamp_ms, id_hash, sequence, signature_hash, now_ms)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        if self._shared:
+            self._journal_fd = fd
+        else:
+            os.close(fd)
+        self._journal = journal
+        self._appended = appended
+
+    def _catch_up(self) -> None:
+        assert self._journal is not None
+        if _HEADER.unpack_from(self._journal, 0)[2] == self._appended:
+            return
+        with _flock(self._journal_fd, fcntl.LOCK_SH):
+            self._replay_appended()
+
+    def _replay_appended(self) -> None:
+        # Caller holds the journal flock. Inserts records other processes
+        # appended since this one last looked; past a full lap the older ones
+        # have been overwritten, so only the newest ``capacity`` are read.
+        assert self._journal is not None
+        appended = _HEADER.unpack_from(self._journal, 0)[2]
+        now_ms = self._now_ms()
+        for count in range(max(self._appended, appended - self._capacity), appended):
+            id_hash, timestamp_ms, sequence, signature_hash = _RECORD.unpack_from(
+                self._journal, _HEADER.size + (count % self._capacity) * _RECORD.size
+            )
+            self._insert(timestamp_ms, id_hash, sequence, signature_hash, now_ms)
+        self._appended = appended
+
+    def _append_journal(self, id_hash: int, timestamp_ms: int, sequence: int, signature_hash: int) -> None:
+        if self._journal is None:
+            return
+        _RECORD.pack_into(
+            self._journal,
+            _HEADER.size + (self._appended % self._capacity) * _RECORD.size,
+            id_hash,
+            timestamp_ms,
+            sequence,
+            signature_hash,
+        )
+        self._appended += 1
+        _HEADER.pack_into(self._journal, 0, JOURNAL_MAGIC, self._capacity, self._appended)
+
+
+@contextmanager
+def _flock(fd: int | None, operation: int) -> Iterator[None]:
+    assert fd is not None
+    fcntl.flock(fd, operation)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
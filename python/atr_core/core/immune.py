@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 from jsonschema import Draft202012Validator
 
 from atr_core.core.canonicalization import (
+    NOT_CANONICAL_CODE,
     CanonicalizationError,
     canonical_input,
-    canonicalize_json,
+    is_canonical,
     legacy_canonicalization_code,
 )
-from atr_core.core.rules import Ruleset
-from atr_core.core.security import canonical_hash, verify_signature
+from atr_core.core.rules import CompiledRuleset, ReloadableRuleset
+from atr_core.core.schema import CompiledSchemaValidator, UnsupportedSchemaError
+from atr_core.core.security import (
+    SignatureCheck,
+    VerifiedSignatureCache,
+    canonical_digest,
+    canonical_hash,
+    create_verify_pool,
+    submit_signatures_batch,
+    verify_signature,
+    verify_signatures_batch,
+)
+from atr_core.metrics import GOV_EVAL_DURATION, StageClock, StageSampler
 
 
 @dataclass(frozen=True)
@@ -24,19 +37,161 @@ class ImmuneResult:
     canonical_envelope: bytes
 
 
+@dataclass(frozen=True)
+class _StagedBatch:
+    # evaluate_many state between canonicalization and signature verification.
+    clock: StageClock | None
+    results: list[ImmuneResult | None]
+    pending: list[tuple[int, bytes, bytes]]
+    checks: list[SignatureCheck]
+    verified: list[bool]
+    misses: list[int]
+
+
 class ImmunePipeline:
-    def __init__(self, schema_path: str, ruleset_path: str) -> None:
+    def __init__(
+        self,
+        schema_path: str,
+        ruleset_path: str,
+        signature_cache_size: int = 65536,
+        signature_cache_ttl_s: float = 300.0,
+        verify_workers: int = 0,
+        fast_schema_validation: bool = True,
+        ruleset_reload_interval_s: float = 0.0,
+        stage_sample_rate: float = 0.0,
+    ) -> None:
         schema = json.loads(Path(schema_path).read_text())
         self._validator = Draft202012Validator(schema)
-        self._ruleset = Ruleset(ruleset_path)
+        self._fast_validator: CompiledSchemaValidator | None = None
+        if fast_schema_validation:
+            try:
+                self._fast_validator = CompiledSchemaValidator(schema)
+            except UnsupportedSchemaError:
+                pass  # schema uses keywords the compiler does not cover; jsonschema only
+        self.ruleset = ReloadableRuleset(ruleset_path, poll_interval_s=ruleset_reload_interval_s)
+        self.signature_cache = VerifiedSignatureCache(signature_cache_size, signature_cache_ttl_s)
+        self._verify_pool = create_verify_pool(verify_workers) if verify_workers > 0 else None
+        self._single_stages = StageSampler(GOV_EVAL_DURATION, stage_sample_rate, mode="single")
+        self._batch_stages = StageSampler(GOV_EVAL_DURATION, stage_sample_rate, mode="batch")
+
+    def evaluate(self, envelope: dict[str, Any], canonical_bytes: bytes | None = None) -> ImmuneResult:
+        # With canonical_bytes (a pre-canonicalized submission) the bytes are
+        # verified as canonical for the envelope and hashed as-is.
+        clock = self._single_stages.start()
+        staged = self._canonicalize(envelope, clock, canonical_bytes)
+        if isinstance(staged, ImmuneResult):
+            return staged
+
+        canonical_bytes, digest = staged
+        signature_ok = verify_signature(
+            source_agent=envelope["header"]["source_agent"],
+            digest=digest,
+            signature=envelope["signature"],
+            cache=self.signature_cache,
+        )
+        if clock is not None:
+            clock.mark("signature")
+        result = self._enforce(self.ruleset.snapshot.rules, envelope, canonical_bytes, signature_ok)
+        if clock is not None:
+            clock.mark("ruleset")
+            clock.stop()
+        return result
+
+    def evaluate_many(self, envelopes: Sequence[dict[str, Any]]) -> list[ImmuneResult]:
+        batch = self._stage_many(envelopes)
+        outcomes = verify_signatures_batch([batch.checks[index] for index in batch.misses], self._verify_pool)
+        return self._finish_many(envelopes, batch, outcomes)
+
+    async def evaluate_many_async(self, envelopes: Sequence[dict[str, Any]]) -> list[ImmuneResult]:
+        """``evaluate_many`` for the event loop: CPU stages run in the default
+        executor, and verify-pool chunks are awaited rather than blocked on."""
+        loop = asyncio.get_running_loop()
+        if self._verify_pool is None:
+            return await loop.run_in_executor(None, self.evaluate_many, envelopes)
+        batch = await loop.run_in_executor(None, self._stage_many, envelopes)
+        futures = submit_signatures_batch([batch.checks[index] for index in batch.misses], self._verify_pool)
+        chunks = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        outcomes = [ok for chunk in chunks for ok in chunk]
+        return await loop.run_in_executor(None, self._finish_many, envelopes, batch, outcomes)
 
-    def evaluate(self, envelope: dict[str, Any]) -> ImmuneResult:
+    def _stage_many(self, envelopes: Sequence[dict[str, Any]]) -> _StagedBatch:
+        # Batch stages are timed per batch: signature checks and ruleset
+        # enforcement run over the whole batch at once.
+        clock = self._batch_stages.start()
+        results: list[ImmuneResult | None] = [None] * len(envelopes)
+        pending: list[tuple[int, bytes, bytes]] = []
+        for index, envelope in enumerate(envelopes):
+            staged = self._canonicalize(envelope)
+            if isinstance(staged, ImmuneResult):
+                results[index] = staged
+            else:
+                pending.append((index, *staged))
+        if clock is not None:
+            clock.mark("schema_canonicalize_hash")
+
+        checks = [
+            (envelopes[index]["header"]["source_agent"], digest, envelopes[index]["signature"])
+            for index, _, digest in pending
+        ]
+        verified = [self.signature_cache.contains(*check) for check in checks]
+        misses = [index for index, hit in enumerate(verified) if not hit]
+        return _StagedBatch(clock, results, pending, checks, verified, misses)
+
+    def _finish_many(
+        self,
+        envelopes: Sequence[dict[str, Any]],
+        batch: _StagedBatch,
+        outcomes: list[bool],
+    ) -> list[ImmuneResult]:
+        verified, clock, results = batch.verified, batch.clock, batch.results
+        for index, ok in zip(batch.misses, outcomes):
+            if ok:
+                self.signature_cache.add(*batch.checks[index])
+                verified[index] = True
+        if clock is not None:
+            clock.mark("signature")
+        # One ruleset snapshot for the whole batch, even if a reload lands mid-way.
+        rules = self.ruleset.snapshot.rules
+        for (index, canonical_bytes, _), signature_ok in zip(batch.pending, verified):
+            results[index] = self._enforce(rules, envelopes[index], canonical_bytes, signature_ok)
+        if clock is not None:
+            clock.mark("ruleset")
+            clock.stop()
+
+        return [result for result in results if result is not None]
+
+    def close(self) -> None:
+        self.ruleset.close()
+        if self._verify_pool is not None:
+            self._verify_pool.shutdown()
+
+    def _schema_error(self, envelope: dict[str, Any]) -> str | None:
+        if self._fast_validator is not None and self._fast_validator(envelope):
+            return None
         errors = sorted(self._validator.iter_errors(envelope), key=lambda e: e.path)
-        if errors:
-            return ImmuneResult(False, f"schema validation failed: {errors[0].message}", b"")
+        return errors[0].message if errors else None
+
+    def _canonicalize(
+        self,
+        envelope: dict[str, Any],
+        clock: StageClock | None = None,
+        canonical_bytes: bytes | None = None,
+    ) -> ImmuneResult | tuple[bytes, bytes]:
+        schema_error = self._schema_error(envelope)
+        if clock is not None:
+            clock.mark("schema")
+        if schema_error is not None:
+            return ImmuneResult(False, f"schema validation failed: {schema_error}", b"")
 
         try:
-            canonical_bytes = canonicalize_json(canonical_input(envelope))
+            if canonical_bytes is not None:
+                if not is_canonical(canonical_bytes, canonical_input(envelope)):
+                    return ImmuneResult(False, f"canonicalization failed: {NOT_CANONICAL_CODE}", b"")
+                digest = canonical_hash(canonical_bytes)
+                if clock is not None:
+                    clock.mark("canonicalize_hash")
+                return canonical_bytes, digest
+            canonical = canonical_digest(canonical_input(envelope))
         except CanonicalizationError as err:
             legacy_code = legacy_canonicalization_code(err.code)
             if legacy_code == err.code:
@@ -47,16 +202,21 @@ class ImmunePipeline:
                 b"",
             )
 
-        digest = canonical_hash(canonical_bytes)
-        signature_ok = verify_signature(
-            source_agent=envelope["header"]["source_agent"],
-            digest=digest,
-            signature=envelope["signature"],
-        )
+        if clock is not None:
+            clock.mark("canonicalize_hash")  # canonical bytes stream straight into the hasher
+        return canonical.canonical_bytes or b"", canonical.digest
+
+    def _enforce(
+        self,
+        rules: CompiledRuleset,
+        envelope: dict[str, Any],
+        canonical_bytes: bytes,
+        signature_ok: bool,
+    ) -> ImmuneResult:
         if not signature_ok:
             return ImmuneResult(False, "signature verification failed", canonical_bytes)
 
-        rules_ok, reason = self._ruleset.validate(envelope)
+        rules_ok, reason = rules.validate(envelope)
         if not rules_ok:
             return ImmuneResult(False, f"ruleset validation failed: {reason}", canonical_bytes)
 
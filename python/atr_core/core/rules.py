@@ -1,25 +1,270 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from atr_core.metrics import GOV_RULESET_SWAPS, GOV_RULESET_VALIDATION_FAILURES, GOV_RULESET_VERSION
 
-class Ruleset:
-    def __init__(self, path: str) -> None:
-        self._raw = json.loads(Path(path).read_text())
+logger = logging.getLogger(__name__)
+
+# NATS-style subject wildcards over the dot-separated type taxonomy:
+# "*" matches exactly one token, ">" matches one or more trailing tokens.
+SINGLE_TOKEN_WILDCARD = "*"
+TAIL_WILDCARD = ">"
+DECISION_CACHE_SIZE = 65536
+
+_LITERAL, _SINGLE, _TAIL = 2, 1, 0
+
+
+class RulesetError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class RuleDecision:
+    blocked: bool
+    required_security_level: str | None
+
+
+_ALLOW = RuleDecision(False, None)
+
+
+@dataclass
+class _PatternNode:
+    children: dict[str, _PatternNode] = field(default_factory=dict)
+    blocked: bool = False
+    level: str | None = None
+    tail_blocked: bool = False
+    tail_level: str | None = None
+
+
+@dataclass(frozen=True)
+class CompiledRuleset:
+    blocked_types: frozenset[str]
+    decisions: dict[str, RuleDecision]
+    patterns: _PatternNode | None
+    _memo: dict[str, RuleDecision] = field(default_factory=dict, compare=False, repr=False)
+
+    def decide(self, event_type: str) -> RuleDecision:
+        decision = self.decisions.get(event_type)
+        if decision is not None:
+            return decision
+        if self.patterns is None:
+            return _ALLOW
+        decision = self._memo.get(event_type)
+        if decision is None:
+            decision = _match(self.patterns, event_type.split("."))
+            if len(self._memo) < DECISION_CACHE_SIZE:
+                self._memo[event_type] = decision
+        return decision
 
     def validate(self, envelope: dict[str, Any]) -> tuple[bool, str]:
-        event_type = envelope["header"]["type"]
-        blocked = set(self._raw.get("blocked_types", []))
-        if event_type in blocked:
+        decision = self.decide(envelope["header"]["type"])
+        if decision.blocked:
             return False, "blocked event type"
-
-        required = self._raw.get("required_security_level_for_types", {})
-        expected_level = required.get(event_type)
-        if expected_level is None:
+        if decision.required_security_level is None:
             return True, ""
         actual_level = envelope.get("meta", {}).get("security_level")
-        if actual_level != expected_level:
+        if actual_level != decision.required_security_level:
             return False, "security level mismatch"
         return True, ""
+
+
+def compile_ruleset(raw: Any) -> CompiledRuleset:
+    if not isinstance(raw, dict):
+        raise RulesetError("ruleset must be a JSON object")
+    blocked = raw.get("blocked_types", [])
+    required = raw.get("required_security_level_for_types", {})
+    if not isinstance(blocked, list) or not all(isinstance(item, str) for item in blocked):
+        raise RulesetError("blocked_types must be a list of strings")
+    if not isinstance(required, dict) or not all(isinstance(level, str) for level in required.values()):
+        raise RulesetError("required_security_level_for_types must map types to strings")
+
+    exact_blocked = {pattern for pattern in blocked if not _is_pattern(pattern)}
+    exact_levels = {pattern: level for pattern, level in required.items() if not _is_pattern(pattern)}
+    root: _PatternNode | None = None
+    for pattern in blocked:
+        if _is_pattern(pattern):
+            root = root or _PatternNode()
+            node, tail = _insert(root, pattern)
+            if tail:
+                node.tail_blocked = True
+            else:
+                node.blocked = True
+    for pattern, level in required.items():
+        if _is_pattern(pattern):
+            root = root or _PatternNode()
+            node, tail = _insert(root, pattern)
+            if tail:
+                node.tail_level = level
+            else:
+                node.level = level
+
+    decisions: dict[str, RuleDecision] = {}
+    for event_type in exact_blocked | exact_levels.keys():
+        # Exact entries still inherit blocks from wildcard patterns.
+        matched = _match(root, event_type.split(".")) if root is not None else _ALLOW
+        decisions[event_type] = RuleDecision(
+            blocked=event_type in exact_blocked or matched.blocked,
+            required_security_level=exact_levels.get(event_type, matched.required_security_level),
+        )
+    return CompiledRuleset(blocked_types=frozenset(blocked), decisions=decisions, patterns=root)
+
+
+def _is_pattern(event_type: str) -> bool:
+    return SINGLE_TOKEN_WILDCARD in event_type or TAIL_WILDCARD in event_type
+
+
+def _insert(root: _PatternNode, pattern: str) -> tuple[_PatternNode, bool]:
+    tokens = pattern.split(".")
+    for position, token in enumerate(tokens):
+        if not token or (TAIL_WILDCARD in token and (token != TAIL_WILDCARD or position != len(tokens) - 1)):
+            raise RulesetError(f"invalid type pattern: {pattern!r}")
+        if SINGLE_TOKEN_WILDCARD in token and token != SINGLE_TOKEN_WILDCARD:
+            raise RulesetError(f"invalid type pattern: {pattern!r}")
+    tail = tokens[-1] == TAIL_WILDCARD
+    node = root
+    for token in tokens[:-1] if tail else tokens:
+        node = node.children.setdefault(token, _PatternNode())
+    return node, tail
+
+
+def _match(root: _PatternNode, tokens: list[str]) -> RuleDecision:
+    # Any matching pattern blocks; the security level comes from the most
+    # specific match, ranking literal > "*" > ">" token by token.
+    blocked = False
+    best_rank: tuple[int, ...] | None = None
+    best_level: str | None = None
+    frontier: list[tuple[_PatternNode, tuple[int, ...]]] = [(root, ())]
+    for token in tokens:
+        advanced: list[tuple[_PatternNode, tuple[int, ...]]] = []
+        for node, rank in frontier:
+            if node.tail_blocked or node.tail_level is not None:
+                blocked = blocked or node.tail_blocked
+                tail_rank = rank + (_TAIL,)
+                if node.tail_level is not None and (best_rank is None or tail_rank > best_rank):
+                    best_rank, best_level = tail_rank, node.tail_level
+            literal = node.children.get(token)
+            if literal is not None:
+                advanced.append((literal, rank + (_LITERAL,)))
+            single = node.children.get(SINGLE_TOKEN_WILDCARD)
+            if single is not None:
+                advanced.append((single, rank + (_SINGLE,)))
+        frontier = advanced
+        if not frontier:
+            break
+    for node, rank in frontier:
+        blocked = blocked or node.blocked
+        if node.level is not None and (best_rank is None or rank > best_rank):
+            best_rank, best_level = rank, node.level
+    return RuleDecision(blocked, best_level)
+
+
+class Ruleset:
+    def __init__(self, path: str) -> None:
+        self._raw = json.loads(Path(path).read_text())
+        self.compiled = compile_ruleset(self._raw)
+
+    def validate(self, envelope: dict[str, Any]) -> tuple[bool, str]:
+        return self.compiled.validate(envelope)
+
+
+@dataclass(frozen=True)
+class RulesetSnapshot:
+    version: int
+    rules: CompiledRuleset
+    fingerprint: str
+
+
+class ReloadableRuleset:
+    """Ruleset published read-copy-update style.
+
+    Readers take ``snapshot`` once (per envelope or per batch) and never lock;
+    reloads compile a new snapshot off the request path and swap the
+    reference, keeping the previous one if the new file fails validation.
+    """
+
+    def __init__(self, path: str, poll_interval_s: float = 0.0, shard: str = "0") -> None:
+        self._path = Path(path)
+        self._poll_interval = poll_interval_s
+        self._shard = shard
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self._stat = self._stat_key()
+        data = self._path.read_bytes()
+        self._snapshot = RulesetSnapshot(1, compile_ruleset(json.loads(data)), hashlib.sha256(data).hexdigest())
+        GOV_RULESET_VERSION.labels(shard=self._shard).set(1)
+        if poll_interval_s > 0:
+            self.start()
+
+    @property
+    def snapshot(self) -> RulesetSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def validate(self, envelope: dict[str, Any]) -> tuple[bool, str]:
+        return self._snapshot.rules.validate(envelope)
+
+    def reload(self) -> bool:
+        with self._reload_lock:
+            self._stat = self._stat_key()
+            try:
+                data = self._path.read_bytes()
+                fingerprint = hashlib.sha256(data).hexdigest()
+                if fingerprint == self._snapshot.fingerprint:
+                    return False
+                rules = compile_ruleset(json.loads(data))
+            except (OSError, ValueError) as exc:
+                GOV_RULESET_VALIDATION_FAILURES.labels(shard=self._shard).inc()
+                logger.error(
+                    "ruleset reload rejected, keeping version %d: %s",
+                    self._snapshot.version,
+                    exc,
+                )
+                return False
+
+            snapshot = RulesetSnapshot(self._snapshot.version + 1, rules, fingerprint)
+            self._snapshot = snapshot
+            GOV_RULESET_VERSION.labels(shard=self._shard).set(snapshot.version)
+            GOV_RULESET_SWAPS.labels(shard=self._shard).inc()
+            logger.info("ruleset version %d active (%s)", snapshot.version, fingerprint[:12])
+            return True
+
+    def check_for_update(self) -> bool:
+        if self._stat_key() == self._stat:
+            return False
+        return self.reload()
+
+    def start(self) -> None:
+        if self._watcher is not None or self._poll_interval <= 0:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="ruleset-watcher", daemon=True)
+        self._watcher.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            self.check_for_update()
+
+    def _stat_key(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
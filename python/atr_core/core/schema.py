@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable
+
+Check = Callable[[Any], bool]
+
+# Keywords that never affect validity.
+_ANNOTATIONS = frozenset({"$schema", "$id", "title", "description", "$comment", "$defs", "examples", "default"})
+_SCALARS = (str, int, float, type(None))
+
+
+class UnsupportedSchemaError(ValueError):
+    pass
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS: dict[str, Check] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _scalar_equal(left: Any, right: Any) -> bool:
+    # JSON equality: true/false are never equal to 1/0.
+    return isinstance(left, bool) is isinstance(right, bool) and left == right
+
+
+class CompiledSchemaValidator:
+    """Short-circuiting boolean validator compiled from a JSON Schema subset.
+
+    A True result implies the schema accepts the instance; a False result
+    only means the caller should ask jsonschema for the detailed error.
+    """
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self._root = schema
+        self._resolving: set[str] = set()
+        self._check = self._compile(schema)
+
+    def __call__(self, instance: Any) -> bool:
+        return self._check(instance)
+
+    def _compile(self, schema: Any) -> Check:
+        if schema is True:
+            return lambda _: True
+        if schema is False:
+            return lambda _: False
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"unsupported subschema: {schema!r}")
+
+        checks: list[Check] = []
+        for keyword, argument in schema.items():
+            if keyword in _ANNOTATIONS or keyword in ("additionalProperties", "properties"):
+                continue
+            compile_keyword = getattr(self, "_keyword_" + keyword.lstrip("$"), None)
+            if compile_keyword is None:
+                raise UnsupportedSchemaError(f"unsupported keyword: {keyword}")
+            checks.append(compile_keyword(argument, schema))
+        if "properties" in schema or "additionalProperties" in schema:
+            checks.append(self._properties(schema))
+
+        if not checks:
+            return lambda _: True
+        if len(checks) == 1:
+            return checks[0]
+        ordered = tuple(checks)
+        return lambda value: all(check(value) for check in ordered)
+
+    def _keyword_ref(self, reference: str, _: dict[str, Any]) -> Check:
+        prefix = "#/$defs/"
+        if not reference.startswith(prefix) or reference in self._resolving:
+            raise UnsupportedSchemaError(f"unsupported $ref: {reference}")
+        self._resolving.add(reference)
+        try:
+            return self._compile(self._root.get("$defs", {})[reference[len(prefix) :]])
+        except KeyError as exc:
+            raise UnsupportedSchemaError(f"unresolvable $ref: {reference}") from exc
+        finally:
+            self._resolving.discard(reference)
+
+    def _keyword_type(self, names: str | list[str], _: dict[str, Any]) -> Check:
+        if isinstance(names, str):
+            return _TYPE_CHECKS[names]
+        options = tuple(_TYPE_CHECKS[name] for name in names)
+        return lambda value: any(check(value) for check in options)
+
+    def _keyword_required(self, names: list[str], _: dict[str, Any]) -> Check:
+        required = frozenset(names)
+        return lambda value: not isinstance(value, dict) or required.issubset(value)
+
+    def _keyword_minProperties(self, limit: int, _: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, dict) or len(value) >= limit
+
+    def _keyword_minLength(self, limit: int, _: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, str) or len(value) >= limit
+
+    def _keyword_maxLength(self, limit: int, _: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, str) or len(value) <= limit
+
+    def _keyword_pattern(self, pattern: str, _: dict[str, Any]) -> Check:
+        # jsonschema uses re.search, so keep the same (unanchored) semantics.
+        search = re.compile(pattern).search
+        return lambda value: not isinstance(value, str) or search(value) is not None
+
+    def _keyword_minimum(self, limit: float, _: dict[str, Any]) -> Check:
+        return lambda value: not _is_number(value) or value >= limit
+
+    def _keyword_maxItems(self, limit: int, _: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, list) or len(value) <= limit
+
+    def _keyword_uniqueItems(self, unique: bool, _: dict[str, Any]) -> Check:
+        if not unique:
+            return lambda _: True
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, list):
+                return True
+            if not all(isinstance(item, str) for item in value):
+                return False  # let jsonschema decide mixed/unhashable items
+            return len(set(value)) == len(value)
+
+        return check
+
+    def _keyword_items(self, schema: Any, _: dict[str, Any]) -> Check:
+        item_check = self._compile(schema)
+        return lambda value: not isinstance(value, list) or all(item_check(item) for item in value)
+
+    def _keyword_const(self, expected: Any, _: dict[str, Any]) -> Check:
+        if not isinstance(expected, _SCALARS):
+            raise UnsupportedSchemaError("const must be a scalar")
+        return lambda value: _scalar_equal(value, expected)
+
+    def _keyword_enum(self, options: list[Any], _: dict[str, Any]) -> Check:
+        if not all(isinstance(option, str) for option in options):
+            raise UnsupportedSchemaError("enum must list strings")
+        allowed = frozenset(options)
+        return lambda value: isinstance(value, str) and value in allowed
+
+    def _properties(self, schema: dict[str, Any]) -> Check:
+        properties = {name: self._compile(sub) for name, sub in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        if additional is False:
+            allowed = frozenset(properties)
+        elif additional is True:
+            allowed = None
+        else:
+            raise UnsupportedSchemaError("additionalProperties must be a boolean")
+        items = tuple(properties.items())
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return True
+            if allowed is not None and not allowed.issuperset(value):
+                return False
+            for name, property_check in items:
+                if name in value and not property_check(value[name]):
+                    return False
+            return True
+
+        return check
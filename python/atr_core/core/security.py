@@ -3,15 +3,123 @@ from __future__ import annotations
 import base64
 import binascii
 import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Sequence
 
 from nacl.exceptions import BadSignatureError
 from nacl.signing import VerifyKey
 
+from atr_core.core.canonicalization import canonicalize_json_into
+from atr_core.metrics import (
+    GOV_SIG_CACHE_ENTRIES,
+    GOV_SIG_CACHE_EVICTIONS,
+    GOV_SIG_CACHE_LOOKUPS,
+    GOV_SIG_CACHE_MISSES,
+)
+
 try:
     import blake3  # type: ignore
 except ImportError:  # pragma: no cover
     blake3 = None
 
+VERIFY_KEY_CACHE_SIZE = 4096
+VERIFY_CHUNK_SIZE = 64
+
+SignatureCheck = tuple[str, bytes, str]
+
+_KEY_LOOKUPS = GOV_SIG_CACHE_LOOKUPS.labels(component="verify_key")
+_KEY_MISSES = GOV_SIG_CACHE_MISSES.labels(component="verify_key")
+_VERIFIED_LOOKUPS = GOV_SIG_CACHE_LOOKUPS.labels(component="verified")
+_VERIFIED_MISSES = GOV_SIG_CACHE_MISSES.labels(component="verified")
+_TTL_EVICTIONS = GOV_SIG_CACHE_EVICTIONS.labels(reason="ttl")
+_CAPACITY_EVICTIONS = GOV_SIG_CACHE_EVICTIONS.labels(reason="capacity")
+
+
+@dataclass(frozen=True)
+class SignatureCacheStats:
+    key_hits: int
+    key_misses: int
+    verified_hits: int
+    verified_misses: int
+    verified_entries: int
+    verified_evictions: int
+
+
+class VerifiedSignatureCache:
+    def __init__(self, max_entries: int = 65536, ttl_s: float = 300.0) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_s
+        self._entries: OrderedDict[tuple[str, bytes, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, source_agent: str, digest: bytes, signature: str) -> bool:
+        key = (source_agent, digest, signature)
+        now = time.monotonic()
+        _VERIFIED_LOOKUPS.inc()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True
+            if expires_at is not None:
+                del self._entries[key]
+                self._evictions += 1
+                _TTL_EVICTIONS.inc()
+                GOV_SIG_CACHE_ENTRIES.set(len(self._entries))
+            self._misses += 1
+        _VERIFIED_MISSES.inc()
+        return False
+
+    def add(self, source_agent: str, digest: bytes, signature: str) -> None:
+        key = (source_agent, digest, signature)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self._ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+                _CAPACITY_EVICTIONS.inc()
+            GOV_SIG_CACHE_ENTRIES.set(len(self._entries))
+
+    def stats(self) -> SignatureCacheStats:
+        key_info = _cached_verify_key.cache_info()
+        with self._lock:
+            return SignatureCacheStats(
+                key_hits=key_info.hits,
+                key_misses=key_info.misses,
+                verified_hits=self._hits,
+                verified_misses=self._misses,
+                verified_entries=len(self._entries),
+                verified_evictions=self._evictions,
+            )
+
+
+@dataclass(frozen=True)
+class CanonicalDigest:
+    digest: bytes
+    size: int
+    canonical_bytes: bytes | None
+
+
+def canonical_hasher() -> Any:
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.sha256()
+
 
 def canonical_hash(canonical_bytes: bytes) -> bytes:
     if blake3 is not None:
@@ -19,6 +127,22 @@ def canonical_hash(canonical_bytes: bytes) -> bytes:
     return hashlib.sha256(canonical_bytes).digest()
 
 
+def canonical_digest(value: Any, retain_bytes: bool = True) -> CanonicalDigest:
+    hasher = canonical_hasher()
+    if not retain_bytes:
+        size = canonicalize_json_into(value, hasher.update)
+        return CanonicalDigest(hasher.digest(), size, None)
+
+    chunks: list[bytes] = []
+
+    def sink(chunk: bytes) -> None:
+        hasher.update(chunk)
+        chunks.append(chunk)
+
+    size = canonicalize_json_into(value, sink)
+    return CanonicalDigest(hasher.digest(), size, b"".join(chunks))
+
+
 def _decode_base64url(signature: str) -> bytes:
     padding = "=" * ((4 - len(signature) % 4) % 4)
     try:
@@ -27,10 +151,73 @@ def _decode_base64url(signature: str) -> bytes:
         raise ValueError("invalid base64url signature") from exc
 
 
-def verify_signature(source_agent: str, digest: bytes, signature: str) -> bool:
+def load_verify_key(source_agent: str) -> VerifyKey | None:
+    _KEY_LOOKUPS.inc()
+    return _cached_verify_key(source_agent)
+
+
+@lru_cache(maxsize=VERIFY_KEY_CACHE_SIZE)
+def _cached_verify_key(source_agent: str) -> VerifyKey | None:
+    _KEY_MISSES.inc()  # only runs on a cache miss
+    try:
+        return VerifyKey(bytes.fromhex(source_agent))
+    except (ValueError, binascii.Error):
+        return None
+
+
+def verify_with_key(key: VerifyKey | None, digest: bytes, signature: str) -> bool:
+    if key is None:
+        return False
     try:
-        key = VerifyKey(bytes.fromhex(source_agent))
         key.verify(digest, _decode_base64url(signature))
         return True
     except (BadSignatureError, ValueError, binascii.Error):
         return False
+
+
+def verify_signature(
+    source_agent: str,
+    digest: bytes,
+    signature: str,
+    cache: VerifiedSignatureCache | None = None,
+) -> bool:
+    if cache is not None and cache.contains(source_agent, digest, signature):
+        return True
+    ok = verify_with_key(load_verify_key(source_agent), digest, signature)
+    if ok and cache is not None:
+        cache.add(source_agent, digest, signature)
+    return ok
+
+
+def create_verify_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    # spawn, not fork: the parent holds grpc threads that must not be forked.
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def verify_signatures_batch(
+    checks: Sequence[SignatureCheck],
+    executor: Executor | None = None,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+) -> list[bool]:
+    if executor is None or len(checks) <= chunk_size:
+        return _verify_chunk(checks)
+    return [ok for future in submit_signatures_batch(checks, executor, chunk_size) for ok in future.result()]
+
+
+def submit_signatures_batch(
+    checks: Sequence[SignatureCheck],
+    executor: Executor,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+) -> list[Future[list[bool]]]:
+    """Queue ``checks`` on ``executor`` in chunks and return the futures, in order,
+    without waiting; async callers await them via ``asyncio.wrap_future``."""
+    return [
+        executor.submit(_verify_chunk, checks[start : start + chunk_size]) for start in range(0, len(checks), chunk_size)
+    ]
+
+
+def _verify_chunk(checks: Sequence[SignatureCheck]) -> list[bool]:
+    return [verify_with_key(load_verify_key(agent), digest, signature) for agent, digest, signature in checks]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import itertools
+import time
+from typing import Any
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, make_asgi_app
+except ImportError:  # pragma: no cover - metrics are optional
+
+    class _NoopMetric:
+        def __init__(self, *_: Any, **__: Any) -> None:
+            pass
+
+        def labels(self, *_: Any, **__: Any) -> _NoopMetric:
+            return self
+
+        def inc(self, amount: float = 1.0) -> None:
+            pass
+
+        def set(self, value: float) -> None:
+            pass
+
+        def observe(self, value: float) -> None:
+            pass
+
+    Counter = Gauge = Histogram = _NoopMetric  # type: ignore[assignment,misc]
+    make_asgi_app = None  # type: ignore[assignment]
+
+# Stage latencies sit between a few microseconds (ruleset lookup) and tens of
+# milliseconds (cold signature checks, sidecar round trips).
+STAGE_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0,
+)
+
+
+GOV_RULESET_VERSION = Gauge(
+    "atr_gov_ruleset_version",
+    "Version of the active governance ruleset snapshot",
+    labelnames=["shard"],
+)
+GOV_RULESET_SWAPS = Counter(
+    "atr_gov_ruleset_swaps_total",
+    "Governance ruleset snapshots swapped in",
+    labelnames=["shard"],
+)
+GOV_RULESET_VALIDATION_FAILURES = Counter(
+    "atr_gov_ruleset_validation_failures_total",
+    "Governance ruleset reloads rejected by validation",
+    labelnames=["shard"],
+)
+GOV_SIG_CACHE_LOOKUPS = Counter(
+    "atr_gov_sig_cache_lookups_total",
+    "Signature cache lookups (component: verify_key or verified)",
+    labelnames=["component"],
+)
+GOV_SIG_CACHE_MISSES = Counter(
+    "atr_gov_sig_cache_misses_total",
+    "Signature cache lookups that missed (component: verify_key or verified)",
+    labelnames=["component"],
+)
+GOV_SIG_CACHE_EVICTIONS = Counter(
+    "atr_gov_sig_cache_evictions_total",
+    "Verified-signature cache entries evicted (reason: ttl or capacity)",
+    labelnames=["reason"],
+)
+GOV_SIG_CACHE_ENTRIES = Gauge(
+    "atr_gov_sig_cache_entries",
+    "Entries in the verified-signature cache",
+)
+GOV_EVAL_DURATION = Histogram(
+    "atr_gov_eval_duration_seconds",
+    "Immune pipeline latency per stage (sampled)",
+    labelnames=["phase", "mode"],
+    buckets=STAGE_BUCKETS,
+)
+CP_SUBMIT_CALLS = Counter(
+    "atr_cp_submit_calls_total",
+    "Envelopes submitted to ingress by outcome",
+    labelnames=["mode", "decision"],
+)
+CP_QUARANTINE_DROPPED = Counter(
+    "atr_cp_quarantine_dropped_total",
+    "Quarantined envelopes dropped (reason: spill_full or shutdown)",
+    labelnames=["reason"],
+)
+TX_DISPATCH_DURATION = Histogram(
+    "atr_tx_dispatch_duration_seconds",
+    "Sidecar publish latency seen by ingress (sampled)",
+    labelnames=["transport", "phase"],
+    buckets=STAGE_BUCKETS,
+)
+TX_CHANNEL_REUSES = Counter(
+    "atr_tx_channel_reuses_total",
+    "Sidecar calls served by an already open pooled channel",
+    labelnames=["transport"],
+)
+TX_RECONNECTS = Counter(
+    "atr_tx_reconnects_total",
+    "Pooled sidecar channels reopened after being dropped",
+    labelnames=["transport"],
+)
+TX_HEALTH_CHECK_FAILURES = Counter(
+    "atr_tx_health_check_failures_total",
+    "Sidecar channels discarded because their Health check failed",
+    labelnames=["transport"],
+)
+TX_CHANNELS_OPEN = Gauge(
+    "atr_tx_channels_open",
+    "Pooled sidecar channels currently open",
+    labelnames=["transport"],
+)
+BP_STATE = Gauge(
+    "atr_bp_state",
+    "Ingress backpressure state per shard (0 green, 1 yellow, 2 orange, 3 red)",
+    labelnames=["shard"],
+)
+BP_STATE_CHANGES = Counter(
+    "atr_bp_state_changes_total",
+    "Ingress backpressure state transitions",
+    labelnames=["shard", "from", "to"],
+)
+
+
+class StageSampler:
+    """Hands out a ``StageClock`` for one call in every ``1 / sample_rate``.
+
+    Unsampled calls cost a counter increment and a ``None`` check, which keeps
+    instrumentation overhead negligible at full load.
+    """
+
+    def __init__(self, histogram: Any, sample_rate: float, **labels: str) -> None:
+        self._every = round(1.0 / min(1.0, sample_rate)) if sample_rate > 0 else 0
+        self._calls = itertools.count()
+        self._histogram = histogram
+        self._labels = labels
+        self._children: dict[str, Any] = {}
+
+    def start(self) -> StageClock | None:
+        if not self._every or next(self._calls) % self._every:
+            return None
+        return StageClock(self)
+
+    def observe(self, phase: str, seconds: float) -> None:
+        child = self._children.get(phase)
+        if child is None:
+            child = self._children[phase] = self._histogram.labels(phase=phase, **self._labels)
+        child.observe(seconds)
+
+
+class StageClock:
+    __slots__ = ("_sampler", "_started", "_last")
+
+    def __init__(self, sampler: StageSampler) -> None:
+        self._sampler = sampler
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._sampler.observe(phase, now - self._last)
+        self._last = now
+
+    def stop(self, phase: str = "total") -> None:
+        self._sampler.observe(phase, time.perf_counter() - self._started)
@@ -2,10 +2,10 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: atr_transport.proto
 """Generated protocol buffer code."""
-from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -13,30 +13,61 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61tr_transport.proto\x12\x10\x61tr.transport.v1\"\x8b\x01\n\x0ePublishRequest\x12\x1a\n\x12\x63\x61nonical_envelope\x18\x01 \x01(\x0c\x12\x0f\n\x07subject\x18\x02 \x01(\t\x12\x1d\n\x15require_persisted_ack\x18\x03 \x01(\x08\x12\x15\n\rpartition_key\x18\x04 \x01(\t\x12\x16\n\x0e\x63orrelation_id\x18\x05 \x01(\t\"\xc3\x01\n\x0fPublishResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x11\n\tpersisted\x18\x02 \x01(\x08\x12\x17\n\x0fstream_sequence\x18\x03 \x01(\x04\x12\x19\n\x11\x63onsumer_sequence\x18\x04 \x01(\x04\x12\x0f\n\x07subject\x18\x05 \x01(\t\x12\x1b\n\x13server_time_unix_ns\x18\x06 \x01(\x03\x12\x12\n\nerror_code\x18\x07 \x01(\t\x12\x15\n\rerror_message\x18\x08 \x01(\t\"\x99\x01\n\x10SubscribeRequest\x12\x16\n\x0esubject_filter\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65liver_all\x18\x02 \x01(\x08\x12\x18\n\x10\x64\x65liver_new_only\x18\x03 \x01(\x08\x12\x14\n\x0c\x64urable_name\x18\x04 \x01(\t\x12\x15\n\rmax_in_flight\x18\x05 \x01(\r\x12\x11\n\ttenant_id\x18\x06 \x01(\t\"r\n\rEnvelopeFrame\x12\x1a\n\x12\x63\x61nonical_envelope\x18\x01 \x01(\x0c\x12\x0f\n\x07subject\x18\x02 \x01(\t\x12\x17\n\x0fstream_sequence\x18\x03 \x01(\x04\x12\x1b\n\x13\x62roker_time_unix_ns\x18\x04 \x01(\x03\"(\n\rHealthRequest\x12\x17\n\x0finclude_metrics\x18\x01 \x01(\x08\"\xc2\x01\n\x0eHealthResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x16\n\x0enats_connected\x18\x02 \x01(\x08\x12\x17\n\x0fjetstream_ready\x18\x03 \x01(\x08\x12\x12\n\noverloaded\x18\x04 \x01(\x08\x12\x1a\n\x12publish_rate_msg_s\x18\x05 \x01(\x04\x12\x1c\n\x14subscribe_rate_msg_s\x18\x06 \x01(\x04\x12\x14\n\x0c\x62\x61\x63klog_msgs\x18\x07 \x01(\x04\x12\x0f\n\x07version\x18\x08 \x01(\t\"K\n\x13RequestReplyRequest\x12\x0f\n\x07subject\x18\x01 \x01(\t\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\x12\x12\n\ntimeout_ms\x18\x03 \x01(\r\"^\n\x14RequestReplyResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\x12\x12\n\nerror_code\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t2\xde\x02\n\x0c\x41trTransport\x12N\n\x07Publish\x12 .atr.transport.v1.PublishRequest\x1a!.atr.transport.v1.PublishResponse\x12R\n\tSubscribe\x12\".atr.transport.v1.SubscribeRequest\x1a\x1f.atr.transport.v1.EnvelopeFrame0\x01\x12K\n\x06Health\x12\x1f.atr.transport.v1.HealthRequest\x1a .atr.transport.v1.HealthResponse\x12]\n\x0cRequestReply\x12%.atr.transport.v1.RequestReplyRequest\x1a&.atr.transport.v1.RequestReplyResponseB\x1eZ\x1c\x61tr/transport/v1;transportv1b\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61tr_transport.proto\x12\x10\x61tr.transport.v1\"\xb2\x01\n\rTachyonPacket\x12\r\n\x05\x66lags\x18\x01 \x01(\x04\x12\x10\n\x08topic_id\x18\x02 \x01(\r\x12\x11\n\tsender_id\x18\x03 \x01(\r\x12\x13\n\x0binline_data\x18\x04 \x01(\x0c\x12-\n\tarena_ref\x18\x05 \x01(\x0b\x32\x1a.atr.transport.v1.ArenaRef\x12)\n\x07shm_ref\x18\x06 \x01(\x0b\x32\x18.atr.transport.v1.ShmRef\"N\n\x08\x41renaRef\x12\x10\n\x08\x61rena_id\x18\x01 \x01(\r\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0e\n\x06length\x18\x03 \x01(\r\x12\x10\n\x08\x63hecksum\x18\x04 \x01(\x04\"N\n\x06ShmRef\x12\x12\n\nsegment_id\x18\x01 \x01(\x04\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0e\n\x06length\x18\x03 \x01(\r\x12\x10\n\x08\x63hecksum\x18\x04 \x01(\x04\"\xc0\x01\n\x12\x42\x61tchSubmitRequest\x12\x12\n\nrequest_id\x18\x01 \x01(\x04\x12\x1b\n\x13governance_required\x18\x02 \x01(\x08\x12*\n\x04mode\x18\x03 \x01(\x0e\x32\x1c.atr.transport.v1.SubmitMode\x12\x30\n\x07packets\x18\x04 \x03(\x0b\x32\x1f.atr.transport.v1.TachyonPacket\x12\x1b\n\x13submit_timestamp_ns\x18\x05 \x01(\x04\"\xac\x01\n\x13\x42\x61tchSubmitResponse\x12\x12\n\nrequest_id\x18\x01 \x01(\x04\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x02 \x01(\r\x12\x0f\n\x07\x64ropped\x18\x03 \x01(\r\x12\x11\n\tthrottled\x18\x04 \x01(\r\x12/\n\x07results\x18\x05 \x03(\x0b\x32\x1e.atr.transport.v1.PacketResult\x12\x1a\n\x12processing_time_ns\x18\x06 \x01(\x04\"K\n\x0cPacketResult\x12\r\n\x05index\x18\x01 \x01(\r\x12,\n\x08\x64\x65\x63ision\x18\x02 \x01(\x0e\x32\x1a.atr.transport.v1.Decision\"\xb2\x01\n\x17GovernanceUpdateRequest\x12\x0f\n\x07version\x18\x01 \x01(\x04\x12\x36\n\x0ctopic_limits\x18\x02 \x03(\x0b\x32 .atr.transport.v1.TopicRateLimit\x12\x34\n\rsender_quotas\x18\x03 \x03(\x0b\x32\x1d.atr.transport.v1.SenderQuota\x12\x18\n\x10\x61llowlist_topics\x18\x04 \x03(\r\"I\n\x0eTopicRateLimit\x12\x10\n\x08topic_id\x18\x01 \x01(\r\x12\x10\n\x08\x63\x61pacity\x18\x02 \x01(\x04\x12\x13\n\x0brefill_rate\x18\x03 \x01(\x04\"7\n\x0bSenderQuota\x12\x11\n\tsender_id\x18\x01 \x01(\r\x12\x15\n\rmax_in_flight\x18\x02 \x01(\r\"S\n\x18GovernanceUpdateResponse\x12\x0f\n\x07version\x18\x01 \x01(\x04\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x15\n\rerror_message\x18\x03 \x01(\t\"\x8b\x01\n\x0ePublishRequest\x12\x1a\n\x12\x63\x61nonical_envelope\x18\x01 \x01(\x0c\x12\x0f\n\x07subject\x18\x02 \x01(\t\x12\x1d\n\x15require_persisted_ack\x18\x03 \x01(\x08\x12\x15\n\rpartition_key\x18\x04 \x01(\t\x12\x16\n\x0e\x63orrelation_id\x18\x05 \x01(\t\"\xc3\x01\n\x0fPublishResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x11\n\tpersisted\x18\x02 \x01(\x08\x12\x17\n\x0fstream_sequence\x18\x03 \x01(\x04\x12\x19\n\x11\x63onsumer_sequence\x18\x04 \x01(\x04\x12\x0f\n\x07subject\x18\x05 \x01(\t\x12\x1b\n\x13server_time_unix_ns\x18\x06 \x01(\x03\x12\x12\n\nerror_code\x18\x07 \x01(\t\x12\x15\n\rerror_message\x18\x08 \x01(\t\"F\n\x13PublishBatchRequest\x12/\n\x05items\x18\x01 \x03(\x0b\x32 .atr.transport.v1.PublishRequest\"G\n\x14PublishBatchResponse\x12/\n\x04\x61\x63ks\x18\x01 \x03(\x0b\x32!.atr.transport.v1.PublishResponse\"\xc0\x01\n\x10SubscribeRequest\x12\x16\n\x0esubject_filter\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65liver_all\x18\x02 \x01(\x08\x12\x18\n\x10\x64\x65liver_new_only\x18\x03 \x01(\x08\x12\x14\n\x0c\x64urable_name\x18\x04 \x01(\t\x12\x15\n\rmax_in_flight\x18\x05 \x01(\r\x12\x11\n\ttenant_id\x18\x06 \x01(\t\x12%\n\x0estart_sequence\x18\x07 \x01(\x04R\rstartSequence\"r\n\rEnvelopeFrame\x12\x1a\n\x12\x63\x61nonical_envelope\x18\x01 \x01(\x0c\x12\x0f\n\x07subject\x18\x02 \x01(\t\x12\x17\n\x0fstream_sequence\x18\x03 \x01(\x04\x12\x1b\n\x13\x62roker_time_unix_ns\x18\x04 \x01(\x03\"(\n\rHealthRequest\x12\x17\n\x0finclude_metrics\x18\x01 \x01(\x08\"\xc2\x01\n\x0eHealthResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x16\n\x0enats_connected\x18\x02 \x01(\x08\x12\x17\n\x0fjetstream_ready\x18\x03 \x01(\x08\x12\x12\n\noverloaded\x18\x04 \x01(\x08\x12\x1a\n\x12publish_rate_msg_s\x18\x05 \x01(\x04\x12\x1c\n\x14subscribe_rate_msg_s\x18\x06 \x01(\x04\x12\x14\n\x0c\x62\x61\x63klog_msgs\x18\x07 \x01(\x04\x12\x0f\n\x07version\x18\x08 \x01(\t\"K\n\x13RequestReplyRequest\x12\x0f\n\x07subject\x18\x01 \x01(\t\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\x12\x12\n\ntimeout_ms\x18\x03 \x01(\r\"^\n\x14RequestReplyResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\x12\x12\n\nerror_code\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t*b\n\nSubmitMode\x12\x1b\n\x17SUBMIT_MODE_UNSPECIFIED\x10\x00\x12\x0f\n\x0bINLINE_ONLY\x10\x01\x12\x13\n\x0f\x41LLOW_ARENA_REF\x10\x02\x12\x11\n\rALLOW_SHM_REF\x10\x03*H\n\x08\x44\x65\x63ision\x12\x18\n\x14\x44\x45\x43ISION_UNSPECIFIED\x10\x00\x12\t\n\x05\x41LLOW\x10\x01\x12\x08\n\x04\x44ROP\x10\x02\x12\r\n\tTHROTTLED\x10\x03\x32\xbd\x03\n\x0c\x41trTransport\x12N\n\x07Publish\x12 .atr.transport.v1.PublishRequest\x1a!.atr.transport.v1.PublishResponse\x12]\n\x0cPublishBatch\x12%.atr.transport.v1.PublishBatchRequest\x1a&.atr.transport.v1.PublishBatchResponse\x12R\n\tSubscribe\x12\".atr.transport.v1.SubscribeRequest\x1a\x1f.atr.transport.v1.EnvelopeFrame0\x01\x12K\n\x06Health\x12\x1f.atr.transport.v1.HealthRequest\x1a .atr.transport.v1.HealthResponse\x12]\n\x0cRequestReply\x12%.atr.transport.v1.RequestReplyRequest\x1a&.atr.transport.v1.RequestReplyResponse2\xd9\x01\n\x10TachyonTransport\x12Z\n\x0bSubmitBatch\x12$.atr.transport.v1.BatchSubmitRequest\x1a%.atr.transport.v1.BatchSubmitResponse\x12i\n\x10UpdateGovernance\x12).atr.transport.v1.GovernanceUpdateRequest\x1a*.atr.transport.v1.GovernanceUpdateResponseB\x14P\x01Z\x10\x61tr/transport/v1b\x06proto3')
 
-_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
-_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'atr_transport_pb2', globals())
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'atr_transport_pb2', _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  DESCRIPTOR._serialized_options = b'Z\034atr/transport/v1;transportv1'
-  _PUBLISHREQUEST._serialized_start=42
-  _PUBLISHREQUEST._serialized_end=181
-  _PUBLISHRESPONSE._serialized_start=184
-  _PUBLISHRESPONSE._serialized_end=379
-  _SUBSCRIBEREQUEST._serialized_start=382
-  _SUBSCRIBEREQUEST._serialized_end=535
-  _ENVELOPEFRAME._serialized_start=537
-  _ENVELOPEFRAME._serialized_end=651
-  _HEALTHREQUEST._serialized_start=653
-  _HEALTHREQUEST._serialized_end=693
-  _HEALTHRESPONSE._serialized_start=696
-  _HEALTHRESPONSE._serialized_end=890
-  _REQUESTREPLYREQUEST._serialized_start=892
-  _REQUESTREPLYREQUEST._serialized_end=967
-  _REQUESTREPLYRESPONSE._serialized_start=969
-  _REQUESTREPLYRESPONSE._serialized_end=1063
-  _ATRTRANSPORT._serialized_start=1066
-  _ATRTRANSPORT._serialized_end=1416
+  DESCRIPTOR._serialized_options = b'P\001Z\020atr/transport/v1'
+  _globals['_SUBMITMODE']._serialized_start=2435
+  _globals['_SUBMITMODE']._serialized_end=2533
+  _globals['_DECISION']._serialized_start=2535
+  _globals['_DECISION']._serialized_end=2607
+  _globals['_TACHYONPACKET']._serialized_start=42
+  _globals['_TACHYONPACKET']._serialized_end=220
+  _globals['_ARENAREF']._serialized_start=222
+  _globals['_ARENAREF']._serialized_end=300
+  _globals['_SHMREF']._serialized_start=302
+  _globals['_SHMREF']._serialized_end=380
+  _globals['_BATCHSUBMITREQUEST']._serialized_start=383
+  _globals['_BATCHSUBMITREQUEST']._serialized_end=575
+  _globals['_BATCHSUBMITRESPONSE']._serialized_start=578
+  _globals['_BATCHSUBMITRESPONSE']._serialized_end=750
+  _globals['_PACKETRESULT']._serialized_start=752
+  _globals['_PACKETRESULT']._serialized_end=827
+  _globals['_GOVERNANCEUPDATEREQUEST']._serialized_start=830
+  _globals['_GOVERNANCEUPDATEREQUEST']._serialized_end=1008
+  _globals['_TOPICRATELIMIT']._serialized_start=1010
+  _globals['_TOPICRATELIMIT']._serialized_end=1083
+  _globals['_SENDERQUOTA']._serialized_start=1085
+  _globals['_SENDERQUOTA']._serialized_end=1140
+  _globals['_GOVERNANCEUPDATERESPONSE']._serialized_start=1142
+  _globals['_GOVERNANCEUPDATERESPONSE']._serialized_end=1225
+  _globals['_PUBLISHREQUEST']._serialized_start=1228
+  _globals['_PUBLISHREQUEST']._serialized_end=1367
+  _globals['_PUBLISHRESPONSE']._serialized_start=1370
+  _globals['_PUBLISHRESPONSE']._serialized_end=1565
+  _globals['_PUBLISHBATCHREQUEST']._serialized_start=1567
+  _globals['_PUBLISHBATCHREQUEST']._serialized_end=1637
+  _globals['_PUBLISHBATCHRESPONSE']._serialized_start=1639
+  _globals['_PUBLISHBATCHRESPONSE']._serialized_end=1710
+  _globals['_SUBSCRIBEREQUEST']._serialized_start=1713
+  _globals['_SUBSCRIBEREQUEST']._serialized_end=1905
+  _globals['_ENVELOPEFRAME']._serialized_start=1907
+  _globals['_ENVELOPEFRAME']._serialized_end=2021
+  _globals['_HEALTHREQUEST']._serialized_start=2023
+  _globals['_HEALTHREQUEST']._serialized_end=2063
+  _globals['_HEALTHRESPONSE']._serialized_start=2066
+  _globals['_HEALTHRESPONSE']._serialized_end=2260
+  _globals['_REQUESTREPLYREQUEST']._serialized_start=2262
+  _globals['_REQUESTREPLYREQUEST']._serialized_end=2337
+  _globals['_REQUESTREPLYRESPONSE']._serialized_start=2339
+  _globals['_REQUESTREPLYRESPONSE']._serialized_end=2433
+  _globals['_ATRTRANSPORT']._serialized_start=2610
+  _globals['_ATRTRANSPORT']._serialized_end=3055
+  _globals['_TACHYONTRANSPORT']._serialized_start=3058
+  _globals['_TACHYONTRANSPORT']._serialized_end=3275
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+# length, event id, stream sequence, crc32 of the canonical bytes
+_RECORD = struct.Struct("<I16sQI")
+_INDEX_ENTRY = struct.Struct("<16sQ")  # event id, record offset
+_STOP = object()
+
+_Record = tuple[bytes, int, bytes]  # event id, stream sequence, canonical bytes
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerCorruptionError(RuntimeError):
+    pass
+
+
+class LedgerWriteError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    event_id: str
+    stream_sequence: int
+    canonical_envelope: bytes
+
+
+def event_id_bytes(event_id: str) -> bytes:
+    return uuid.UUID(event_id).bytes
+
+
+class _SealedSegment:
+    def __init__(self, segment_path: Path, index_path: Path) -> None:
+        self.path = segment_path
+        self._segment = _map(segment_path)
+        self._index = _map(index_path)
+        self._count = len(self._index) // _INDEX_ENTRY.size if self._index is not None else 0
+        self.first_id = self._key(0) if self._count else b""
+        self.last_id = self._key(self._count - 1) if self._count else b""
+
+    def _key(self, position: int) -> bytes:
+        assert self._index is not None
+        start = position * _INDEX_ENTRY.size
+        return self._index[start : start + 16]
+
+    def find(self, key: bytes) -> int | None:
+        # Binary search over the sorted, memory-mapped index.
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self._key(low) != key:
+            return None
+        assert self._index is not None
+        return _INDEX_ENTRY.unpack_from(self._index, low * _INDEX_ENTRY.size)[1]
+
+    def read(self, offset: int) -> LedgerEntry:
+        assert self._segment is not None
+        return _read_record(self._segment, offset)
+
+    def close(self) -> None:
+        for mapped in (self._segment, self._index):
+            if mapped is not None:
+                mapped.close()
+
+
+class _PeerLedger:
+    """Read-only view of another writer's ledger directory.
+
+    Each lookup refreshes it: segments that have been sealed with an index
+    are mapped, and the rest are scanned incrementally from where the last
+    refresh stopped, so a record is visible once its writer has flushed it.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._sealed: dict[Path, _SealedSegment] = {}
+        self._tails: dict[Path, tuple[int, dict[bytes, int]]] = {}
+
+    def get(self, key: bytes) -> LedgerEntry | None:
+        with self._lock:
+            self._refresh()
+            for path, (_, offsets) in self._tails.items():
+                offset = offsets.get(key)
+                if offset is not None:
+                    return _read_at(path, offset)
+            sealed = [self._sealed[path] for path in sorted(self._sealed)]
+        return _find_sealed(sealed, key)
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._sealed.values():
+                segment.close()
+            self._sealed = {}
+
+    def _refresh(self) -> None:
+        segments = sorted(self._directory.glob(f"*{SEGMENT_SUFFIX}"))
+        for position, path in enumerate(segments):
+            if path in self._sealed:
+                continue
+            index_path = path.with_suffix(INDEX_SUFFIX)
+            if position < len(segments) - 1 and index_path.exists():
+                self._sealed[path] = _SealedSegment(path, index_path)
+                self._tails.pop(path, None)
+            else:
+                self._scan_tail(path)
+
+    def _scan_tail(self, path: Path) -> None:
+        offset, offsets = self._tails.get(path, (0, {}))
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            self._tails.pop(path, None)
+            return
+        if size < offset:  # the writer cut a torn tail on restart
+            offset, offsets = 0, {}
+        if size > offset:
+            with open(path, "rb") as handle:
+                handle.seek(offset)
+                entries, consumed = _parse(handle.read())
+            offsets.update((key, offset + position) for key, position in entries)
+            offset += consumed
+        self._tails[path] = (offset, offsets)
+
+
+class LedgerStore:
+    """Append-only local ledger of published canonical envelopes.
+
+    Records are length-prefixed and checksummed in numbered segment files.
+    When a segment rolls over, a sorted ``event_id -> offset`` index is
+    written next to it; lookups skip segments whose id range cannot match
+    (UUIDv7 ids are time ordered, so ranges rarely overlap), binary-search
+    the mapped index and read one record.
+
+    ``enqueue`` hands appends to a single writer thread, which writes
+    whatever has queued up with one flush; queued entries are served from
+    memory until they are on disk. If a write fails the ledger stops
+    writing: the failed and later appends are discarded, and ``enqueue`` and
+    ``flush`` raise ``LedgerWriteError`` from then on.
+
+    ``peers`` are ledger directories written by other processes (the other
+    atr-ingress workers); ``get`` falls back to reading them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        peers: Iterable[str] = (),
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._sealed: list[_SealedSegment] = []
+        self._active_offsets: dict[bytes, int] = {}
+        self._pending: dict[bytes, LedgerEntry] = {}
+        self._queue: queue.Queue[_Record | object] = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._peers = [_PeerLedger(Path(peer)) for peer in peers]
+
+        segments = sorted(self._directory.glob(f"*{SEGMENT_SUFFIX}"))
+        for segment_path in segments[:-1]:
+            index_path = segment_path.with_suffix(INDEX_SUFFIX)
+            if not index_path.exists() or index_path.stat().st_mtime_ns < segment_path.stat().st_mtime_ns:
+                _write_index(index_path, _scan(segment_path, truncate=False))
+            self._sealed.append(_SealedSegment(segment_path, index_path))
+
+        if segments:
+            self._active_path = segments[-1]
+            self._active_offsets = dict(_scan(self._active_path, truncate=True))
+            self._active_path.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
+        else:
+            self._active_path = self._segment_path(1)
+        self._active = open(self._active_path, "ab")
+
+    def append(self, event_id: str, stream_sequence: int, canonical_envelope: bytes) -> None:
+        with self._lock:
+            self._write([(event_id_bytes(event_id), stream_sequence, canonical_envelope)])
+
+    def enqueue(self, event_id: str, stream_sequence: int, canonical_envelope: bytes) -> None:
+        """Queue an append for the writer thread; ``get`` sees it right away."""
+        key = event_id_bytes(event_id)
+        with self._lock:
+            self._raise_if_failed()
+            self._pending[key] = LedgerEntry(event_id, stream_sequence, canonical_envelope)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="atr-ledger-writer", daemon=True)
+                self._writer.start()
+        self._queue.put((key, stream_sequence, canonical_envelope))
+
+    def flush(self) -> None:
+        """Wait until every queued append is on disk."""
+        self._queue.join()
+        with self._lock:
+            self._raise_if_failed()
+
+    @property
+    def healthy(self) -> bool:
+        return self._error is None
+
+    def get(self, event_id: str) -> LedgerEntry | None:
+        try:
+            key = event_id_bytes(event_id)
+        except ValueError:
+            return None
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+            offset = self._active_offsets.get(key)
+            if offset is not None:
+                return _read_at(self._active_path, offset)
+            sealed = list(self._sealed)
+        entry = _find_sealed(sealed, key)
+        if entry is not None:
+            return entry
+        for peer in self._peers:
+            entry = peer.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._sealed) + 1
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            self._active.close()
+            for segment in self._sealed:
+                segment.close()
+            self._sealed = []
+        for peer in self._peers:
+            peer.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in items if item is not _STOP]
+            with self._lock:
+                if self._error is None:
+                    try:
+                        self._write(records)  # type: ignore[arg-type]
+                    except Exception as exc:  # noqa: BLE001 - disk errors end writing, not the thread
+                        logger.exception("ledger write to %s failed; discarding further appends", self._active_path)
+                        self._error = exc
+                for key, _, _ in records:  # type: ignore[misc]
+                    self._pending.pop(key, None)
+            for _ in items:
+                self._queue.task_done()
+            if len(records) != len(items):
+                return
+
+    def _raise_if_failed(self) -> None:
+        # Caller holds the lock.
+        if self._error is not None:
+            raise LedgerWriteError(f"ledger writer failed: {self._error}") from self._error
+
+    def _write(self, records: list[_Record]) -> None:
+        # Caller holds the lock. Offsets are published only after the flush,
+        # so get() never reads a record that is still in the file buffer.
+        offsets: list[tuple[bytes, int]] = []
+        for key, stream_sequence, canonical_envelope in records:
+            offsets.append((key, self._active.tell()))
+            self._active.write(_RECORD.pack(len(canonical_envelope), key, stream_sequence, zlib.crc32(canonical_envelope)))
+            self._active.write(canonical_envelope)
+            if self._active.tell() >= self._max_segment_bytes:
+                self._active.flush()
+                self._active_offsets.update(offsets)
+                offsets.clear()
+                self._roll()
+        self._active.flush()
+        self._active_offsets.update(offsets)
+
+    def _roll(self) -> None:
+        self._active.close()
+        index_path = self._active_path.with_suffix(INDEX_SUFFIX)
+        _write_index(index_path, self._active_offsets.items())
+        self._sealed.append(_SealedSegment(self._active_path, index_path))
+        self._active_path = self._segment_path(int(self._active_path.stem) + 1)
+        self._active_offsets = {}
+        self._active = open(self._active_path, "ab")
+
+    def _segment_path(self, number: int) -> Path:
+        return self._directory / f"{number:012d}{SEGMENT_SUFFIX}"
+
+
+def _find_sealed(sealed: list[_SealedSegment], key: bytes) -> LedgerEntry | None:
+    for segment in reversed(sealed):
+        if segment.first_id <= key <= segment.last_id:
+            found = segment.find(key)
+            if found is not None:
+                return segment.read(found)
+    return None
+
+
+def _map(path: Path) -> mmap.mmap | None:
+    if path.stat().st_size == 0:
+        return None
+    with open(path, "rb") as handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_at(path: Path, offset: int) -> LedgerEntry:
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        header = handle.read(_RECORD.size)
+        return _read_record(header + handle.read(_RECORD.unpack(header)[0]), 0)
+
+
+def _read_record(buffer: bytes | mmap.mmap, offset: int) -> LedgerEntry:
+    length, key, sequence, checksum = _RECORD.unpack_from(buffer, offset)
+    start = offset + _RECORD.size
+    body = bytes(buffer[start : start + length])
+    if len(body) != length or zlib.crc32(body) != checksum:
+        raise LedgerCorruptionError(f"ledger record at offset {offset} failed checksum")
+    return LedgerEntry(str(uuid.UUID(bytes=key)), sequence, body)
+
+
+def _scan(path: Path, truncate: bool) -> list[tuple[bytes, int]]:
+    # Walks a segment record by record; with truncate=True a torn or corrupt
+    # tail left by a crash is cut off so appends resume on a record boundary.
+    data = path.read_bytes()
+    entries, offset = _parse(data)
+    if offset != len(data):
+        if not truncate:
+            raise LedgerCorruptionError(f"sealed ledger segment {path} is corrupt at offset {offset}")
+        with open(path, "r+b") as handle:
+            handle.truncate(offset)
+    return entries
+
+
+def _parse(data: bytes) -> tuple[list[tuple[bytes, int]], int]:
+    # (event id, offset) of each intact record, and where the intact prefix ends.
+    entries: list[tuple[bytes, int]] = []
+    offset = 0
+    while offset + _RECORD.size <= len(data):
+        length, key, _, checksum = _RECORD.unpack_from(data, offset)
+        end = offset + _RECORD.size + length
+        if end > len(data) or zlib.crc32(data[offset + _RECORD.size : end]) != checksum:
+            break
+        entries.append((key, offset))
+        offset = end
+    return entries, offset
+
+
+def _write_index(path: Path, entries: Iterable[tuple[bytes, int]]) -> None:
+    ordered = sorted(dict(entries).items())
+    temporary = path.with_suffix(INDEX_SUFFIX + ".tmp")
+    with open(temporary, "wb") as handle:
+        for key, offset in ordered:
+            handle.write(_INDEX_ENTRY.pack(key, offset))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# What apply_event raises for a malformed event: a non-object payload, an
+# unhashable key or a non-integer ``incr``.
+_MALFORMED_EVENT = (AttributeError, TypeError, ValueError)
+
+
+def apply_event(state: dict[str, Any], event: dict[str, Any]) -> None:
+    payload = event.get("payload", {})
+    op = payload.get("op")
+    key = payload.get("key")
+    if op in ("set", "delete", "incr") and not isinstance(key, str):
+        # State keys must be strings: snapshots sort and JSON-encode them.
+        raise TypeError(f"state key must be a string, got {type(key).__name__}")
+
+    if op == "set":
+        state[key] = payload.get("value")
+    elif op == "delete":
+        state.pop(key, None)
+    elif op == "incr":
+        state[key] = int(state.get(key, 0)) + int(payload.get("value", 0))
+
+
+def canonical_snapshot_hash(snapshot: dict[str, Any]) -> str:
+    canonical = json.dumps(snapshot, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=32).hexdigest()
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    stream_sequence: int
+    snapshot_hash: str
+    state: dict[str, Any]
+
+
+class StateStore:
+    """In-memory materialized state fed in stream order.
+
+    Events at or below the last applied ``stream_sequence`` are ignored, so
+    at-least-once redelivery is idempotent. Malformed events are logged and
+    skipped, but still advance the sequence. Snapshots are written in the
+    background every ``update_every_events`` events or
+    ``update_every_seconds`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str | None = None,
+        update_every_events: int = 1000,
+        update_every_seconds: float = 300.0,
+    ) -> None:
+        self._state: dict[str, Any] = {}
+        self._stream_sequence = 0
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._update_every_events = update_every_events
+        self._update_every_seconds = update_every_seconds
+        self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._writer: Executor | None = None
+        self._pending_write: Future[None] | None = None
+        if self._snapshot_path is not None and self._snapshot_path.exists():
+            self._restore(self._snapshot_path)
+
+    @property
+    def stream_sequence(self) -> int:
+        return self._stream_sequence
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        value = self._state.get(key, _MISSING)
+        return (False, None) if value is _MISSING else (True, value)
+
+    def apply(self, event: dict[str, Any], stream_sequence: int) -> bool:
+        with self._lock:
+            if stream_sequence <= self._stream_sequence:
+                return False
+            self._stream_sequence = stream_sequence
+            try:
+                apply_event(self._state, event)
+            except _MALFORMED_EVENT as exc:
+                logger.warning("skipping malformed state event at sequence %d: %s", stream_sequence, exc)
+                return False
+            self._events_since_snapshot += 1
+            if self._snapshot_due():
+                self._schedule_snapshot()
+            return True
+
+    def apply_frame(self, canonical_envelope: bytes, stream_sequence: int) -> bool:
+        try:
+            event = json.loads(canonical_envelope)
+        except ValueError as exc:
+            logger.warning("skipping undecodable state frame at sequence %d: %s", stream_sequence, exc)
+            with self._lock:
+                self._stream_sequence = max(self._stream_sequence, stream_sequence)
+            return False
+        return self.apply(event, stream_sequence)
+
+    def snapshot(self) -> StateSnapshot:
+        with self._lock:
+            state = dict(self._state)
+            sequence = self._stream_sequence
+        return StateSnapshot(sequence, canonical_snapshot_hash(state), state)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._snapshot_path is not None and self._events_since_snapshot:
+                self._schedule_snapshot()
+            pending = self._pending_write
+        if pending is not None:
+            pending.result()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+
+    def _snapshot_due(self) -> bool:
+        if self._snapshot_path is None:
+            return False
+        if self._update_every_events > 0 and self._events_since_snapshot >= self._update_every_events:
+            return True
+        return (
+            self._update_every_seconds > 0
+            and time.monotonic() - self._last_snapshot_at >= self._update_every_seconds
+        )
+
+    def _schedule_snapshot(self) -> None:
+        # Values are replaced, never mutated in place, so a shallow copy taken
+        # under the lock is a consistent point-in-time view.
+        state = dict(self._state)
+        sequence = self._stream_sequence
+        self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-snapshot")
+        self._pending_write = self._writer.submit(self._write_snapshot, sequence, state)
+
+    def _write_snapshot(self, stream_sequence: int, state: dict[str, Any]) -> None:
+        assert self._snapshot_path is not None
+        document = {
+            "stream_sequence": stream_sequence,
+            "snapshot_hash": canonical_snapshot_hash(state),
+            "state": state,
+        }
+        self._snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._snapshot_path.with_suffix(self._snapshot_path.suffix + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._snapshot_path)
+
+    def _restore(self, path: Path) -> None:
+        document = json.loads(path.read_text(encoding="utf-8"))
+        state = document["state"]
+        if canonical_snapshot_hash(state) != document["snapshot_hash"]:
+            raise ValueError(f"state snapshot {path} failed hash verification")
+        self._state = state
+        self._stream_sequence = int(document["stream_sequence"])
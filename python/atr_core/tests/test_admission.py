@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+
+from atr_core.api.admission import AdmissionController, AdmissionRejected, BackpressureState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock: FakeClock, **options: float) -> AdmissionController:
+    return AdmissionController(shards=1, shard_capacity=10, latency_budget_s=0.01, window_s=0.1, clock=clock, **options)
+
+
+def test_in_flight_fill_escalates_and_sheds_lower_priorities_first() -> None:
+    clock = FakeClock()
+    controller = _controller(clock)
+    for _ in range(6):
+        controller.admit("state.mutation")
+
+    with pytest.raises(AdmissionRejected) as shed:
+        controller.admit("telemetry.standard")
+    assert (shed.value.state, shed.value.reason) == (BackpressureState.YELLOW, "shed")
+    assert shed.value.retry_after_s >= 1
+
+    for _ in range(3):
+        controller.admit("state.mutation")
+    with pytest.raises(AdmissionRejected) as orange:
+        controller.admit("state.mutation")
+    assert orange.value.state == BackpressureState.ORANGE
+    controller.admit("governance.decision")
+
+    with pytest.raises(AdmissionRejected) as full:
+        controller.admit("system.heartbeat")
+    assert (full.value.state, full.value.reason) == (BackpressureState.RED, "queue_full")
+
+
+def test_recovery_steps_down_one_level_after_calm_windows() -> None:
+    clock = FakeClock()
+    controller = _controller(clock)
+    controller.observe_transport("sidecar", 1.0)
+    with pytest.raises(AdmissionRejected):
+        controller.admit("state.mutation")
+    assert controller.state(0) == BackpressureState.RED
+
+    controller.observe_transport("sidecar", 0.0)
+    clock.now += 0.5
+    controller.admit("system.heartbeat")
+    assert controller.state(0) == BackpressureState.RED
+
+    clock.now += 1.0
+    controller.admit("system.heartbeat")
+    assert controller.state(0) == BackpressureState.ORANGE
+
+
+def test_slow_or_failing_publishes_escalate_the_shard() -> None:
+    clock = FakeClock()
+    controller = _controller(clock)
+    shard = controller.admit("state.mutation")
+    controller.release(shard, 0.03)
+    clock.now += 0.1
+
+    with pytest.raises(AdmissionRejected):
+        controller.admit("state.mutation")
+    assert controller.state(0) == BackpressureState.ORANGE
+
+    clock.now += 0.1
+    shard = controller.admit("system.heartbeat")
+    controller.release(shard, 0.001, ok=False)
+    clock.now += 0.1
+    controller.admit("system.heartbeat")
+    assert controller.state(0) == BackpressureState.RED
+
+
+def test_latency_signal_is_the_window_p99_not_the_mean() -> None:
+    clock = FakeClock()
+    controller = _controller(clock)
+    for latency in [0.001] * 98 + [0.03] * 2:
+        controller.release(controller.admit("state.mutation"), latency)
+    clock.now += 0.1
+
+    with pytest.raises(AdmissionRejected):
+        controller.admit("state.mutation")
+    assert controller.state(0) == BackpressureState.ORANGE
+
+
+def test_batch_holds_one_slot_per_shard_and_is_judged_before_its_own_items() -> None:
+    clock = FakeClock()
+    controller = _controller(clock)
+    for _ in range(5):
+        controller.admit("state.mutation")
+
+    decisions = controller.admit_batch(["state.mutation"] * 50 + ["telemetry.standard"] * 50)
+
+    assert decisions == {"state.mutation": 0, "telemetry.standard": 0}
+    assert controller.state(0) == BackpressureState.GREEN
+    controller.admit("state.mutation")  # the batch counts as one of 6 in flight
+    assert controller.state(0) == BackpressureState.YELLOW
+    controller.release_batch([0, 0])
+    assert controller._shards[0].in_flight == 6
+
+
+def test_event_types_hash_to_independent_shards() -> None:
+    controller = AdmissionController(shards=64, shard_capacity=1, clock=FakeClock())
+    shard = controller.admit("state.mutation")
+
+    other = next(f"state.type{n}" for n in range(100) if controller.classify(f"state.type{n}")[0] != shard)
+    assert controller.admit(other) != shard
+    with pytest.raises(AdmissionRejected):
+        controller.admit("state.mutation")
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field, replace
+import json
+import sys
+import types
+
+from fastapi.testclient import TestClient
+
+
+fake_transport_client = types.ModuleType("atr_core.transport.aio")
+
+
+class AsyncAtrTransportClient:  # pragma: no cover - import shim only
+    def __init__(self, target: str, timeout_ms: int, **options: int) -> None:  # noqa: ARG002
+        pass
+
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = ""):  # noqa: ANN201,ARG002
+        raise NotImplementedError
+
+
+fake_transport_client.AsyncAtrTransportClient = AsyncAtrTransportClient
+try:
+    import atr_core.transport.aio  # noqa: F401
+except ImportError:  # pragma: no cover - grpc/protobuf not installed
+    sys.modules.setdefault("atr_core.transport.aio", fake_transport_client)
+
+from atr_core.api import app as app_module
+from atr_core.api.admission import AdmissionController
+from atr_core.api.ingest import decode_json
+from atr_core.core.immune import ImmuneResult
+from atr_core.store.state import StateStore
+from atr_core.transport import tachyon
+
+
+@dataclass
+class Ack:
+    accepted: bool
+    error_message: str = ""
+    stream_sequence: int = 0
+
+
+@dataclass
+class RecordingImmune:
+    seen: list[dict] = field(default_factory=list)
+
+    def evaluate(self, envelope: dict) -> ImmuneResult:
+        self.seen.append(envelope)
+        return ImmuneResult(True, "", b"{}")
+
+    def evaluate_many(self, envelopes: list) -> list[ImmuneResult]:
+        return [self.evaluate(envelope) for envelope in envelopes]
+
+    async def evaluate_many_async(self, envelopes: list) -> list[ImmuneResult]:
+        return await asyncio.to_thread(self.evaluate_many, envelopes)
+
+
+@dataclass
+class RecordingTransport:
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+        return Ack(True, stream_sequence=1)
+
+
+_ENVELOPE = {"header": {"type": "state.mutation"}, "meta": {}, "payload": {"x": 1}}
+
+
+def _client(monkeypatch) -> tuple[TestClient, RecordingImmune]:
+    immune = RecordingImmune()
+    monkeypatch.setattr(app_module, "immune", immune)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+    monkeypatch.setattr(app_module, "dedup", None)
+    return TestClient(app_module.app), immune
+
+
+def test_submit_decodes_raw_body_into_envelope(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+
+    response = client.post("/v1/submit", content=json.dumps(_ENVELOPE))
+
+    assert response.status_code == 202
+    assert immune.seen == [_ENVELOPE]
+
+
+def test_evaluation_runs_off_the_event_loop(monkeypatch) -> None:
+    client, _ = _client(monkeypatch)
+    loops: list[bool] = []
+
+    class LoopProbe(RecordingImmune):
+        def evaluate(self, envelope: dict) -> ImmuneResult:
+            try:
+                asyncio.get_running_loop()
+                loops.append(True)
+            except RuntimeError:
+                loops.append(False)
+            return super().evaluate(envelope)
+
+    monkeypatch.setattr(app_module, "immune", LoopProbe())
+
+    assert client.post("/v1/submit", content=json.dumps(_ENVELOPE)).status_code == 202
+    assert client.post("/v1/submit/batch", json=[_ENVELOPE]).status_code == 200
+    assert loops == [False, False]
+
+
+def test_submit_rejects_oversize_body_before_decoding(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+    monkeypatch.setattr(app_module, "MAX_ENVELOPE_BYTES", 64)
+    oversize = json.dumps({**_ENVELOPE, "payload": {"x": "y" * 100}})
+
+    declared = client.post("/v1/submit", content=oversize)
+    chunked = client.post("/v1/submit", content=(part.encode() for part in (oversize[:40], oversize[40:])))
+
+    assert declared.status_code == 413
+    assert chunked.status_code == 413
+    assert immune.seen == []
+
+
+def test_submit_batch_rejects_oversize_body(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+    monkeypatch.setattr(app_module, "MAX_BATCH_BYTES", 128)
+
+    response = client.post("/v1/submit/batch", json=[_ENVELOPE] * 4)
+
+    assert response.status_code == 413
+    assert immune.seen == []
+
+
+def test_submit_rejects_malformed_and_non_object_bodies(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+
+    assert client.post("/v1/submit", content=b"{not json").status_code == 400
+    assert client.post("/v1/submit", content=b"[1, 2]").status_code == 422
+    assert immune.seen == []
+
+
+def test_decode_json_keeps_json_semantics_for_edge_values() -> None:
+    decoded = decode_json(b'{"big": 123456789012345678901234567890, "nan": NaN}')
+
+    assert decoded["big"] == 123456789012345678901234567890
+    assert decoded["nan"] != decoded["nan"]
+
+
+@dataclass
+class CanonicalImmune:
+    calls: list[tuple[dict, bytes | None]] = field(default_factory=list)
+
+    def evaluate(self, envelope: dict, canonical_bytes: bytes | None = None) -> ImmuneResult:
+        self.calls.append((envelope, canonical_bytes))
+        return ImmuneResult(True, "", canonical_bytes or b"{}")
+
+
+@dataclass
+class PayloadTransport:
+    published: list[bytes] = field(default_factory=list)
+
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+        self.published.append(canonical_envelope)
+        return Ack(True, stream_sequence=len(self.published))
+
+
+def test_submit_octet_stream_publishes_the_submitted_canonical_bytes(monkeypatch) -> None:
+    immune, transport = CanonicalImmune(), PayloadTransport()
+    monkeypatch.setattr(app_module, "immune", immune)
+    monkeypatch.setattr(app_module, "transport", transport)
+    monkeypatch.setattr(app_module, "dedup", None)
+    client = TestClient(app_module.app)
+    body = b'{"header":{"type":"state.mutation"},"meta":{},"payload":{"x":1}}'
+
+    response = client.post(
+        "/v1/submit",
+        content=body,
+        headers={"content-type": "application/octet-stream", "x-atr-signature": "sig"},
+    )
+    unsigned = client.post("/v1/submit", content=body, headers={"content-type": "application/octet-stream"})
+
+    assert response.status_code == 202
+    assert unsigned.status_code == 400
+    envelope, canonical_bytes = immune.calls[0]
+    assert envelope["signature"] == "sig"
+    assert canonical_bytes == body
+    assert transport.published == [body]
+
+
+class UnreachableTransport:
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+        raise AssertionError("the tachyon profile must not publish on the request path")
+
+
+_TACHYON_ENVELOPE = {
+    "header": {"id": "018f9e53-6908-7b5f-bf2c-3f4a56d3f900", "timestamp": 42, "type": "state.mutation"},
+    "meta": {"correlation_id": "c-1"},
+    "payload": {"x": 1},
+}
+
+
+def test_tachyon_profile_queues_the_envelope_instead_of_publishing(monkeypatch) -> None:
+    client, _ = _client(monkeypatch)
+    monkeypatch.setattr(app_module, "transport", UnreachableTransport())
+    monkeypatch.setattr(app_module, "ledger", None)
+    submitted: list[tuple] = []
+    monkeypatch.setattr(tachyon, "_submit_packet", lambda *args: submitted.append(args) or len(submitted))
+    egress = tachyon.TachyonEgress()
+    monkeypatch.setattr(app_module, "tachyon_egress", egress)
+
+    response = client.post("/v1/submit", json=_TACHYON_ENVELOPE)
+
+    assert response.status_code == 202
+    sequence = response.json()["stream_sequence"]
+    assert submitted == [(0x018F9E5369087B5F, 0xBF2C3F4A56D3F900, sequence, 42, b"{}", 0)]
+    assert egress._routes == {sequence: ("aether.stream.core.state.mutation", "c-1")}
+
+
+def test_full_tachyon_queue_rejects_the_submission_and_fills_the_shard(monkeypatch) -> None:
+    client, _ = _client(monkeypatch)
+    monkeypatch.setattr(app_module, "transport", UnreachableTransport())
+    monkeypatch.setattr(app_module, "ledger", None)
+
+    def full_queue(*args) -> int:  # noqa: ANN002
+        raise OverflowError("packet queue full")
+
+    monkeypatch.setattr(tachyon, "_submit_packet", full_queue)
+    monkeypatch.setattr(app_module, "tachyon_egress", tachyon.TachyonEgress())
+    controller = AdmissionController(shards=1, shard_capacity=4)
+    monkeypatch.setattr(app_module, "admission", controller)
+
+    response = client.post("/v1/submit", json=_TACHYON_ENVELOPE)
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "packet queue full"
+    assert client.post("/v1/submit", json=_TACHYON_ENVELOPE).status_code == 429
+
+
+def test_overloaded_shard_returns_429_with_retry_after(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+    controller = AdmissionController(shards=1, shard_capacity=4)
+    controller.observe_transport("sidecar", 1.0)
+    monkeypatch.setattr(app_module, "admission", controller)
+
+    response = client.post("/v1/submit", json=_ENVELOPE)
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["detail"] == "shard 0 red: shed"
+    assert immune.seen == []
+
+
+def test_batch_reports_throttled_items_and_releases_admitted_ones(monkeypatch) -> None:
+    client, immune = _client(monkeypatch)
+    controller = AdmissionController(shards=1, shard_capacity=2, priorities={"telemetry": 3})
+    controller.observe_transport("sidecar", 0.6)
+    monkeypatch.setattr(app_module, "admission", controller)
+    telemetry = {"header": {"type": "telemetry.standard"}, "meta": {}, "payload": {"x": 1}}
+
+    response = client.post("/v1/submit/batch", json=[_ENVELOPE, telemetry])
+
+    assert response.status_code == 200
+    assert [item["status_code"] for item in response.json()["results"]] == [202, 429]
+    assert response.headers["retry-after"] == str(response.json()["results"][1]["retry_after_s"])
+    assert immune.seen == [_ENVELOPE]
+    controller.admit("state.mutation")
+    controller.admit("state.mutation")  # only fits if the batch released its slot
+
+
+def test_state_stream_skips_poison_event_and_keeps_applying(monkeypatch) -> None:
+    store = StateStore()
+    monkeypatch.setattr(app_module, "state_store", store)
+    frames = [
+        types.SimpleNamespace(canonical_envelope=b'{"payload":{"op":"incr","key":"n","value":"x"}}', stream_sequence=1),
+        types.SimpleNamespace(canonical_envelope=b'{"payload":{"op":"set","key":"k","value":1}}', stream_sequence=2),
+    ]
+
+    asyncio.run(app_module._apply_frames(frames))
+
+    assert store.lookup("k") == (True, 1)
+    assert store.stream_sequence == 2
+
+
+class ScriptedSubscription:
+    def __init__(self, outcome: BaseException | list | None) -> None:
+        self.outcome = outcome
+        self.closed = False
+
+    async def run(self, handler) -> None:  # noqa: ANN001
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        if self.outcome:
+            await handler(self.outcome)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_state_stream_is_reopened_after_it_ends_or_fails(monkeypatch) -> None:
+    store = StateStore()
+    monkeypatch.setattr(app_module, "state_store", store)
+    monkeypatch.setattr(
+        app_module,
+        "config",
+        replace(
+            app_module.config,
+            state=replace(app_module.config.state, subscribe_subject="aether.stream.>"),
+            transport=replace(app_module.config.transport, reconnect_backoff_ms=1, reconnect_backoff_max_ms=1),
+        ),
+    )
+    frame = types.SimpleNamespace(canonical_envelope=b'{"payload":{"op":"set","key":"k","value":1}}', stream_sequence=5)
+    subscriptions = [
+        ScriptedSubscription([frame]),
+        ScriptedSubscription(RuntimeError("stream broke")),
+        ScriptedSubscription(None),
+    ]
+    opened: list[int] = []
+
+    class Sidecar:
+        def subscribe(self, subject: str, **options: int) -> ScriptedSubscription:  # noqa: ARG002
+            opened.append(options["resume_after"])
+            return subscriptions[len(opened) - 1]
+
+    monkeypatch.setattr(app_module, "sidecar", Sidecar())
+
+    async def follow() -> None:
+        task = asyncio.create_task(app_module._follow_stream())
+        while len(opened) < 3 or not subscriptions[2].closed:
+            await asyncio.sleep(0.001)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(follow(), timeout=5))
+
+    assert opened == [0, 5, 5]
+    assert all(subscription.closed for subscription in subscriptions)
+    assert store.lookup("k") == (True, 1)
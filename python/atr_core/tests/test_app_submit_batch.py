@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import asyncio
+import json
+import sys
+import threading
+import time
+import types
+
+from fastapi.testclient import TestClient
+
+
+fake_transport_client = types.ModuleType("atr_core.transport.aio")
+
+
+class AsyncAtrTransportClient:  # pragma: no cover - import shim only
+    def __init__(self, target: str, timeout_ms: int, **options: int) -> None:  # noqa: ARG002
+        pass
+
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = ""):  # noqa: ANN201,ARG002
+        raise NotImplementedError
+
+
+fake_transport_client.AsyncAtrTransportClient = AsyncAtrTransportClient
+try:
+    import atr_core.transport.aio  # noqa: F401
+except ImportError:  # pragma: no cover - grpc/protobuf not installed
+    sys.modules.setdefault("atr_core.transport.aio", fake_transport_client)
+
+from atr_core.api import app as app_module
+from atr_core.api.admission import AdmissionController, BackpressureState
+from atr_core.core.dedup import IngressDedupStore
+from atr_core.core.immune import ImmuneResult
+
+
+@dataclass
+class Ack:
+    accepted: bool
+    error_message: str = ""
+    stream_sequence: int = 0
+
+
+@dataclass
+class StubImmune:
+    results: list[ImmuneResult]
+
+    def evaluate_many(self, envelopes: list) -> list[ImmuneResult]:
+        return self.results[: len(envelopes)]
+
+    async def evaluate_many_async(self, envelopes: list) -> list[ImmuneResult]:
+        return await asyncio.to_thread(self.evaluate_many, envelopes)
+
+
+@dataclass
+class RecordingTransport:
+    subjects: list[str] = field(default_factory=list)
+
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+        self.subjects.append(subject)
+        return Ack(True, stream_sequence=len(self.subjects))
+
+
+_RESULTS = [
+    ImmuneResult(True, "", b'{"header":{"id":"a"}}'),
+    ImmuneResult(False, "signature verification failed", b'{"header":{"id":"b"}}'),
+    ImmuneResult(False, "schema validation failed: missing property", b""),
+]
+_ENVELOPES = [
+    {"meta": {"correlation_id": "c1"}, "header": {"type": "state.mutation"}},
+    {"meta": {}, "header": {"type": "state.mutation"}},
+    {"meta": "not-an-object"},
+]
+
+
+def test_submit_batch_reports_per_item_results_in_input_order(monkeypatch) -> None:
+    transport = RecordingTransport()
+    monkeypatch.setattr(app_module, "immune", StubImmune(_RESULTS))
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", transport)
+
+    response = TestClient(app_module.app).post("/v1/submit/batch", json=_ENVELOPES)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (1, 2)
+    assert [item["index"] for item in body["results"]] == [0, 1, 2]
+    assert [item["status_code"] for item in body["results"]] == [202, 403, 400]
+    assert body["results"][0]["stream_sequence"] == 1
+    assert all(item["quarantined"] for item in body["results"][1:])
+    assert transport.subjects == [
+        "aether.stream.core.state.mutation",
+        app_module.config.immune.quarantine_subject,
+        app_module.config.immune.quarantine_subject,
+    ]
+
+
+def test_submit_batch_accepts_ndjson(monkeypatch) -> None:
+    monkeypatch.setattr(app_module, "immune", StubImmune(_RESULTS))
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+
+    body = "\n".join(json.dumps(envelope) for envelope in _ENVELOPES[:2]) + "\n"
+    response = TestClient(app_module.app).post(
+        "/v1/submit/batch",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()["results"]] == ["accepted", "rejected"]
+
+
+def test_submit_batch_rejects_non_array_body(monkeypatch) -> None:
+    monkeypatch.setattr(app_module, "immune", StubImmune(_RESULTS))
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+
+    response = TestClient(app_module.app).post("/v1/submit/batch", json={"header": {}})
+
+    assert response.status_code == 400
+
+
+class FailingImmune:
+    async def evaluate_many_async(self, envelopes: list) -> list[ImmuneResult]:  # noqa: ARG002
+        raise RuntimeError("verify pool died")
+
+
+def test_failed_batch_evaluation_releases_admitted_slots(monkeypatch) -> None:
+    controller = AdmissionController(shards=1, shard_capacity=4)
+    monkeypatch.setattr(app_module, "immune", FailingImmune())
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+    monkeypatch.setattr(app_module, "dedup", None)
+    monkeypatch.setattr(app_module, "admission", controller)
+
+    response = TestClient(app_module.app, raise_server_exceptions=False).post("/v1/submit/batch", json=_ENVELOPES)
+
+    assert response.status_code == 500
+    assert controller._shards[0].in_flight == 0
+
+
+def test_batch_larger_than_shard_fill_thresholds_is_admitted_whole(monkeypatch) -> None:
+    controller = AdmissionController(shards=1, shard_capacity=128)
+    count = 200  # > 0.8 x shard_capacity, and > shard_capacity
+    monkeypatch.setattr(app_module, "immune", StubImmune([ImmuneResult(True, "", b"{}")] * count))
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+    monkeypatch.setattr(app_module, "dedup", None)
+    monkeypatch.setattr(app_module, "ledger", None)
+    monkeypatch.setattr(app_module, "admission", controller)
+    envelopes = [{"meta": {}, "header": {"type": "state.mutation"}}] * count
+
+    response = TestClient(app_module.app).post("/v1/submit/batch", json=envelopes)
+
+    assert response.status_code == 200
+    assert response.json()["accepted"] == count
+    assert "retry-after" not in response.headers
+    assert controller.state(0) == BackpressureState.GREEN
+    assert controller._shards[0].in_flight == 0
+
+
+@dataclass
+class CountingImmune:
+    calls: int = 0
+
+    def evaluate(self, envelope: dict) -> ImmuneResult:
+        self.calls += 1
+        return ImmuneResult(True, "", b"{}")
+
+    def evaluate_many(self, envelopes: list) -> list[ImmuneResult]:
+        return [self.evaluate(envelope) for envelope in envelopes]
+
+    async def evaluate_many_async(self, envelopes: list) -> list[ImmuneResult]:
+        return await asyncio.to_thread(self.evaluate_many, envelopes)
+
+
+def test_retried_envelopes_replay_original_sequence_without_reevaluation(monkeypatch) -> None:
+    immune = CountingImmune()
+    transport = RecordingTransport()
+    monkeypatch.setattr(app_module, "immune", immune)
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", transport)
+    monkeypatch.setattr(app_module, "dedup", IngressDedupStore(window_s=60, bucket_s=1))
+    stamp = f"{time.time_ns() // 1_000_000:012x}"
+    envelope = {
+        "header": {"id": f"{stamp[:8]}-{stamp[8:]}-7000-8000-000000000001", "type": "state.mutation"},
+        "meta": {},
+        "signature": "sig",
+    }
+
+    first = asyncio.run(app_module.submit_envelope(envelope))
+    retry = asyncio.run(app_module.submit_envelope(envelope))
+    batch = TestClient(app_module.app).post("/v1/submit/batch", json=[envelope]).json()
+
+    assert first == {"accepted": True, "stream_sequence": 1}
+    assert retry == {"accepted": True, "stream_sequence": 1, "duplicate": True}
+    assert batch["results"][0]["duplicate"] and batch["results"][0]["stream_sequence"] == 1
+    assert immune.calls == 1
+    assert len(transport.subjects) == 1
+
+
+class ThreadRecordingDedup(IngressDedupStore):
+    def __init__(self, path: str) -> None:
+        super().__init__(window_s=60, bucket_s=1, path=path, shared=True)
+        self.threads: set[int] = set()
+
+    def lookup(self, event_id: str, signature: str) -> int | None:
+        self.threads.add(threading.get_ident())
+        return super().lookup(event_id, signature)
+
+    def record(self, event_id: str, signature: str, stream_sequence: int) -> None:
+        self.threads.add(threading.get_ident())
+        super().record(event_id, signature, stream_sequence)
+
+
+def test_shared_dedup_journal_is_used_off_the_event_loop(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(app_module, "immune", CountingImmune())
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
+    monkeypatch.setattr(app_module, "transport", RecordingTransport())
+    dedup = ThreadRecordingDedup(str(tmp_path / "dedup.journal"))
+    monkeypatch.setattr(app_module, "dedup", dedup)
+    stamp = f"{time.time_ns() // 1_000_000:012x}"
+    envelope = {
+        "header": {"id": f"{stamp[:8]}-{stamp[8:]}-7000-8000-000000000002", "type": "state.mutation"},
+        "meta": {},
+        "signature": "sig",
+    }
+
+    async def submit_twice() -> tuple[dict, dict, int]:
+        return await app_module.submit_envelope(envelope), await app_module.submit_envelope(envelope), threading.get_ident()
+
+    first, retry, loop_thread = asyncio.run(submit_twice())
+    dedup.close()
+
+    assert retry == {**first, "duplicate": True}
+    assert dedup.threads and loop_thread not in dedup.threads
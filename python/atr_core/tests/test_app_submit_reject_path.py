@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 import sys
 import types
@@ -8,19 +9,22 @@ import pytest
 from fastapi import HTTPException
 
 
-fake_transport_client = types.ModuleType("atr_core.transport.client")
+fake_transport_client = types.ModuleType("atr_core.transport.aio")
 
 
-class AtrTransportClient:  # pragma: no cover - import shim only
-    def __init__(self, target: str, timeout_ms: int) -> None:  # noqa: ARG002
+class AsyncAtrTransportClient:  # pragma: no cover - import shim only
+    def __init__(self, target: str, timeout_ms: int, **options: int) -> None:  # noqa: ARG002
         pass
 
-    def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = ""):  # noqa: ANN201,ARG002
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = ""):  # noqa: ANN201,ARG002
         raise NotImplementedError
 
 
-fake_transport_client.AtrTransportClient = AtrTransportClient
-sys.modules.setdefault("atr_core.transport.client", fake_transport_client)
+fake_transport_client.AsyncAtrTransportClient = AsyncAtrTransportClient
+try:
+    import atr_core.transport.aio  # noqa: F401
+except ImportError:  # pragma: no cover - grpc/protobuf not installed
+    sys.modules.setdefault("atr_core.transport.aio", fake_transport_client)
 
 from atr_core.api import app as app_module
 from atr_core.core.immune import ImmuneResult
@@ -45,7 +49,7 @@ class StubImmune:
 class StubTransport:
     ack: Ack
 
-    def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
         return self.ack
 
 
@@ -53,7 +57,7 @@ class StubTransport:
 class CrashTransport:
     error: RuntimeError
 
-    def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
+    async def publish(self, canonical_envelope: bytes, subject: str, correlation_id: str = "") -> Ack:  # noqa: ARG002
         raise self.error
 
 
@@ -63,10 +67,11 @@ def test_submit_returns_503_when_quarantine_transport_crashes(monkeypatch) -> No
         "immune",
         StubImmune(ImmuneResult(False, "signature verification failed", b'{"header":{"id":"x"}}')),
     )
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
     monkeypatch.setattr(app_module, "transport", CrashTransport(RuntimeError("broker disconnected")))
 
     with pytest.raises(HTTPException) as exc:
-        app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}})
+        asyncio.run(app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}}))
 
     assert exc.value.status_code == 503
     assert "quarantine publish unavailable" in exc.value.detail
@@ -78,10 +83,11 @@ def test_submit_returns_503_when_quarantine_publish_is_rejected(monkeypatch) ->
         "immune",
         StubImmune(ImmuneResult(False, "signature verification failed", b'{"header":{"id":"x"}}')),
     )
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
     monkeypatch.setattr(app_module, "transport", StubTransport(Ack(False, "quarantine publish failed")))
 
     with pytest.raises(HTTPException) as exc:
-        app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}})
+        asyncio.run(app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}}))
 
     assert exc.value.status_code == 503
     assert exc.value.detail == "quarantine publish failed"
@@ -93,10 +99,11 @@ def test_submit_returns_403_when_signature_fails_and_quarantine_publish_succeeds
         "immune",
         StubImmune(ImmuneResult(False, "signature verification failed", b'{"header":{"id":"x"}}')),
     )
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
     monkeypatch.setattr(app_module, "transport", StubTransport(Ack(True)))
 
     with pytest.raises(HTTPException) as exc:
-        app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}})
+        asyncio.run(app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}}))
 
     assert exc.value.status_code == 403
     assert exc.value.detail == "signature verification failed"
@@ -108,10 +115,11 @@ def test_submit_returns_400_when_schema_fails_and_quarantine_publish_succeeds(mo
         "immune",
         StubImmune(ImmuneResult(False, "schema validation failed: missing property", b"")),
     )
+    monkeypatch.setattr(app_module, "quarantine_sink", None)
     monkeypatch.setattr(app_module, "transport", StubTransport(Ack(True)))
 
     with pytest.raises(HTTPException) as exc:
-        app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}})
+        asyncio.run(app_module.submit_envelope({"meta": {}, "header": {"type": "state.mutation"}}))
 
     assert exc.value.status_code == 400
     assert exc.value.detail == "schema validation failed: missing property"
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
 from atr_core.core.canonicalization import (
+    CanonicalizationError,
     canonicalize_json,
+    canonicalize_json_into,
+    canonicalize_json_reference,
+    is_canonical,
     legacy_canonicalization_code,
     resolve_canonicalization_code,
 )
@@ -35,3 +45,71 @@ def test_duplicate_key_alias_support() -> None:
     assert legacy_canonicalization_code("CANON_DUPLICATE_KEY_AFTER_NORMALIZATION") == (
         "CANON_DUPLICATE_KEY_AFTER_NORMALIZE"
     )
+
+
+def test_canonicalization_matches_committed_vector() -> None:
+    expected = Path("specs/vectors/canonical_bytes_001.txt").read_bytes().rstrip(b"\n")
+    expected_hash = Path("specs/vectors/canonical_hash_001.hex").read_text().strip()
+
+    encoded = canonicalize_json(json.loads(expected))
+
+    assert encoded == expected
+    assert hashlib.sha256(encoded).hexdigest() == expected_hash
+
+
+def test_single_pass_encoder_matches_reference_encoder() -> None:
+    values = [
+        {"b": [1, 2.5, -0.0, 1e300, 10**30], "a": {"z": None, "y": True, "x": False}},
+        {"é": "café", "ex": " \u0000\"\\\t", "\U0001f600": ["\U0001f600"]},
+        {"nested": [[[{"k": "v"}]], {}, []], "": ""},
+        ["top", "level", 3, 0.1],
+        "scalar",
+    ]
+    for value in values:
+        assert canonicalize_json(value) == canonicalize_json_reference(value)
+
+
+def test_single_pass_encoder_reports_canonicalization_codes() -> None:
+    cases = [
+        ({"x": float("inf")}, "CANON_INVALID_NUMBER"),
+        ({1: "x"}, "CANON_NON_STRING_KEY"),
+        ({"x": b"bytes"}, "CANON_FORBIDDEN_TYPE"),
+        ({"x": ("tuple",)}, "CANON_FORBIDDEN_TYPE"),
+        ({"é": 1, "é": 2}, "CANON_DUPLICATE_KEY_AFTER_NORMALIZATION"),
+        ({"x": "\ud800"}, "CANON_ENCODING_ERROR"),
+    ]
+    for value, code in cases:
+        with pytest.raises(CanonicalizationError) as exc:
+            canonicalize_json(value)
+        assert exc.value.code == code
+        with pytest.raises(CanonicalizationError) as ref:
+            canonicalize_json_reference(value)
+        assert ref.value.code == code
+
+
+def test_canonicalize_json_into_flushes_bounded_chunks() -> None:
+    value = {"rows": [{"id": i, "name": f"row-é{i}"} for i in range(200)]}
+    chunks: list[bytes] = []
+
+    written = canonicalize_json_into(value, chunks.append, chunk_parts=32)
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == canonicalize_json(value)
+    assert written == sum(len(chunk) for chunk in chunks)
+
+
+@pytest.mark.parametrize(
+    ("body", "canonical"),
+    [
+        (b'{"a":1e16}', b'{"a":1e+16}'),
+        (b'{"a":1e-7}', b'{"a":1e-07}'),
+        (b'{"a":1.5e300}', b'{"a":1.5e+300}'),
+        (b'{"a":0.00001}', b'{"a":1e-05}'),
+    ],
+)
+def test_is_canonical_rejects_non_canonical_float_spellings(body: bytes, canonical: bytes) -> None:
+    value = json.loads(body)
+
+    assert canonicalize_json(value) == canonical
+    assert not is_canonical(body, value)
+    assert is_canonical(canonical, value)
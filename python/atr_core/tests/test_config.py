@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 
-from atr_core.config import load_config
+import pytest
+
+from atr_core.config import load_config, shard_config
 
 
 def test_load_config_works_outside_repo_root(monkeypatch) -> None:
@@ -41,3 +44,69 @@ atr:
 
     assert Path(config.envelope.schema_path) == schema_path
     assert Path(config.immune.ruleset_path) == ruleset_path
+
+
+_MINIMAL_CONFIG = """
+atr:
+  transport_grpc:
+    target: "unix:///tmp/atb_et.sock"
+    timeout_ms: 2000
+  envelope:
+    schema_path: "schema.json"
+    max_payload_bytes: 4096
+  immune:
+    ruleset_path: "ruleset.json"
+    quarantine_subject: "aether.audit.violation"
+"""
+
+
+def test_background_quarantine_requires_a_spill_path(tmp_path) -> None:
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(_MINIMAL_CONFIG + "    quarantine_queue_size: 100\n")
+
+    with pytest.raises(ValueError, match="quarantine_spill_path"):
+        load_config(str(config_file))
+
+    config_file.write_text(_MINIMAL_CONFIG + '    quarantine_queue_size: 100\n    quarantine_spill_path: "q.spill"\n')
+    assert load_config(str(config_file)).immune.quarantine_queue_size == 100
+    assert load_config().immune.quarantine_queue_size == 0
+
+
+def test_profile_file_selects_profile_over_default_config() -> None:
+    config = load_config("configs/tachyon.yaml")
+
+    assert config.profile == "tachyon"
+    assert config.immune == load_config().immune
+    assert load_config().profile == "containerized"
+
+
+def test_shard_config_gives_each_worker_its_own_state_files() -> None:
+    config = load_config()
+    config = replace(
+        config,
+        dedup=replace(config.dedup, path="data/dedup.journal"),
+        ledger=replace(config.ledger, path="data/ledger"),
+    )
+
+    shard = shard_config(config, 3, shard_count=4)
+
+    assert (shard.dedup.path, shard.dedup.shared) == ("data/dedup.journal", True)
+    assert shard.ledger.path == "data/ledger.shard3"
+    assert shard.ledger.peers == ("data/ledger.shard0", "data/ledger.shard1", "data/ledger.shard2")
+    assert shard.state.snapshot_path == config.state.snapshot_path == ""
+    assert shard.state.subscribe_durable == f"{config.state.subscribe_durable}-shard3"
+    assert shard.envelope == config.envelope
+
+
+def test_shard_config_shares_a_run_scoped_dedup_journal_between_workers() -> None:
+    config = load_config()
+
+    workers = [shard_config(config, shard, 2, "/run/atr-ingress-x/dedup.journal") for shard in range(2)]
+    single = shard_config(config, 0)
+
+    assert workers[0].dedup.path == workers[1].dedup.path == "/run/atr-ingress-x/dedup.journal"
+    assert all(worker.dedup.shared for worker in workers)
+    assert (single.dedup.path, single.dedup.shared) == ("", False)
+    with pytest.raises(ValueError, match="dedup.path"):
+        shard_config(config, 0, shard_count=2)
+    assert workers[0].ledger.peers == ()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from atr_core.core.dedup import IngressDedupStore, uuid7_timestamp_ms
+
+
+def _uuid7(timestamp_ms: int, suffix: int = 0) -> str:
+    stamp = f"{timestamp_ms:012x}"
+    return f"{stamp[:8]}-{stamp[8:]}-7000-8000-{suffix:012x}"
+
+
+def test_uuid7_timestamp_roundtrip() -> None:
+    assert uuid7_timestamp_ms(_uuid7(1_700_000_000_123)) == 1_700_000_000_123
+    assert uuid7_timestamp_ms("not-a-uuid") is None
+    assert uuid7_timestamp_ms(42) is None
+
+
+def test_dedup_returns_original_sequence_for_same_id_and_signature() -> None:
+    store = IngressDedupStore(window_s=60, bucket_s=1)
+    event_id = _uuid7(time.time_ns() // 1_000_000)
+
+    assert store.lookup(event_id, "sig") is None
+    store.record(event_id, "sig", 41)
+
+    assert store.lookup(event_id, "sig") == 41
+    assert store.lookup(event_id, "other-sig") is None
+    assert store.stats().hits == 1
+
+
+def test_dedup_expires_whole_buckets_outside_window(monkeypatch) -> None:
+    now = [1_700_000_000_000]
+    store = IngressDedupStore(window_s=10, bucket_s=1)
+    monkeypatch.setattr(store, "_now_ms", lambda: now[0])
+    event_id = _uuid7(now[0])
+    store.record(event_id, "sig", 7)
+    store.record(_uuid7(now[0] - 60_000), "sig", 8)  # already outside the window
+
+    assert len(store) == 1
+    now[0] += 5_000
+    assert store.lookup(event_id, "sig") == 7
+    now[0] += 6_000
+    assert store.lookup(event_id, "sig") is None
+    assert len(store) == 0
+
+
+def test_dedup_bounds_entries_per_bucket(monkeypatch) -> None:
+    now = 1_700_000_000_000
+    store = IngressDedupStore(window_s=1, bucket_s=1, max_entries=4)
+    monkeypatch.setattr(store, "_now_ms", lambda: now)
+    for suffix in range(10):
+        store.record(_uuid7(now, suffix), "sig", suffix)
+
+    assert len(store) == 2
+    assert store.lookup(_uuid7(now, 9), "sig") == 9
+    assert store.lookup(_uuid7(now, 0), "sig") is None
+
+
+def test_dedup_journal_survives_restart(tmp_path: Path) -> None:
+    path = tmp_path / "dedup.journal"
+    event_id = _uuid7(time.time_ns() // 1_000_000)
+    store = IngressDedupStore(window_s=60, bucket_s=1, max_entries=1024, path=str(path))
+    store.record(event_id, "sig", 99)
+    store.close()
+
+    reopened = IngressDedupStore(window_s=60, bucket_s=1, max_entries=1024, path=str(path))
+    try:
+        assert reopened.lookup(event_id, "sig") == 99
+    finally:
+        reopened.close()
+
+
+def test_shared_journal_dedups_across_stores(tmp_path: Path) -> None:
+    path = str(tmp_path / "dedup.journal")
+    now_ms = time.time_ns() // 1_000_000
+    first = IngressDedupStore(window_s=60, bucket_s=1, max_entries=1024, path=path, shared=True)
+    second = IngressDedupStore(window_s=60, bucket_s=1, max_entries=1024, path=path, shared=True)
+    try:
+        first.record(_uuid7(now_ms, 1), "sig", 11)
+        assert second.lookup(_uuid7(now_ms, 1), "sig") == 11
+
+        second.record(_uuid7(now_ms, 2), "sig", 12)
+        first.record(_uuid7(now_ms, 3), "sig", 13)
+        assert first.lookup(_uuid7(now_ms, 2), "sig") == 12
+        assert second.lookup(_uuid7(now_ms, 3), "sig") == 13
+    finally:
+        first.close()
+        second.close()
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+from concurrent.futures import ThreadPoolExecutor
 import json
 
 from nacl.signing import SigningKey
 
 from atr_core.core.canonicalization import canonical_input, canonicalize_json
+from atr_core.core import security
 from atr_core.core.immune import ImmunePipeline
-from atr_core.core.security import canonical_hash, verify_signature
+from atr_core.core.security import (
+    VerifiedSignatureCache,
+    canonical_digest,
+    canonical_hash,
+    verify_signature,
+    verify_signatures_batch,
+)
 
 
 def _b64u(data: bytes) -> str:
@@ -89,3 +98,172 @@ def test_canonicalization_rejects_duplicate_keys_after_nfc_normalization() -> No
     assert not result.accepted
     assert "CANON_DUPLICATE_KEY_AFTER_NORMALIZATION" in result.reason
     assert "CANON_DUPLICATE_KEY_AFTER_NORMALIZE" in result.reason
+
+
+def test_evaluate_many_matches_evaluate_in_input_order() -> None:
+    pipeline = ImmunePipeline("specs/envelope_schema.json", "configs/inspirafirma_ruleset.json")
+    sk = SigningKey.generate()
+    good = _envelope(sk)
+    bad_signature = _envelope(sk)
+    bad_signature["signature"] = _b64u(b"0" * 64)
+    bad_schema = _envelope(sk)
+    bad_schema["header"].pop("type")
+    other_agent = _envelope(SigningKey.generate())
+
+    batch = [good, bad_signature, bad_schema, other_agent]
+    results = pipeline.evaluate_many(batch)
+
+    assert results == [pipeline.evaluate(env) for env in batch]
+    assert [result.accepted for result in results] == [True, False, False, True]
+
+
+def test_signature_cache_skips_crypto_for_retried_envelopes() -> None:
+    pipeline = ImmunePipeline("specs/envelope_schema.json", "configs/inspirafirma_ruleset.json")
+    sk = SigningKey.generate()
+    env = _envelope(sk)
+
+    assert pipeline.evaluate(env).accepted
+    assert pipeline.evaluate(env).accepted
+    stats = pipeline.signature_cache.stats()
+    assert (stats.verified_hits, stats.verified_misses, stats.verified_entries) == (1, 1, 1)
+
+    forged = _envelope(sk)
+    forged["signature"] = _b64u(b"0" * 64)
+    assert not pipeline.evaluate(forged).accepted
+    assert not pipeline.evaluate(forged).accepted
+    assert pipeline.signature_cache.stats().verified_entries == 1
+
+
+def test_verified_signature_cache_is_bounded_and_expires() -> None:
+    cache = VerifiedSignatureCache(max_entries=2, ttl_s=60.0)
+    for i in range(3):
+        cache.add("agent", bytes([i]), "sig")
+
+    assert len(cache) == 2
+    assert not cache.contains("agent", bytes([0]), "sig")
+    assert cache.contains("agent", bytes([2]), "sig")
+
+    expired = VerifiedSignatureCache(ttl_s=0.0)
+    expired.add("agent", b"d", "sig")
+    assert not expired.contains("agent", b"d", "sig")
+    assert expired.stats().verified_evictions == 1
+
+
+class CountingMetric:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+def test_signature_cache_exports_hit_miss_and_eviction_metrics(monkeypatch) -> None:
+    metrics = {name: CountingMetric() for name in ("lookups", "misses", "ttl", "capacity", "entries")}
+    monkeypatch.setattr(security, "_VERIFIED_LOOKUPS", metrics["lookups"])
+    monkeypatch.setattr(security, "_VERIFIED_MISSES", metrics["misses"])
+    monkeypatch.setattr(security, "_TTL_EVICTIONS", metrics["ttl"])
+    monkeypatch.setattr(security, "_CAPACITY_EVICTIONS", metrics["capacity"])
+    monkeypatch.setattr(security, "GOV_SIG_CACHE_ENTRIES", metrics["entries"])
+
+    cache = VerifiedSignatureCache(max_entries=1, ttl_s=60.0)
+    cache.add("agent", b"a", "sig")
+    cache.add("agent", b"b", "sig")
+    assert cache.contains("agent", b"b", "sig")
+    assert not cache.contains("agent", b"a", "sig")
+    expired = VerifiedSignatureCache(ttl_s=0.0)
+    expired.add("agent", b"c", "sig")
+    assert not expired.contains("agent", b"c", "sig")
+
+    assert {name: metric.value for name, metric in metrics.items()} == {
+        "lookups": 3,
+        "misses": 2,
+        "ttl": 1,
+        "capacity": 1,
+        "entries": 0,
+    }
+
+
+def _signature_check(env: dict) -> tuple[str, bytes, str]:
+    digest = canonical_hash(canonicalize_json(canonical_input(env)))
+    return env["header"]["source_agent"], digest, env["signature"]
+
+
+def test_verify_signatures_batch_preserves_order_across_chunks() -> None:
+    keys = [SigningKey.generate() for _ in range(3)]
+    checks = [_signature_check(_envelope(keys[i % 3])) for i in range(10)]
+    checks[4] = (checks[4][0], checks[4][1], _b64u(b"0" * 64))
+    expected = [i != 4 for i in range(10)]
+
+    assert verify_signatures_batch(checks) == expected
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert verify_signatures_batch(checks, executor, chunk_size=3) == expected
+
+
+def test_evaluate_many_verifies_through_process_pool() -> None:
+    pipeline = ImmunePipeline(
+        "specs/envelope_schema.json",
+        "configs/inspirafirma_ruleset.json",
+        verify_workers=2,
+    )
+    sk = SigningKey.generate()
+    batch = [_envelope(sk) for _ in range(80)]
+    batch[7]["signature"] = _b64u(b"0" * 64)
+    try:
+        results = pipeline.evaluate_many(batch)
+    finally:
+        pipeline.close()
+
+    assert [result.accepted for result in results] == [i != 7 for i in range(80)]
+
+
+def test_evaluate_many_async_awaits_process_pool_chunks() -> None:
+    pipeline = ImmunePipeline(
+        "specs/envelope_schema.json",
+        "configs/inspirafirma_ruleset.json",
+        verify_workers=2,
+    )
+    sk = SigningKey.generate()
+    batch = [_envelope(sk) for _ in range(80)]
+    batch[3]["signature"] = _b64u(b"0" * 64)
+    batch[5]["header"].pop("type")
+    try:
+        results = asyncio.run(pipeline.evaluate_many_async(batch))
+        cached = asyncio.run(pipeline.evaluate_many_async(batch))
+    finally:
+        pipeline.close()
+
+    assert [result.accepted for result in results] == [i not in (3, 5) for i in range(80)]
+    assert cached == results
+    assert pipeline.signature_cache.stats().verified_hits == 78
+
+
+def test_canonical_digest_streams_same_hash_with_and_without_bytes() -> None:
+    value = {"payload": {f"k{i}": [i, i / 7, "é" * i] for i in range(400)}, "header": {"id": "x"}}
+    expected = canonicalize_json(value)
+
+    retained = canonical_digest(value)
+    streamed = canonical_digest(value, retain_bytes=False)
+
+    assert retained.canonical_bytes == expected
+    assert streamed.canonical_bytes is None
+    assert retained.digest == streamed.digest == canonical_hash(expected)
+    assert retained.size == streamed.size == len(expected)
+
+
+def test_pre_canonicalized_bytes_are_verified_and_kept() -> None:
+    pipeline = ImmunePipeline("specs/envelope_schema.json", "configs/inspirafirma_ruleset.json")
+    env = _envelope(SigningKey.generate())
+    canonical = canonicalize_json(canonical_input(env))
+    spaced = json.dumps(canonical_input(env)).encode()
+
+    accepted = pipeline.evaluate(env, canonical)
+    rejected = pipeline.evaluate(env, spaced)
+    pipeline.close()
+
+    assert accepted.accepted
+    assert accepted.canonical_envelope is canonical
+    assert not rejected.accepted
+    assert rejected.reason == "canonicalization failed: CANON_NOT_CANONICAL"
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from atr_core.store.ledger import INDEX_SUFFIX, SEGMENT_SUFFIX, LedgerStore, LedgerWriteError
+
+
+def _event_id(n: int) -> str:
+    return f"018f9e53-6908-7b5f-bf2c-{n:012x}"
+
+
+def _body(n: int) -> bytes:
+    return b'{"header":{"n":%d},"payload":{"pad":"%s"}}' % (n, b"x" * 64)
+
+
+def test_ledger_reads_from_active_and_rolled_segments(tmp_path: Path) -> None:
+    ledger = LedgerStore(str(tmp_path), max_segment_bytes=1024)
+    for n in range(40):
+        ledger.append(_event_id(n), n + 1, _body(n))
+
+    assert ledger.segment_count > 2
+    assert len(list(tmp_path.glob(f"*{INDEX_SUFFIX}"))) == ledger.segment_count - 1
+    for n in (0, 17, 39):
+        entry = ledger.get(_event_id(n))
+        assert entry is not None
+        assert (entry.event_id, entry.stream_sequence, entry.canonical_envelope) == (_event_id(n), n + 1, _body(n))
+    assert ledger.get(_event_id(1000)) is None
+    assert ledger.get("not-a-uuid") is None
+    ledger.close()
+
+
+def test_ledger_rebuilds_indexes_and_truncates_torn_tail_on_startup(tmp_path: Path) -> None:
+    ledger = LedgerStore(str(tmp_path), max_segment_bytes=1024)
+    for n in range(30):
+        ledger.append(_event_id(n), n + 1, _body(n))
+    ledger.close()
+
+    for index_path in tmp_path.glob(f"*{INDEX_SUFFIX}"):
+        index_path.unlink()
+    active = sorted(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))[-1]
+    intact_size = active.stat().st_size
+    with open(active, "ab") as handle:
+        handle.write(b"\x10\x00\x00\x00partial")
+
+    reopened = LedgerStore(str(tmp_path), max_segment_bytes=1024)
+    assert active.stat().st_size == intact_size
+    assert reopened.get(_event_id(3)).stream_sequence == 4  # type: ignore[union-attr]
+    reopened.append(_event_id(30), 31, _body(30))
+    assert reopened.get(_event_id(29)).stream_sequence == 30  # type: ignore[union-attr]
+    assert reopened.get(_event_id(30)).canonical_envelope == _body(30)  # type: ignore[union-attr]
+    reopened.close()
+
+
+def test_enqueued_appends_are_readable_before_and_after_the_writer_runs(tmp_path: Path) -> None:
+    ledger = LedgerStore(str(tmp_path), max_segment_bytes=1024)
+    for n in range(40):
+        ledger.enqueue(_event_id(n), n + 1, _body(n))
+        assert ledger.get(_event_id(n)).stream_sequence == n + 1  # type: ignore[union-attr]
+    ledger.flush()
+
+    assert ledger.segment_count > 2
+    assert ledger.get(_event_id(7)).canonical_envelope == _body(7)  # type: ignore[union-attr]
+    ledger.enqueue(_event_id(40), 41, _body(40))
+    ledger.close()
+
+    reopened = LedgerStore(str(tmp_path), max_segment_bytes=1024)
+    assert [reopened.get(_event_id(n)).stream_sequence for n in (0, 39, 40)] == [1, 40, 41]  # type: ignore[union-attr]
+    reopened.close()
+
+
+def test_ledger_reads_entries_written_by_peer_ledgers(tmp_path: Path) -> None:
+    own_path, peer_path = tmp_path / "ledger.shard0", tmp_path / "ledger.shard1"
+    peer = LedgerStore(str(peer_path), max_segment_bytes=1024)
+    ledger = LedgerStore(str(own_path), peers=[str(peer_path)])
+    try:
+        ledger.append(_event_id(0), 1, _body(0))
+        peer.append(_event_id(1), 2, _body(1))
+        assert ledger.get(_event_id(1)) is not None
+
+        for n in range(2, 40):  # rolls the peer's segments after the first lookup
+            peer.append(_event_id(n), n + 1, _body(n))
+
+        for n in (1, 17, 39):
+            entry = ledger.get(_event_id(n))
+            assert entry is not None
+            assert (entry.stream_sequence, entry.canonical_envelope) == (n + 1, _body(n))
+        assert ledger.get(_event_id(0)).stream_sequence == 1
+        assert ledger.get(_event_id(1000)) is None
+    finally:
+        ledger.close()
+        peer.close()
+
+
+def test_failed_write_marks_the_ledger_unhealthy_instead_of_hanging(tmp_path: Path, monkeypatch) -> None:
+    ledger = LedgerStore(str(tmp_path))
+
+    def fail(records: list) -> None:
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(ledger, "_write", fail)
+    ledger.enqueue(_event_id(1), 1, _body(1))
+
+    with pytest.raises(LedgerWriteError, match="No space left"):
+        ledger.flush()
+    with pytest.raises(LedgerWriteError):
+        ledger.enqueue(_event_id(2), 2, _body(2))
+    assert not ledger.healthy
+    assert ledger.get(_event_id(1)) is None
+    ledger.close()
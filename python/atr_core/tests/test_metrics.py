@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from atr_core.core.immune import ImmunePipeline
+from atr_core.metrics import StageSampler
+
+
+@dataclass
+class RecordingHistogram:
+    observed: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+    def labels(self, **labels: str) -> RecordingHistogram.Child:
+        return RecordingHistogram.Child(self, labels)
+
+    @dataclass
+    class Child:
+        parent: RecordingHistogram
+        labels: dict[str, str]
+
+        def observe(self, value: float) -> None:
+            self.parent.observed.append((self.labels, value))
+
+
+def test_stage_sampler_times_one_call_in_every_n() -> None:
+    histogram = RecordingHistogram()
+    sampler = StageSampler(histogram, 0.25, mode="single")
+
+    clocks = [sampler.start() for _ in range(8)]
+    for clock in clocks:
+        if clock is not None:
+            clock.mark("schema")
+            clock.stop()
+
+    assert sum(clock is not None for clock in clocks) == 2
+    assert [labels for labels, _ in histogram.observed] == [
+        {"phase": "schema", "mode": "single"},
+        {"phase": "total", "mode": "single"},
+    ] * 2
+    assert all(seconds >= 0 for _, seconds in histogram.observed)
+
+
+def test_stage_sampler_disabled_at_zero_rate() -> None:
+    sampler = StageSampler(RecordingHistogram(), 0.0)
+
+    assert all(sampler.start() is None for _ in range(100))
+
+
+def test_immune_pipeline_records_every_stage_when_fully_sampled(monkeypatch) -> None:
+    histogram = RecordingHistogram()
+    pipeline = ImmunePipeline("specs/envelope_schema.json", "configs/inspirafirma_ruleset.json")
+    monkeypatch.setattr(pipeline, "_single_stages", StageSampler(histogram, 1.0, mode="single"))
+
+    pipeline.evaluate(
+        {
+            "header": {
+                "id": "018f9e53-6908-7b5f-bf2c-3f4a56d3f900",
+                "timestamp": 1700000000000000000,
+                "source_agent": "00" * 32,
+                "type": "state.mutation",
+                "version": "2.0.0",
+            },
+            "payload": {"x": 1},
+            "signature": "A" * 86,
+        }
+    )
+    pipeline.close()
+
+    assert [labels["phase"] for labels, _ in histogram.observed] == [
+        "schema",
+        "canonicalize_hash",
+        "signature",
+        "ruleset",
+        "total",
+    ]
+
+
+def test_stage_metrics_are_scraped_from_the_metrics_endpoint() -> None:
+    pytest.importorskip("prometheus_client")
+    from fastapi.testclient import TestClient
+
+    from atr_core.api import app as app_module
+    from atr_core.metrics import GOV_EVAL_DURATION
+
+    GOV_EVAL_DURATION.labels(phase="schema", mode="single").observe(0.0002)
+
+    response = TestClient(app_module.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert 'atr_gov_eval_duration_seconds_count{mode="single",phase="schema"}' in response.text
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from atr_core.api.quarantine import QuarantineSink, _encode_spill
+
+
+@dataclass
+class Ack:
+    accepted: bool
+    error_message: str = ""
+
+
+class FlakyPublisher:
+    def __init__(self, available: bool = True, delay_s: float = 0.0) -> None:
+        self.available = available
+        self.delay_s = delay_s
+        self.published: list[tuple[bytes, str]] = []
+
+    async def __call__(self, canonical_envelope: bytes, correlation_id: str) -> Ack:
+        await asyncio.sleep(self.delay_s)
+        if not self.available:
+            raise ConnectionError("sidecar down")
+        self.published.append((canonical_envelope, correlation_id))
+        return Ack(True)
+
+
+async def _until(predicate, timeout_s: float = 2.0) -> None:  # noqa: ANN001
+    deadline = asyncio.get_running_loop().time() + timeout_s
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+def test_submit_returns_without_waiting_for_the_sidecar() -> None:
+    async def scenario() -> None:
+        publisher = FlakyPublisher(delay_s=0.05)
+        sink = QuarantineSink(publisher, batch_size=8)
+
+        assert all(sink.submit(f"e{index}".encode(), f"c{index}") for index in range(20))
+        assert publisher.published == []
+
+        await _until(lambda: len(publisher.published) == 20)
+        await sink.close()
+        assert publisher.published == [(f"e{index}".encode(), f"c{index}") for index in range(20)]
+        assert sink.stats().published == 20
+
+    asyncio.run(scenario())
+
+
+def test_spills_during_outage_and_replays_without_loss(tmp_path) -> None:
+    async def scenario() -> None:
+        publisher = FlakyPublisher(available=False)
+        sink = QuarantineSink(publisher, max_queue=4, spill_path=str(tmp_path / "q.spill"), retry_interval_s=0.02)
+
+        for index in range(10):
+            assert sink.submit(f"e{index}".encode(), f"c{index}")
+        await _until(lambda: sink.stats().spilled >= 10)
+        assert sink.stats().spill_bytes > 0
+
+        publisher.available = True
+        await _until(lambda: len(publisher.published) == 10)
+        await sink.close()
+        assert sorted(publisher.published) == sorted((f"e{index}".encode(), f"c{index}") for index in range(10))
+        assert (tmp_path / "q.spill").read_bytes() == b""
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_without_spill_file_falls_back_to_caller() -> None:
+    async def scenario() -> None:
+        sink = QuarantineSink(FlakyPublisher(available=False), max_queue=2, retry_interval_s=10.0)
+
+        assert sink.submit(b"a") and sink.submit(b"b")
+        assert not sink.submit(b"c")
+        await sink.close()
+
+    asyncio.run(scenario())
+
+
+def test_replays_spill_from_previous_run_and_discards_torn_tail(tmp_path) -> None:
+    spill = tmp_path / "q.spill"
+    spill.write_bytes(_encode_spill(b"kept", "c1") + _encode_spill(b"torn", "c2")[:-3])
+
+    async def scenario() -> None:
+        publisher = FlakyPublisher()
+        sink = QuarantineSink(publisher, spill_path=str(spill))
+        sink.start()
+
+        await _until(lambda: publisher.published == [(b"kept", "c1")])
+        await sink.close()
+        assert sink.stats().replayed == 1
+
+    asyncio.run(scenario())
+    assert spill.read_bytes() == b""
+
+
+def test_replay_progress_survives_a_restart_mid_spill(tmp_path) -> None:
+    spill = tmp_path / "q.spill"
+    spill.write_bytes(b"".join(_encode_spill(f"e{index}".encode(), f"c{index}") for index in range(5)))
+
+    class RejectsE3(FlakyPublisher):
+        async def __call__(self, canonical_envelope: bytes, correlation_id: str) -> Ack:
+            if canonical_envelope == b"e3":
+                raise ConnectionError("sidecar down")
+            return await super().__call__(canonical_envelope, correlation_id)
+
+    async def first_run() -> None:
+        publisher = RejectsE3()
+        sink = QuarantineSink(publisher, spill_path=str(spill), retry_interval_s=10.0)
+        sink.start()
+        await _until(lambda: sink.stats().replayed == 3)
+        await sink.close()
+        assert [envelope for envelope, _ in publisher.published][:3] == [b"e0", b"e1", b"e2"]
+
+    async def second_run() -> None:
+        publisher = FlakyPublisher()
+        sink = QuarantineSink(publisher, spill_path=str(spill))
+        sink.start()
+        await _until(lambda: sink.stats().replayed == 2)
+        await sink.close()
+        assert publisher.published == [(b"e3", "c3"), (b"e4", "c4")]
+
+    asyncio.run(first_run())
+    asyncio.run(second_run())
+    assert spill.read_bytes() == b""
+
+
+def test_spill_file_is_capped_and_drops_are_counted(tmp_path) -> None:
+    record_size = len(_encode_spill(b"e0", "c0"))
+
+    async def scenario() -> None:
+        sink = QuarantineSink(
+            FlakyPublisher(available=False),
+            max_queue=1,
+            spill_path=str(tmp_path / "q.spill"),
+            retry_interval_s=10.0,
+            max_spill_bytes=3 * record_size,
+        )
+        assert sink.submit(b"e0", "c0")
+        await _until(lambda: sink.stats().spilled == 1)
+        assert all(sink.submit(f"e{index}".encode(), f"c{index}") for index in (1, 2, 3))
+        assert not sink.submit(b"e4", "c4")  # queue and spill full: the caller publishes inline
+
+        await sink.close()  # e1 is still queued, fails to publish and no longer fits
+        assert (sink.stats().spilled, sink.stats().dropped) == (3, 1)
+
+    asyncio.run(scenario())
+    assert (tmp_path / "q.spill").stat().st_size == 3 * record_size
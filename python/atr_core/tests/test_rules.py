@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from atr_core.core.rules import ReloadableRuleset, Ruleset, RulesetError, compile_ruleset
+
+
+def _envelope(event_type: str, level: str | None = None) -> dict:
+    meta = {"security_level": level} if level is not None else {}
+    return {"header": {"type": event_type}, "meta": meta}
+
+
+def test_compiled_ruleset_matches_exact_rules() -> None:
+    rules = compile_ruleset(
+        {
+            "blocked_types": ["forbidden.event"],
+            "required_security_level_for_types": {"state.mutation": "confidential"},
+        }
+    )
+
+    assert rules.validate(_envelope("forbidden.event")) == (False, "blocked event type")
+    assert rules.validate(_envelope("state.mutation", "public")) == (False, "security level mismatch")
+    assert rules.validate(_envelope("state.mutation", "confidential")) == (True, "")
+    assert rules.validate(_envelope("intent.created")) == (True, "")
+
+
+def test_compiled_ruleset_wildcards_prefer_most_specific_level() -> None:
+    rules = compile_ruleset(
+        {
+            "blocked_types": ["legacy.>", "*.debug"],
+            "required_security_level_for_types": {
+                "state.>": "confidential",
+                "state.*.keys": "secret",
+                "state.vault.keys": "public",
+                "*.vault.keys": "confidential",
+            },
+        }
+    )
+
+    assert rules.decide("legacy.v1.event").blocked
+    assert not rules.decide("legacy").blocked
+    assert rules.decide("agent.debug").blocked
+    assert not rules.decide("agent.debug.extra").blocked
+    assert rules.decide("state.mutation").required_security_level == "confidential"
+    assert rules.decide("state.wallet.keys").required_security_level == "secret"
+    assert rules.decide("state.vault.keys").required_security_level == "public"
+    assert rules.decide("other.vault.keys").required_security_level == "confidential"
+    assert rules.decide("state").required_security_level is None
+
+
+def test_exact_entries_inherit_wildcard_blocks() -> None:
+    rules = compile_ruleset(
+        {"blocked_types": ["legacy.>"], "required_security_level_for_types": {"legacy.audit": "secret"}}
+    )
+
+    assert rules.decide("legacy.audit").blocked
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [],
+        {"blocked_types": "forbidden.event"},
+        {"blocked_types": ["a.>.b"]},
+        {"blocked_types": ["*..b"]},
+        {"required_security_level_for_types": {"a.b*": "secret"}},
+        {"required_security_level_for_types": {"a.b": 1}},
+    ],
+)
+def test_compile_ruleset_rejects_malformed_rules(raw: object) -> None:
+    with pytest.raises(RulesetError):
+        compile_ruleset(raw)
+
+
+def test_ruleset_lookup_with_thousands_of_types(tmp_path: Path) -> None:
+    path = tmp_path / "ruleset.json"
+    path.write_text(json.dumps({"blocked_types": [f"generated.t{i}" for i in range(5000)]}))
+
+    ruleset = Ruleset(str(path))
+
+    assert ruleset.validate(_envelope("generated.t4999")) == (False, "blocked event type")
+    assert ruleset.validate(_envelope("generated.t5000")) == (True, "")
+
+
+def test_reloadable_ruleset_swaps_versions_and_keeps_last_good(tmp_path: Path) -> None:
+    path = tmp_path / "ruleset.json"
+    path.write_text(json.dumps({"blocked_types": ["forbidden.event"]}))
+    ruleset = ReloadableRuleset(str(path))
+    before = ruleset.snapshot
+
+    assert ruleset.version == 1
+    assert not ruleset.reload()  # unchanged content is not a new version
+
+    path.write_text(json.dumps({"blocked_types": ["intent.created"]}))
+    assert ruleset.reload()
+    assert ruleset.version == 2
+    assert ruleset.validate(_envelope("intent.created")) == (False, "blocked event type")
+    assert before.rules.validate(_envelope("intent.created")) == (True, "")
+
+    path.write_text("{not json")
+    assert not ruleset.reload()
+    path.write_text(json.dumps({"blocked_types": ["a.>.b"]}))
+    assert not ruleset.reload()
+    assert ruleset.version == 2
+    assert ruleset.validate(_envelope("intent.created")) == (False, "blocked event type")
+
+
+def test_reloadable_ruleset_watcher_picks_up_changes(tmp_path: Path) -> None:
+    path = tmp_path / "ruleset.json"
+    path.write_text(json.dumps({"blocked_types": []}))
+    ruleset = ReloadableRuleset(str(path), poll_interval_s=0.01)
+    try:
+        path.write_text(json.dumps({"blocked_types": ["forbidden.event", "forbidden.other"]}))
+        deadline = time.monotonic() + 5.0
+        while ruleset.version == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        ruleset.close()
+
+    assert ruleset.version == 2
+    assert ruleset.validate(_envelope("forbidden.other")) == (False, "blocked event type")
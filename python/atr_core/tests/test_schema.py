@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from jsonschema import Draft202012Validator
+
+from atr_core.core.schema import CompiledSchemaValidator, UnsupportedSchemaError
+
+
+def _schema() -> dict[str, Any]:
+    return json.loads(Path("specs/envelope_schema.json").read_text())
+
+
+def _valid() -> dict[str, Any]:
+    return {
+        "header": {
+            "id": "018f9e53-6908-7b5f-bf2c-3f4a56d3f900",
+            "timestamp": 1700000000000000000,
+            "source_agent": "agent.alpha:01",
+            "type": "state.mutation",
+            "version": "2.0.0",
+        },
+        "meta": {"security_level": "confidential", "correlation_id": "c1", "context_refs": ["a", "b"]},
+        "payload": {"x": 1},
+        "signature": "A" * 86,
+    }
+
+
+def _mutations() -> list[dict[str, Any]]:
+    edits = [
+        ("header", "id", "018F9E53-6908-7B5F-BF2C-3F4A56D3F900"),
+        ("header", "id", "018f9e53-6908-4b5f-bf2c-3f4a56d3f900"),
+        ("header", "timestamp", -1),
+        ("header", "timestamp", True),
+        ("header", "timestamp", 1.0),
+        ("header", "timestamp", 1.5),
+        ("header", "source_agent", "short"),
+        ("header", "source_agent", "bad agent!"),
+        ("header", "type", "State.mutation"),
+        ("header", "type", "state"),
+        ("header", "type", "state.mutation\n"),
+        ("header", "version", "2.0.1"),
+        ("header", "extra", 1),
+        ("meta", "security_level", "top-secret"),
+        ("meta", "correlation_id", ""),
+        ("meta", "causal_hash", "ab" * 32),
+        ("meta", "causal_hash", "AB" * 32),
+        ("meta", "context_refs", ["a", "a"]),
+        ("meta", "context_refs", [1]),
+        ("meta", "context_refs", ["x"] * 33),
+        ("meta", "unknown", "x"),
+    ]
+    cases: list[dict[str, Any]] = []
+    for section, field, value in edits:
+        envelope = _valid()
+        envelope[section][field] = value
+        cases.append(envelope)
+    for field in ("header", "payload", "signature"):
+        envelope = _valid()
+        del envelope[field]
+        cases.append(envelope)
+    for field, value in (("payload", {}), ("signature", "A" * 85), ("signature", "A" * 86 + "!"), ("extra", 1)):
+        envelope = _valid()
+        envelope[field] = value
+        cases.append(envelope)
+    envelope = _valid()
+    del envelope["meta"]
+    cases.append(envelope)
+    cases.extend([[], "envelope", None])
+    return cases
+
+
+def test_compiled_validator_agrees_with_jsonschema() -> None:
+    schema = _schema()
+    compiled = CompiledSchemaValidator(schema)
+    reference = Draft202012Validator(schema)
+
+    assert compiled(_valid())
+    for instance in _mutations():
+        expected = reference.is_valid(instance)
+        assert compiled(copy.deepcopy(instance)) == expected, instance
+
+
+def test_compiled_validator_rejects_unsupported_keywords() -> None:
+    with pytest.raises(UnsupportedSchemaError):
+        CompiledSchemaValidator({"type": "object", "patternProperties": {"^x": {"type": "string"}}})
+    with pytest.raises(UnsupportedSchemaError):
+        CompiledSchemaValidator({"$ref": "https://example.com/other.json"})
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from atr_core.store.state import StateStore, canonical_snapshot_hash
+
+
+def _event(op: str, key: str, value: object = None) -> dict:
+    return {"payload": {"op": op, "key": key, "value": value}}
+
+
+def test_state_store_applies_ops_idempotently_by_stream_sequence() -> None:
+    store = StateStore()
+
+    assert store.apply(_event("set", "a", {"v": 1}), 1)
+    assert store.apply(_event("incr", "n", 5), 2)
+    assert store.apply(_event("incr", "n", 2), 3)
+    assert not store.apply(_event("incr", "n", 100), 3)  # redelivery
+    assert store.apply(_event("delete", "a"), 4)
+
+    assert store.lookup("n") == (True, 7)
+    assert store.lookup("a") == (False, None)
+    assert store.stream_sequence == 4
+
+
+@pytest.mark.parametrize(
+    "poison",
+    [
+        b"not json",
+        b'{"payload":{"op":"incr","key":"n","value":"abc"}}',
+        b'{"payload":{"op":"set","key":["unhashable"],"value":1}}',
+        b'{"payload":"not-an-object"}',
+    ],
+)
+def test_state_store_skips_poison_frame_and_applies_the_next(poison: bytes) -> None:
+    store = StateStore()
+
+    assert not store.apply_frame(poison, 1)
+    assert store.apply_frame(b'{"payload":{"op":"incr","key":"n","value":3}}', 2)
+
+    assert store.lookup("n") == (True, 3)
+    assert store.stream_sequence == 2
+
+
+@pytest.mark.parametrize("key", [None, 7])
+def test_state_store_skips_non_string_keys_and_keeps_snapshotting(tmp_path: Path, key: object) -> None:
+    path = tmp_path / "state.json"
+    store = StateStore(str(path), update_every_events=1, update_every_seconds=0)
+
+    assert not store.apply({"payload": {"op": "set", "key": key, "value": 2}}, 1)
+    assert not store.apply({"payload": {"op": "incr", "value": 2}}, 2)
+    assert store.apply(_event("set", "a", 1), 3)
+    store.flush()
+
+    assert store.snapshot().state == {"a": 1}
+    assert json.loads(path.read_text())["stream_sequence"] == 3
+    store.close()
+
+
+def test_state_store_snapshots_every_n_events_and_restores(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    store = StateStore(str(path), update_every_events=2, update_every_seconds=0)
+    store.apply(_event("set", "a", 1), 10)
+    assert not path.exists()
+    store.apply(_event("set", "b", 2), 11)
+    store.apply(_event("set", "c", 3), 12)
+    store.flush()
+
+    document = json.loads(path.read_text())
+    assert document["stream_sequence"] == 12
+    assert document["snapshot_hash"] == canonical_snapshot_hash({"a": 1, "b": 2, "c": 3})
+
+    restored = StateStore(str(path))
+    assert restored.lookup("c") == (True, 3)
+    assert not restored.apply(_event("set", "c", 99), 12)
+    store.close()
+
+
+def test_state_store_rejects_tampered_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"stream_sequence": 1, "snapshot_hash": "0" * 64, "state": {"a": 1}}))
+
+    with pytest.raises(ValueError):
+        StateStore(str(path))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+
+from atr_core.api.supervisor import Supervisor, WorkerSpec, WorkerStartError, physical_cores
+
+
+def _logging_worker(log: Path, fail_after: int | None = None):  # noqa: ANN202
+    def run(spec: WorkerSpec) -> None:
+        def record(event: str) -> None:
+            with log.open("a") as out:
+                out.write(f"{event} {spec.shard} {os.getpid()}\n")
+
+        if fail_after is not None and len(log.read_text().splitlines()) >= fail_after:
+            raise RuntimeError("boom")
+        signal.signal(signal.SIGTERM, lambda *_: (record("stop"), os._exit(0)))
+        record("start")
+        spec.ready()
+        while True:
+            time.sleep(0.05)
+
+    return run
+
+
+def _events(log: Path) -> list[tuple[str, int, int]]:
+    return [(event, int(shard), int(pid)) for event, shard, pid in (line.split() for line in log.read_text().splitlines())]
+
+
+def test_rolling_restart_replaces_one_shard_at_a_time(tmp_path: Path) -> None:
+    log = tmp_path / "events.log"
+    log.touch()
+    supervisor = Supervisor(_logging_worker(log), workers=2, graceful_timeout_s=5)
+    supervisor.start()
+    try:
+        old = supervisor.pids
+        supervisor.rolling_restart()
+        new = supervisor.pids
+    finally:
+        supervisor.stop()
+
+    assert set(old) == set(new) == {0, 1} and not set(old.values()) & set(new.values())
+    assert _events(log)[:6] == [
+        ("start", 0, old[0]),
+        ("start", 1, old[1]),
+        ("start", 0, new[0]),
+        ("stop", 0, old[0]),
+        ("start", 1, new[1]),
+        ("stop", 1, old[1]),
+    ]
+    assert sorted(_events(log)[6:]) == [("stop", 0, new[0]), ("stop", 1, new[1])]
+
+
+def test_failed_replacement_keeps_the_running_worker(tmp_path: Path) -> None:
+    log = tmp_path / "events.log"
+    log.touch()
+    supervisor = Supervisor(_logging_worker(log, fail_after=1), workers=1, graceful_timeout_s=5)
+    supervisor.start()
+    try:
+        old = supervisor.pids
+        supervisor.rolling_restart()
+        assert supervisor.pids == old
+        os.kill(old[0], 0)  # still running
+    finally:
+        supervisor.stop()
+
+
+def test_start_fails_when_a_worker_dies_before_ready(tmp_path: Path) -> None:
+    log = tmp_path / "events.log"
+    log.touch()
+    supervisor = Supervisor(_logging_worker(log, fail_after=0), workers=1)
+
+    with pytest.raises(WorkerStartError, match="exited before it was ready"):
+        supervisor.start()
+    assert supervisor.pids == {}
+
+
+def test_physical_cores_drops_smt_siblings(tmp_path: Path) -> None:
+    for cpu, core in enumerate([0, 1, 0, 1]):
+        topology = tmp_path / f"cpu{cpu}" / "topology"
+        topology.mkdir(parents=True)
+        (topology / "physical_package_id").write_text("0\n")
+        (topology / "core_id").write_text(f"{core}\n")
+
+    assert physical_cores([3, 2, 1, 0], sysfs=tmp_path) == [0, 1]
+    assert physical_cores([0, 5], sysfs=tmp_path) == [0, 5]
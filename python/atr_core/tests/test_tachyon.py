@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import types
+
+import pytest
+
+from atr_core.transport import tachyon
+
+
+def test_submit_packets_passes_one_contiguous_buffer(monkeypatch) -> None:
+    calls: list[bytes] = []
+
+    def fake_submit_packets(view: memoryview) -> int:
+        calls.append(view.tobytes())
+        return view.nbytes // tachyon.PACKET_SIZE
+
+    monkeypatch.setattr(tachyon, "_submit_packets", fake_submit_packets)
+    buffer = tachyon.pack_packets(
+        [
+            (1, 2, 10, 11, b"abcdefghijklmnopqrstuvwxyz", 0x1),
+            (3, 4, 12, 13, b"short", 0x2),
+        ]
+    )
+
+    assert tachyon.submit_packets(buffer) == tachyon.PacketSubmitResult(True, 2)
+    assert len(calls) == 1 and len(calls[0]) == 2 * tachyon.PACKET_SIZE
+    first = tachyon.PACKET_LAYOUT.unpack_from(calls[0], 0)
+    second = tachyon.PACKET_LAYOUT.unpack_from(calls[0], tachyon.PACKET_SIZE)
+    assert first == (2, 1, 10, 11, 26, 0x1, 0, b"abcdefghijklmnopqrst")
+    assert second == (4, 3, 12, 13, 5, 0x2, 0, b"short" + bytes(15))
+
+
+def test_submit_packets_rejects_partial_packets(monkeypatch) -> None:
+    monkeypatch.setattr(tachyon, "_submit_packets", lambda view: 0)
+
+    with pytest.raises(ValueError, match="not a multiple of 64"):
+        tachyon.submit_packets(bytes(tachyon.PACKET_SIZE + 1))
+
+
+def test_submit_packets_reports_missing_extension(monkeypatch) -> None:
+    monkeypatch.setattr(tachyon, "_submit_packets", None)
+
+    result = tachyon.submit_packets(tachyon.pack_packets([(0, 1, 0, 0, b"", 0)]))
+
+    assert not result.accepted
+    assert result.error == "tachyon_core extension not available"
+
+
+def test_split_event_id_matches_uuid_bits() -> None:
+    event_id = "018f9e53-6908-7b5f-bf2c-3f4a56d3f900"
+
+    hi, lo = tachyon.split_event_id(event_id)
+
+    assert (hi << 64) | lo == int(event_id.replace("-", ""), 16)
+    assert hi == 0x018F9E5369087B5F and lo == 0xBF2C3F4A56D3F900
+
+
+class FakeQueue:
+    """Stands in for the tachyon_core packet queue."""
+
+    def __init__(self, capacity: int = 16) -> None:
+        self.capacity = capacity
+        self.packets: list[tuple[bytes, bytes]] = []
+
+    def submit_packet(self, hi: int, lo: int, sequence: int, unix_ns: int, payload: bytes, flags: int) -> int:
+        if len(self.packets) >= self.capacity:
+            raise OverflowError("packet queue full")
+        image = tachyon.pack_packets([(hi, lo, sequence, unix_ns, payload, flags)])
+        self.packets.append((bytes(image), bytes(payload)))
+        return len(self.packets)
+
+    def drain_packets(self, max_packets: int) -> list[tuple[bytes, bytes]]:
+        drained, self.packets = self.packets[:max_packets], self.packets[max_packets:]
+        return drained
+
+    def install(self, monkeypatch) -> FakeQueue:
+        monkeypatch.setattr(tachyon, "_submit_packet", self.submit_packet)
+        monkeypatch.setattr(tachyon, "_drain_packets", self.drain_packets)
+        monkeypatch.setattr(tachyon, "_packet_queue_depth", lambda: len(self.packets))
+        return self
+
+
+_HEADER = {"id": "018f9e53-6908-7b5f-bf2c-3f4a56d3f900", "timestamp": 1700000000000000000}
+
+
+def test_egress_submits_header_fields_and_canonical_bytes_as_is(monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    def fake_submit_packet(*args) -> int:  # noqa: ANN002
+        calls.append(args)
+        return len(calls)
+
+    monkeypatch.setattr(tachyon, "_submit_packet", fake_submit_packet)
+    egress = tachyon.TachyonEgress(flags=0x8)
+    canonical = b'{"header":{},"meta":{},"payload":{}}'
+
+    first = egress.publish(_HEADER, canonical, "aether.stream.core.a")
+    second = egress.publish(_HEADER, canonical, "aether.stream.core.a")
+
+    assert first.accepted and second.accepted
+    assert first.stream_sequence < second.stream_sequence
+    assert calls[0] == (0x018F9E5369087B5F, 0xBF2C3F4A56D3F900, first.stream_sequence, 1700000000000000000, canonical, 0x8)
+    assert calls[0][4] is canonical
+
+
+def test_egress_reports_missing_extension(monkeypatch) -> None:
+    monkeypatch.setattr(tachyon, "_submit_packet", None)
+
+    ack = tachyon.TachyonEgress().publish(_HEADER, b"{}", "aether.stream.core.a")
+
+    assert not ack.accepted
+    assert ack.error_message == "tachyon_core extension not available"
+
+
+def test_full_queue_rejects_the_packet(monkeypatch) -> None:
+    FakeQueue(capacity=1).install(monkeypatch)
+    egress = tachyon.TachyonEgress()
+
+    assert egress.publish(_HEADER, b"{}", "aether.stream.core.a").accepted
+    ack = egress.publish(_HEADER, b"{}", "aether.stream.core.a")
+
+    assert (ack.accepted, ack.queue_depth, ack.error_message) == (False, 1, "packet queue full")
+    assert len(egress._routes) == 1
+
+
+def test_drain_packets_decodes_the_packet_image(monkeypatch) -> None:
+    queue = FakeQueue().install(monkeypatch)
+    queue.submit_packet(1, 2, 3, 4, b"payload", 0x5)
+
+    assert tachyon.drain_packets(8) == [tachyon.DrainedPacket(1, 2, 3, 4, 0x5, b"payload")]
+    assert tachyon.drain_packets(8) == []
+
+
+def test_sequence_clock_is_monotonic_and_carries_the_shard() -> None:
+    now = [tachyon.SEQUENCE_EPOCH_MS * 1_000_000 + 5_000_000]
+    clock = tachyon.SequenceClock(shard=3, clock=lambda: now[0])
+
+    first = clock.next()
+    second = clock.next()
+    now[0] -= 2_000_000  # wall clock stepped back
+    third = clock.next()
+
+    assert first == 5 << 22 | 3 << 12
+    assert first < second < third
+    assert {sequence >> 12 & 0x3FF for sequence in (first, second, third)} == {3}
+    assert tachyon.SequenceClock(shard=4, clock=lambda: now[0] + 2_000_000).next() != first
+
+
+def test_sequence_clock_moves_to_the_next_millisecond_when_the_counter_runs_out() -> None:
+    clock = tachyon.SequenceClock(clock=lambda: tachyon.SEQUENCE_EPOCH_MS * 1_000_000 + 1_000_000)
+
+    sequences = [clock.next() for _ in range(4097)]
+
+    assert sequences == sorted(set(sequences))
+    assert sequences[-1] == 2 << 22
+
+
+def test_forwarder_persists_queued_packets_and_retries_failed_ones(monkeypatch) -> None:
+    queue = FakeQueue().install(monkeypatch)
+    sent: list[list] = []
+
+    async def publish_batch(requests: list) -> list:
+        sent.append(list(requests))
+        if len(sent) == 1:
+            raise ConnectionError("sidecar down")
+        return [types.SimpleNamespace(accepted=request.subject != "aether.stream.core.b" or len(sent) > 2) for request in requests]
+
+    async def scenario() -> tachyon.TachyonEgress:
+        egress = tachyon.TachyonEgress(retry_interval_s=0.0)
+        egress.start(publish_batch)
+        egress.publish(_HEADER, b"a", "aether.stream.core.a", "c-1")
+        egress.publish(_HEADER, b"b", "aether.stream.core.b")
+        for _ in range(100):
+            if egress.forwarded == 2:
+                break
+            await asyncio.sleep(0)
+        await egress.close()
+        return egress
+
+    egress = asyncio.run(scenario())
+
+    assert egress.forwarded == 2 and egress._routes == {} and queue.packets == []
+    assert [request.canonical_envelope for request in sent[0]] == [b"a", b"b"]
+    assert (sent[0][0].subject, sent[0][0].correlation_id) == ("aether.stream.core.a", "c-1")
+    assert [request.canonical_envelope for request in sent[2]] == [b"b"]
+
+
+def test_close_forwards_packets_still_queued(monkeypatch) -> None:
+    queue = FakeQueue().install(monkeypatch)
+    sent: list[bytes] = []
+
+    async def publish_batch(requests: list) -> list:
+        sent.extend(request.canonical_envelope for request in requests)
+        return [types.SimpleNamespace(accepted=True) for _ in requests]
+
+    async def scenario() -> None:
+        egress = tachyon.TachyonEgress(batch_size=1)
+        egress.start(publish_batch)
+        egress._worker.cancel()  # nothing forwarded before close
+        egress.publish(_HEADER, b"a", "aether.stream.core.a")
+        egress.publish(_HEADER, b"b", "aether.stream.core.a")
+        await egress.close()
+
+    asyncio.run(scenario())
+
+    assert sent == [b"a", b"b"] and queue.packets == []
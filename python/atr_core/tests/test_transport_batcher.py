@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field, replace
+
+from atr_core.perf_model import batch_time_us, effective_latency_us
+from atr_core.transport.batcher import (
+    SIDECAR_BATCH_SPEC,
+    SIDECAR_PERF_PARAMS,
+    PublishBatcher,
+    default_flush_policy,
+)
+from atr_core.transport.client import PublishAck
+
+
+@dataclass
+class RecordingClient:
+    batches: list[list[str]] = field(default_factory=list)
+    error: Exception | None = None
+
+    async def publish_batch(self, requests) -> list[PublishAck]:  # noqa: ANN001
+        self.batches.append([request.subject for request in requests])
+        if self.error is not None:
+            raise self.error
+        base = sum(len(batch) for batch in self.batches[:-1])
+        return [PublishAck(True, True, base + offset + 1, "", "") for offset in range(len(requests))]
+
+    async def close(self) -> None:
+        pass
+
+
+def test_default_flush_policy_comes_from_perf_model() -> None:
+    policy = default_flush_policy()
+
+    assert policy.max_batch_size < SIDECAR_BATCH_SPEC.n_max
+    assert effective_latency_us(SIDECAR_PERF_PARAMS, policy.max_batch_size) <= SIDECAR_BATCH_SPEC.latency_budget_us
+    assert effective_latency_us(SIDECAR_PERF_PARAMS, policy.max_batch_size // 2) > SIDECAR_BATCH_SPEC.latency_budget_us
+    assert policy.max_delay_us < batch_time_us(SIDECAR_PERF_PARAMS, policy.max_batch_size)
+
+
+def test_flush_policy_follows_the_latency_budget() -> None:
+    tight = default_flush_policy(spec=replace(SIDECAR_BATCH_SPEC, latency_budget_us=3.0))
+    loose = default_flush_policy(spec=replace(SIDECAR_BATCH_SPEC, latency_budget_us=12.0))
+    throughput_first = default_flush_policy(spec=replace(SIDECAR_BATCH_SPEC, prefer_smallest=False))
+
+    assert (loose.max_batch_size, tight.max_batch_size) == (32, 256)
+    assert throughput_first.max_batch_size == SIDECAR_BATCH_SPEC.n_max
+
+
+def test_batcher_flushes_on_size_and_acks_each_caller_in_order() -> None:
+    client = RecordingClient()
+
+    async def run() -> list[PublishAck]:
+        batcher = PublishBatcher(client, max_batch_size=4, max_delay_us=1_000_000)
+        return await asyncio.gather(*(batcher.publish(b"{}", f"s.{i}") for i in range(8)))
+
+    acks = asyncio.run(run())
+
+    assert client.batches == [["s.0", "s.1", "s.2", "s.3"], ["s.4", "s.5", "s.6", "s.7"]]
+    assert [ack.stream_sequence for ack in acks] == list(range(1, 9))
+
+
+def test_batcher_flushes_partial_batch_on_deadline() -> None:
+    client = RecordingClient()
+
+    async def run() -> PublishAck:
+        batcher = PublishBatcher(client, max_batch_size=64, max_delay_us=200)
+        return await asyncio.wait_for(batcher.publish(b"{}", "s.0"), timeout=1.0)
+
+    ack = asyncio.run(run())
+
+    assert ack.stream_sequence == 1
+    assert client.batches == [["s.0"]]
+
+
+def test_batcher_fans_out_transport_failure() -> None:
+    client = RecordingClient(error=RuntimeError("sidecar down"))
+
+    async def run() -> list:
+        batcher = PublishBatcher(client, max_batch_size=2, max_delay_us=200)
+        return await asyncio.gather(
+            batcher.publish(b"{}", "s.0"),
+            batcher.publish(b"{}", "s.1"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert [str(result) for result in results] == ["sidecar down", "sidecar down"]
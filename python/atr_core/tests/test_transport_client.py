@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent import futures
+from dataclasses import dataclass, field
+import threading
+import time
+
+import grpc
+from prometheus_client import REGISTRY
+import pytest
+
+from atr_core.proto import atr_transport_pb2 as pb2
+from atr_core.transport.aio import AsyncAtrTransportClient
+from atr_core.transport.batcher import PublishBatcher
+from atr_core.transport import subscriber
+from atr_core.transport.client import AtrTransportClient, TransportUnavailableError
+
+
+@dataclass
+class StubSidecar:
+    healthy: bool = True
+    published: int = 0
+    batches: int = 0
+    active: int = 0
+    peak_active: int = 0
+    delay_s: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # One list of stream sequences per Subscribe call; a call ending in None
+    # fails with UNAVAILABLE after its frames.
+    streams: list[list[int | None]] = field(default_factory=list)
+    subscribe_requests: list[pb2.SubscribeRequest] = field(default_factory=list)
+
+    def publish(self, request: pb2.PublishRequest, context: grpc.ServicerContext) -> pb2.PublishResponse:  # noqa: ARG002
+        with self.lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        time.sleep(self.delay_s)
+        with self.lock:
+            self.active -= 1
+            self.published += 1
+            sequence = self.published
+        return pb2.PublishResponse(accepted=True, persisted=True, stream_sequence=sequence)
+
+    def publish_batch(
+        self,
+        request: pb2.PublishBatchRequest,
+        context: grpc.ServicerContext,
+    ) -> pb2.PublishBatchResponse:
+        self.batches += 1
+        return pb2.PublishBatchResponse(acks=[self.publish(item, context) for item in request.items])
+
+    def health(self, request: pb2.HealthRequest, context: grpc.ServicerContext) -> pb2.HealthResponse:  # noqa: ARG002
+        return pb2.HealthResponse(ok=self.healthy, backlog_msgs=7)
+
+    def subscribe(self, request: pb2.SubscribeRequest, context: grpc.ServicerContext):  # noqa: ANN201
+        self.subscribe_requests.append(request)
+        for sequence in self.streams.pop(0):
+            if sequence is None:
+                context.abort(grpc.StatusCode.UNAVAILABLE, "stream interrupted")
+            yield pb2.EnvelopeFrame(
+                canonical_envelope=b'{"n":%d}' % sequence,
+                subject=request.subject_filter,
+                stream_sequence=sequence,
+            )
+
+
+@pytest.fixture
+def sidecar(tmp_path):
+    stub = StubSidecar()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    server.add_generic_rpc_handlers(
+        (
+            grpc.method_handlers_generic_handler(
+                "atr.transport.v1.AtrTransport",
+                {
+                    "Publish": grpc.unary_unary_rpc_method_handler(
+                        stub.publish,
+                        request_deserializer=pb2.PublishRequest.FromString,
+                        response_serializer=pb2.PublishResponse.SerializeToString,
+                    ),
+                    "PublishBatch": grpc.unary_unary_rpc_method_handler(
+                        stub.publish_batch,
+                        request_deserializer=pb2.PublishBatchRequest.FromString,
+                        response_serializer=pb2.PublishBatchResponse.SerializeToString,
+                    ),
+                    "Health": grpc.unary_unary_rpc_method_handler(
+                        stub.health,
+                        request_deserializer=pb2.HealthRequest.FromString,
+                        response_serializer=pb2.HealthResponse.SerializeToString,
+                    ),
+                    "Subscribe": grpc.unary_stream_rpc_method_handler(
+                        stub.subscribe,
+                        request_deserializer=pb2.SubscribeRequest.FromString,
+                        response_serializer=pb2.EnvelopeFrame.SerializeToString,
+                    ),
+                },
+            ),
+        )
+    )
+    target = f"unix://{tmp_path / 'atb_et.sock'}"
+    server.add_insecure_port(target)
+    server.start()
+    yield stub, target
+    server.stop(None)
+
+
+def test_publish_reuses_pooled_channels(sidecar) -> None:
+    stub, target = sidecar
+    client = AtrTransportClient(target, timeout_ms=2000, pool_size=2)
+
+    acks = [client.publish(b"{}", "aether.stream.core.state.mutation") for _ in range(10)]
+    stats = client.stats()
+    client.close()
+
+    assert [ack.stream_sequence for ack in acks] == list(range(1, 11))
+    assert stats.channels_opened == 2
+    assert stats.channel_reuses == 8
+    assert stats.reconnects == 0
+    assert stub.published == 10
+
+
+def test_unhealthy_sidecar_is_not_used_and_backs_off(sidecar) -> None:
+    stub, target = sidecar
+    stub.healthy = False
+    client = AtrTransportClient(target, timeout_ms=2000, pool_size=1, reconnect_backoff_ms=60000)
+
+    with pytest.raises(TransportUnavailableError, match="health check"):
+        client.publish(b"{}", "aether.stream.core.state.mutation")
+    with pytest.raises(TransportUnavailableError, match="backing off"):
+        client.publish(b"{}", "aether.stream.core.state.mutation")
+
+    assert stub.published == 0
+    assert client.stats().health_check_failures == 1
+    assert client.stats().channels_open == 0
+
+
+def test_health_reports_sidecar_backlog(sidecar) -> None:
+    _, target = sidecar
+    client = AtrTransportClient(target, timeout_ms=2000, pool_size=1)
+
+    health = client.health()
+    client.close()
+
+    assert health.ok
+    assert health.backlog_msgs == 7
+
+
+def _exported(name: str) -> float:
+    return REGISTRY.get_sample_value(name, {"transport": "grpc"}) or 0.0
+
+
+def test_async_client_spreads_publishes_over_pooled_channels(sidecar) -> None:
+    stub, target = sidecar
+    reuses, channels_open = _exported("atr_tx_channel_reuses_total"), _exported("atr_tx_channels_open")
+
+    async def run():  # noqa: ANN202
+        client = AsyncAtrTransportClient(target, timeout_ms=2000, pool_size=2)
+        for _ in range(10):
+            await client.publish(b"{}", "aether.stream.core.state.mutation")
+        stats = client.stats()
+        await client.close()
+        return stats, client.stats()
+
+    stats, closed = asyncio.run(run())
+
+    assert (stats.pool_size, stats.channels_open, stats.channels_opened) == (2, 2, 2)
+    assert stats.channel_reuses == 8
+    assert stats.reconnects == 0
+    assert closed.channels_open == 0
+    assert stub.published == 10
+    assert _exported("atr_tx_channel_reuses_total") - reuses == 8
+    assert _exported("atr_tx_channels_open") == channels_open
+
+
+def test_health_check_failures_are_exported(sidecar) -> None:
+    stub, target = sidecar
+    stub.healthy = False
+    failures = _exported("atr_tx_health_check_failures_total")
+    client = AtrTransportClient(target, timeout_ms=2000, pool_size=1)
+
+    with pytest.raises(TransportUnavailableError):
+        client.publish(b"{}", "aether.stream.core.state.mutation")
+
+    assert _exported("atr_tx_health_check_failures_total") - failures == 1
+
+
+def test_async_client_backs_off_per_channel_after_failed_health_check(sidecar) -> None:
+    stub, target = sidecar
+    stub.healthy = False
+
+    async def run():  # noqa: ANN202
+        client = AsyncAtrTransportClient(target, timeout_ms=2000, pool_size=1, reconnect_backoff_ms=60000)
+        with pytest.raises(TransportUnavailableError, match="health check"):
+            await client.publish(b"{}", "aether.stream.core.state.mutation")
+        with pytest.raises(TransportUnavailableError, match="backing off"):
+            await client.publish(b"{}", "aether.stream.core.state.mutation")
+        return client.stats()
+
+    stats = asyncio.run(run())
+
+    assert stub.published == 0
+    assert (stats.health_check_failures, stats.channels_open) == (1, 0)
+
+
+def test_async_client_bounds_in_flight_publishes(sidecar) -> None:
+    stub, target = sidecar
+    stub.delay_s = 0.005
+
+    async def run() -> list:
+        client = AsyncAtrTransportClient(target, timeout_ms=2000, max_in_flight=3)
+        acks = await asyncio.gather(
+            *(client.publish(b"{}", "aether.stream.core.state.mutation") for _ in range(24))
+        )
+        assert client.in_flight == 0
+        await client.close()
+        return acks
+
+    acks = asyncio.run(run())
+
+    assert sorted(ack.stream_sequence for ack in acks) == list(range(1, 25))
+    assert 1 < stub.peak_active <= 3
+
+
+def test_async_client_refuses_unhealthy_sidecar(sidecar) -> None:
+    stub, target = sidecar
+    stub.healthy = False
+
+    async def run() -> None:
+        client = AsyncAtrTransportClient(target, timeout_ms=2000)
+        try:
+            await client.publish(b"{}", "aether.stream.core.state.mutation")
+        finally:
+            await client.close()
+
+    with pytest.raises(TransportUnavailableError, match="health check"):
+        asyncio.run(run())
+    assert stub.published == 0
+
+
+def test_batcher_coalesces_publishes_into_publish_batch_rpc(sidecar) -> None:
+    stub, target = sidecar
+
+    async def run() -> list:
+        batcher = PublishBatcher(AsyncAtrTransportClient(target, timeout_ms=2000), max_batch_size=5)
+        acks = await asyncio.gather(
+            *(batcher.publish(b"{}", "aether.stream.core.state.mutation") for _ in range(10))
+        )
+        await batcher.close()
+        return acks
+
+    acks = asyncio.run(run())
+
+    assert sorted(ack.stream_sequence for ack in acks) == list(range(1, 11))
+    assert stub.batches == 2
+
+
+def test_subscription_bounds_unacknowledged_frames_to_max_in_flight(sidecar) -> None:
+    stub, target = sidecar
+    stub.streams = [list(range(1, 201))]
+
+    async def run() -> tuple[list[int], list[int]]:
+        subscription = AsyncAtrTransportClient(target, timeout_ms=2000).subscribe(
+            "aether.stream.>", durable_name="worker", max_in_flight=8
+        )
+        sizes: list[int] = []
+        sequences: list[int] = []
+
+        async def handler(batch) -> None:  # noqa: ANN001
+            assert subscription.in_flight <= 8
+            await asyncio.sleep(0.001)  # let the reader fill every free credit
+            assert subscription.in_flight <= 8
+            sizes.append(len(batch))
+            sequences.extend(frame.stream_sequence for frame in batch)
+
+        await subscription.run(handler, max_batch=4)
+        await subscription.close()
+        assert subscription.last_sequence == 200
+        return sizes, sequences
+
+    sizes, sequences = asyncio.run(run())
+
+    assert sequences == list(range(1, 201))
+    assert max(sizes) == 4
+    assert stub.subscribe_requests[0].max_in_flight == 8
+    assert stub.subscribe_requests[0].durable_name == "worker"
+
+
+def test_subscription_resumes_after_interruption_without_redelivering(sidecar) -> None:
+    stub, target = sidecar
+    stub.streams = [[1, 2, 3, None], [2, 3, 4, 5]]
+
+    async def run() -> list[int]:
+        client = AsyncAtrTransportClient(target, timeout_ms=2000, reconnect_backoff_ms=1)
+        subscription = client.subscribe("aether.stream.>", durable_name="worker")
+        sequences = [frame.stream_sequence async for frame in subscription]
+        await subscription.close()
+        return sequences
+
+    assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+    assert [request.durable_name for request in stub.subscribe_requests] == ["worker", "worker"]
+    assert [request.start_sequence for request in stub.subscribe_requests] == [0, 4]
+
+
+def test_subscription_starts_after_resume_point(sidecar) -> None:
+    stub, target = sidecar
+    stub.streams = [[11, 12]]
+
+    async def run() -> list[int]:
+        client = AsyncAtrTransportClient(target, timeout_ms=2000)
+        subscription = client.subscribe("aether.stream.>", durable_name="worker", resume_after=10)
+        sequences = [frame.stream_sequence async for frame in subscription]
+        await subscription.close()
+        return sequences
+
+    assert asyncio.run(run()) == [11, 12]
+    assert stub.subscribe_requests[0].start_sequence == 11
+
+
+def test_subscription_surfaces_reader_failures_instead_of_hanging(sidecar, monkeypatch) -> None:
+    stub, target = sidecar
+    stub.streams = [[1, 2]]
+
+    def broken_frame(message):  # noqa: ANN001,ANN202
+        raise ValueError("undecodable frame")
+
+    monkeypatch.setattr(subscriber, "_to_frame", broken_frame)
+
+    async def run() -> None:
+        subscription = AsyncAtrTransportClient(target, timeout_ms=2000).subscribe("aether.stream.>")
+        try:
+            await asyncio.wait_for(subscription.run(lambda frames: asyncio.sleep(0)), timeout=5)
+        finally:
+            await subscription.close()
+
+    with pytest.raises(ValueError, match="undecodable frame"):
+        asyncio.run(run())
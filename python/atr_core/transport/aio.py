@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence
+
+import grpc
+from grpc import aio
+
+from atr_core.proto import atr_transport_pb2 as pb2
+from atr_core.transport.client import (
+    HEALTH_METHOD,
+    PUBLISH_BATCH_METHOD,
+    PUBLISH_METHOD,
+    ChannelPoolStats,
+    PublishAck,
+    TransportHealth,
+    TransportUnavailableError,
+    _CHANNEL_REUSES,
+    _CHANNELS_OPEN,
+    _HEALTH_CHECK_FAILURES,
+    _RECONNECT_CODES,
+    _RECONNECTS,
+    _Connection,
+    _to_ack,
+    _to_health,
+)
+from atr_core.transport.subscriber import Subscription
+
+
+class _AsyncChannelSlot:
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.connection: _Connection | None = None
+        self.ever_connected = False
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class AsyncAtrTransportClient:
+    def __init__(
+        self,
+        target: str,
+        timeout_ms: int,
+        pool_size: int = 4,
+        max_in_flight: int = 1024,
+        keepalive_ms: int = 30000,
+        reconnect_backoff_ms: int = 100,
+        reconnect_backoff_max_ms: int = 5000,
+    ) -> None:
+        self._target = target
+        self._timeout = timeout_ms / 1000.0
+        self._backoff = reconnect_backoff_ms / 1000.0
+        self._backoff_max = reconnect_backoff_max_ms / 1000.0
+        self._options = [
+            ("grpc.keepalive_time_ms", keepalive_ms),
+            ("grpc.keepalive_timeout_ms", timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.initial_reconnect_backoff_ms", reconnect_backoff_ms),
+            ("grpc.max_reconnect_backoff_ms", reconnect_backoff_max_ms),
+            # Separate subchannel pools so each pooled channel owns its own connection.
+            ("grpc.use_local_subchannel_pool", 1),
+        ]
+        self._max_in_flight = max(1, max_in_flight)
+        self._slots = asyncio.Semaphore(self._max_in_flight)
+        self._in_flight = 0
+        self._channels = [_AsyncChannelSlot() for _ in range(max(1, pool_size))]
+        self._next_channel = itertools.count()
+        self._channels_opened = 0
+        self._channel_reuses = 0
+        self._reconnects = 0
+        self._health_check_failures = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def publish(
+        self,
+        canonical_envelope: bytes,
+        subject: str,
+        correlation_id: str = "",
+        require_persisted_ack: bool = True,
+    ) -> PublishAck:
+        async with self._acquire() as connection:
+            response = await connection.publish(
+                pb2.PublishRequest(
+                    canonical_envelope=canonical_envelope,
+                    subject=subject,
+                    correlation_id=correlation_id,
+                    require_persisted_ack=require_persisted_ack,
+                ),
+                timeout=self._timeout,
+            )
+        return _to_ack(response)
+
+    async def publish_batch(self, requests: Sequence[pb2.PublishRequest]) -> list[PublishAck]:
+        async with self._acquire() as connection:
+            response = await connection.publish_batch(
+                pb2.PublishBatchRequest(items=requests),
+                timeout=self._timeout,
+            )
+        if len(response.acks) != len(requests):
+            raise TransportUnavailableError(
+                f"sidecar returned {len(response.acks)} acks for {len(requests)} publishes"
+            )
+        return [_to_ack(ack) for ack in response.acks]
+
+    async def health(self) -> TransportHealth:
+        async with self._acquire() as connection:
+            response = await connection.health(pb2.HealthRequest(include_metrics=True), timeout=self._timeout)
+        return _to_health(response)
+
+    def subscribe(
+        self,
+        subject_filter: str,
+        durable_name: str = "",
+        max_in_flight: int | None = None,
+        resume_after: int = 0,
+    ) -> Subscription:
+        # Streams get their own channel so a long-lived subscription never
+        # holds one of the publish in-flight slots.
+        return Subscription(
+            self._target,
+            subject_filter,
+            durable_name=durable_name,
+            max_in_flight=max_in_flight or self._max_in_flight,
+            resume_after=resume_after,
+            options=self._options,
+            reconnect_backoff_s=self._backoff,
+            reconnect_backoff_max_s=self._backoff_max,
+        )
+
+    def stats(self) -> ChannelPoolStats:
+        return ChannelPoolStats(
+            pool_size=len(self._channels),
+            channels_open=sum(1 for slot in self._channels if slot.connection is not None),
+            channels_opened=self._channels_opened,
+            channel_reuses=self._channel_reuses,
+            reconnects=self._reconnects,
+            health_check_failures=self._health_check_failures,
+        )
+
+    async def close(self) -> None:
+        for slot in self._channels:
+            connection, slot.connection = slot.connection, None
+            if connection is not None:
+                _CHANNELS_OPEN.dec()
+                await connection.channel.close()
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[_Connection]:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self._timeout)
+        except asyncio.TimeoutError as exc:
+            raise TransportUnavailableError(f"{self._max_in_flight} publishes already in flight") from exc
+        self._in_flight += 1
+        try:
+            slot = self._channels[next(self._next_channel) % len(self._channels)]
+            connection = slot.connection
+            if connection is not None:
+                self._channel_reuses += 1
+                _CHANNEL_REUSES.inc()
+            else:
+                connection = await self._connect(slot)
+            try:
+                yield connection
+            except aio.AioRpcError as exc:
+                if exc.code() in _RECONNECT_CODES and slot.connection is connection:
+                    slot.connection = None
+                    _CHANNELS_OPEN.dec()
+                    await connection.channel.close()
+                raise
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def _connect(self, slot: _AsyncChannelSlot) -> _Connection:
+        async with slot.lock:
+            if slot.connection is not None:
+                return slot.connection
+
+            now = time.monotonic()
+            if now < slot.retry_at:
+                raise TransportUnavailableError(f"reconnect to {self._target} backing off")
+
+            channel = aio.insecure_channel(self._target, options=self._options)
+            connection = _Connection(
+                channel=channel,
+                publish=channel.unary_unary(
+                    PUBLISH_METHOD,
+                    request_serializer=pb2.PublishRequest.SerializeToString,
+                    response_deserializer=pb2.PublishResponse.FromString,
+                ),
+                health=channel.unary_unary(
+                    HEALTH_METHOD,
+                    request_serializer=pb2.HealthRequest.SerializeToString,
+                    response_deserializer=pb2.HealthResponse.FromString,
+                ),
+                publish_batch=channel.unary_unary(
+                    PUBLISH_BATCH_METHOD,
+                    request_serializer=pb2.PublishBatchRequest.SerializeToString,
+                    response_deserializer=pb2.PublishBatchResponse.FromString,
+                ),
+            )
+            try:
+                healthy = (await connection.health(pb2.HealthRequest(), timeout=self._timeout)).ok
+            except grpc.RpcError:
+                healthy = False
+
+            if not healthy:
+                await channel.close()
+                slot.failures += 1
+                delay = min(self._backoff_max, self._backoff * (2 ** (slot.failures - 1)))
+                slot.retry_at = now + delay * random.uniform(0.5, 1.0)
+                self._health_check_failures += 1
+                _HEALTH_CHECK_FAILURES.inc()
+                raise TransportUnavailableError(f"sidecar at {self._target} failed health check")
+
+            self._channels_opened += 1
+            if slot.ever_connected:
+                self._reconnects += 1
+                _RECONNECTS.inc()
+            _CHANNELS_OPEN.inc()
+            slot.ever_connected = True
+            slot.failures = 0
+            slot.connection = connection
+            return connection
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+from atr_core.perf_model import BatchOptSpec, PerfParams, optimize_batch_size
+from atr_core.proto import atr_transport_pb2 as pb2
+from atr_core.transport.client import PublishAck
+
+# Per-call and per-message costs of a PublishBatch round trip to the ATB-ET
+# sidecar over the local unix socket, expressed in the estimator's terms.
+SIDECAR_PERF_PARAMS = PerfParams(
+    t_py_us=20.0,
+    t_bridge_us=150.0,
+    t_persist_us=0.0,
+    t_rust_us_per_msg=2.0,
+    cores=1,
+    parallel_fraction=0.0,
+)
+# The flush size is the smallest batch that brings the amortized sidecar cost
+# under 4 us per message; n_max only caps what callers may configure.
+SIDECAR_BATCH_SPEC = BatchOptSpec(latency_budget_us=4.0, n_min=1, n_max=256, prefer_smallest=True)
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    max_batch_size: int
+    max_delay_us: int
+
+
+class BatchPublisher(Protocol):
+    async def publish_batch(self, requests: Sequence[pb2.PublishRequest]) -> list[PublishAck]: ...
+
+    async def close(self) -> None: ...
+
+
+def default_flush_policy(
+    params: PerfParams = SIDECAR_PERF_PARAMS,
+    spec: BatchOptSpec = SIDECAR_BATCH_SPEC,
+) -> FlushPolicy:
+    opt = optimize_batch_size(params, spec)
+    best = opt["best"] if opt["ok"] else opt["closest_lowest_latency"]
+    # Waiting longer than the fixed per-call cost buys nothing: two smaller
+    # batches would have been cheaper than the added queueing delay.
+    return FlushPolicy(
+        max_batch_size=int(best["N"]),  # type: ignore[index]
+        max_delay_us=max(1, int(params.t_py_us + params.t_bridge_us)),
+    )
+
+
+class PublishBatcher:
+    def __init__(
+        self,
+        client: BatchPublisher,
+        max_batch_size: int | None = None,
+        max_delay_us: int | None = None,
+    ) -> None:
+        policy = default_flush_policy()
+        self._client = client
+        self._max_batch_size = max(1, max_batch_size or policy.max_batch_size)
+        self._max_delay = (max_delay_us or policy.max_delay_us) / 1_000_000.0
+        self._pending: list[tuple[pb2.PublishRequest, asyncio.Future[PublishAck]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._sends: set[asyncio.Task[None]] = set()
+
+    @property
+    def policy(self) -> FlushPolicy:
+        return FlushPolicy(self._max_batch_size, round(self._max_delay * 1_000_000))
+
+    async def publish(
+        self,
+        canonical_envelope: bytes,
+        subject: str,
+        correlation_id: str = "",
+        require_persisted_ack: bool = True,
+    ) -> PublishAck:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[PublishAck] = loop.create_future()
+        self._pending.append(
+            (
+                pb2.PublishRequest(
+                    canonical_envelope=canonical_envelope,
+                    subject=subject,
+                    correlation_id=correlation_id,
+                    require_persisted_ack=require_persisted_ack,
+                ),
+                future,
+            )
+        )
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    async def flush(self) -> None:
+        self._flush()
+        if self._sends:
+            await asyncio.gather(*self._sends)
+
+    async def close(self) -> None:
+        await self.flush()
+        await self._client.close()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: list[tuple[pb2.PublishRequest, asyncio.Future[PublishAck]]]) -> None:
+        try:
+            acks = await self._client.publish_batch([request for request, _ in batch])
+        except Exception as exc:  # fan the transport failure out to every waiting caller
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), ack in zip(batch, acks):
+            if not future.done():
+                future.set_result(ack)
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
+import itertools
+import random
+import threading
+import time
 from dataclasses import dataclass
+from typing import Any, Callable, Sequence
 
 import grpc
 
+from atr_core.metrics import TX_CHANNEL_REUSES, TX_CHANNELS_OPEN, TX_HEALTH_CHECK_FAILURES, TX_RECONNECTS
 from atr_core.proto import atr_transport_pb2 as pb2
 
+PUBLISH_METHOD = "/atr.transport.v1.AtrTransport/Publish"
+PUBLISH_BATCH_METHOD = "/atr.transport.v1.AtrTransport/PublishBatch"
+HEALTH_METHOD = "/atr.transport.v1.AtrTransport/Health"
+SUBSCRIBE_METHOD = "/atr.transport.v1.AtrTransport/Subscribe"
+
+_RECONNECT_CODES = frozenset({grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED})
+
+# Pool counters exported by both clients, next to their stats().
+_CHANNEL_REUSES = TX_CHANNEL_REUSES.labels(transport="grpc")
+_RECONNECTS = TX_RECONNECTS.labels(transport="grpc")
+_HEALTH_CHECK_FAILURES = TX_HEALTH_CHECK_FAILURES.labels(transport="grpc")
+_CHANNELS_OPEN = TX_CHANNELS_OPEN.labels(transport="grpc")
+
+
+class TransportUnavailableError(RuntimeError):
+    pass
+
 
 @dataclass(frozen=True)
 class PublishAck:
@@ -16,10 +39,80 @@ class PublishAck:
     error_message: str
 
 
+@dataclass(frozen=True)
+class TransportHealth:
+    ok: bool
+    overloaded: bool
+    backlog_msgs: int
+    publish_rate_msg_s: int
+    version: str
+
+
+@dataclass(frozen=True)
+class EnvelopeFrame:
+    canonical_envelope: bytes
+    subject: str
+    stream_sequence: int
+    broker_time_unix_ns: int
+
+
+@dataclass(frozen=True)
+class ChannelPoolStats:
+    pool_size: int
+    channels_open: int
+    channels_opened: int
+    channel_reuses: int
+    reconnects: int
+    health_check_failures: int
+
+
+@dataclass(frozen=True)
+class _Connection:
+    channel: Any
+    publish: Callable[..., Any]
+    health: Callable[..., Any]
+    publish_batch: Callable[..., Any]
+
+
+class _ChannelSlot:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.connection: _Connection | None = None
+        self.ever_connected = False
+        self.failures = 0
+        self.retry_at = 0.0
+
+
 class AtrTransportClient:
-    def __init__(self, target: str, timeout_ms: int) -> None:
+    def __init__(
+        self,
+        target: str,
+        timeout_ms: int,
+        pool_size: int = 4,
+        keepalive_ms: int = 30000,
+        reconnect_backoff_ms: int = 100,
+        reconnect_backoff_max_ms: int = 5000,
+    ) -> None:
         self._target = target
         self._timeout = timeout_ms / 1000.0
+        self._backoff = reconnect_backoff_ms / 1000.0
+        self._backoff_max = reconnect_backoff_max_ms / 1000.0
+        self._options = [
+            ("grpc.keepalive_time_ms", keepalive_ms),
+            ("grpc.keepalive_timeout_ms", timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.initial_reconnect_backoff_ms", reconnect_backoff_ms),
+            ("grpc.max_reconnect_backoff_ms", reconnect_backoff_max_ms),
+            # Separate subchannel pools so each pooled channel owns its own connection.
+            ("grpc.use_local_subchannel_pool", 1),
+        ]
+        self._slots = [_ChannelSlot() for _ in range(max(1, pool_size))]
+        self._next_slot = itertools.count()
+        self._stats_lock = threading.Lock()
+        self._channels_opened = 0
+        self._channel_reuses = 0
+        self._reconnects = 0
+        self._health_check_failures = 0
 
     def publish(
         self,
@@ -28,13 +121,9 @@ class AtrTransportClient:
         correlation_id: str = "",
         require_persisted_ack: bool = True,
     ) -> PublishAck:
-        with grpc.insecure_channel(self._target) as channel:
-            method = channel.unary_unary(
-                "/atr.transport.v1.AtrTransport/Publish",
-                request_serializer=pb2.PublishRequest.SerializeToString,
-                response_deserializer=pb2.PublishResponse.FromString,
-            )
-            response = method(
+        slot, connection = self._acquire()
+        try:
+            response = connection.publish(
                 pb2.PublishRequest(
                     canonical_envelope=canonical_envelope,
                     subject=subject,
@@ -43,10 +132,150 @@ class AtrTransportClient:
                 ),
                 timeout=self._timeout,
             )
-            return PublishAck(
-                accepted=response.accepted,
-                persisted=response.persisted,
-                stream_sequence=response.stream_sequence,
-                error_code=response.error_code,
-                error_message=response.error_message,
+        except grpc.RpcError as exc:
+            if exc.code() in _RECONNECT_CODES:
+                self._invalidate(slot, connection)
+            raise
+        return _to_ack(response)
+
+    def publish_batch(self, requests: Sequence[pb2.PublishRequest]) -> list[PublishAck]:
+        slot, connection = self._acquire()
+        try:
+            response = connection.publish_batch(pb2.PublishBatchRequest(items=requests), timeout=self._timeout)
+        except grpc.RpcError as exc:
+            if exc.code() in _RECONNECT_CODES:
+                self._invalidate(slot, connection)
+            raise
+        if len(response.acks) != len(requests):
+            raise TransportUnavailableError(
+                f"sidecar returned {len(response.acks)} acks for {len(requests)} publishes"
+            )
+        return [_to_ack(ack) for ack in response.acks]
+
+    def health(self) -> TransportHealth:
+        slot, connection = self._acquire()
+        try:
+            response = connection.health(pb2.HealthRequest(include_metrics=True), timeout=self._timeout)
+        except grpc.RpcError as exc:
+            if exc.code() in _RECONNECT_CODES:
+                self._invalidate(slot, connection)
+            raise
+        return _to_health(response)
+
+    def stats(self) -> ChannelPoolStats:
+        with self._stats_lock:
+            return ChannelPoolStats(
+                pool_size=len(self._slots),
+                channels_open=sum(1 for slot in self._slots if slot.connection is not None),
+                channels_opened=self._channels_opened,
+                channel_reuses=self._channel_reuses,
+                reconnects=self._reconnects,
+                health_check_failures=self._health_check_failures,
             )
+
+    def close(self) -> None:
+        for slot in self._slots:
+            with slot.lock:
+                if slot.connection is not None:
+                    slot.connection.channel.close()
+                    slot.connection = None
+                    _CHANNELS_OPEN.dec()
+
+    def _acquire(self) -> tuple[_ChannelSlot, _Connection]:
+        slot = self._slots[next(self._next_slot) % len(self._slots)]
+        connection = slot.connection
+        if connection is not None:
+            with self._stats_lock:
+                self._channel_reuses += 1
+            _CHANNEL_REUSES.inc()
+            return slot, connection
+
+        with slot.lock:
+            if slot.connection is None:
+                slot.connection = self._connect(slot)
+            return slot, slot.connection
+
+    def _connect(self, slot: _ChannelSlot) -> _Connection:
+        now = time.monotonic()
+        if now < slot.retry_at:
+            raise TransportUnavailableError(f"reconnect to {self._target} backing off")
+
+        channel = grpc.insecure_channel(self._target, options=self._options)
+        connection = _Connection(
+            channel=channel,
+            publish=channel.unary_unary(
+                PUBLISH_METHOD,
+                request_serializer=pb2.PublishRequest.SerializeToString,
+                response_deserializer=pb2.PublishResponse.FromString,
+            ),
+            health=channel.unary_unary(
+                HEALTH_METHOD,
+                request_serializer=pb2.HealthRequest.SerializeToString,
+                response_deserializer=pb2.HealthResponse.FromString,
+            ),
+            publish_batch=channel.unary_unary(
+                PUBLISH_BATCH_METHOD,
+                request_serializer=pb2.PublishBatchRequest.SerializeToString,
+                response_deserializer=pb2.PublishBatchResponse.FromString,
+            ),
+        )
+        try:
+            healthy = connection.health(pb2.HealthRequest(), timeout=self._timeout).ok
+        except grpc.RpcError:
+            healthy = False
+
+        if not healthy:
+            channel.close()
+            slot.failures += 1
+            delay = min(self._backoff_max, self._backoff * (2 ** (slot.failures - 1)))
+            slot.retry_at = now + delay * random.uniform(0.5, 1.0)
+            with self._stats_lock:
+                self._health_check_failures += 1
+            _HEALTH_CHECK_FAILURES.inc()
+            raise TransportUnavailableError(f"sidecar at {self._target} failed health check")
+
+        with self._stats_lock:
+            self._channels_opened += 1
+            if slot.ever_connected:
+                self._reconnects += 1
+                _RECONNECTS.inc()
+        _CHANNELS_OPEN.inc()
+        slot.ever_connected = True
+        slot.failures = 0
+        return connection
+
+    def _invalidate(self, slot: _ChannelSlot, connection: _Connection) -> None:
+        with slot.lock:
+            if slot.connection is connection:
+                slot.connection = None
+                connection.channel.close()
+                _CHANNELS_OPEN.dec()
+
+
+def _to_ack(response: Any) -> PublishAck:
+    return PublishAck(
+        accepted=response.accepted,
+        persisted=response.persisted,
+        stream_sequence=response.stream_sequence,
+        error_code=response.error_code,
+        error_message=response.error_message,
+    )
+
+
+def _to_health(response: Any) -> TransportHealth:
+    return TransportHealth(
+        ok=response.ok,
+        overloaded=response.overloaded,
+        backlog_msgs=response.backlog_msgs,
+        publish_rate_msg_s=response.publish_rate_msg_s,
+        version=response.version,
+    )
+
+
+def _to_frame(message: Any) -> EnvelopeFrame:
+    return EnvelopeFrame(
+        canonical_envelope=message.canonical_envelope,
+        subject=message.subject,
+        stream_sequence=message.stream_sequence,
+        broker_time_unix_ns=message.broker_time_unix_ns,
+    )
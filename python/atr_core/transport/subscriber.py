@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+
+from grpc import aio
+
+from atr_core.proto import atr_transport_pb2 as pb2
+from atr_core.transport.client import _RECONNECT_CODES, SUBSCRIBE_METHOD, EnvelopeFrame, _to_frame
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+FrameHandler = Callable[[list[EnvelopeFrame]], Awaitable[None]]
+
+
+class Subscription:
+    """Server-streaming ``Subscribe`` consumer with credit-based flow control.
+
+    Every frame read from the stream takes one of ``max_in_flight`` credits,
+    and a credit comes back only once the consumer has finished with the
+    frame (it asks for the next frame or batch). With all credits out the
+    reader stops reading, so gRPC flow control pushes back on the sidecar
+    instead of frames piling up in memory. Interrupted streams are reopened
+    with backoff under the same durable name, starting at the stream sequence
+    after the last one received; frames the sidecar redelivers anyway are
+    skipped.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        subject_filter: str,
+        durable_name: str = "",
+        max_in_flight: int = 1024,
+        resume_after: int = 0,
+        options: Sequence[tuple[str, int]] = (),
+        reconnect_backoff_s: float = 0.1,
+        reconnect_backoff_max_s: float = 5.0,
+    ) -> None:
+        self._target = target
+        self._options = list(options)
+        self._max_in_flight = max(1, max_in_flight)
+        self._request = pb2.SubscribeRequest(
+            subject_filter=subject_filter,
+            durable_name=durable_name,
+            max_in_flight=self._max_in_flight,
+        )
+        self._backoff = reconnect_backoff_s
+        self._backoff_max = reconnect_backoff_max_s
+        self._credits = asyncio.Semaphore(self._max_in_flight)
+        self._frames: asyncio.Queue[EnvelopeFrame | BaseException | object] = asyncio.Queue()
+        self._last_received = resume_after
+        self._last_sequence = resume_after
+        self._in_flight = 0
+        self._channel: aio.Channel | None = None
+        self._reader: asyncio.Task[None] | None = None
+
+    @property
+    def last_sequence(self) -> int:
+        """Highest ``stream_sequence`` the consumer has finished with."""
+        return self._last_sequence
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def __aiter__(self) -> AsyncIterator[EnvelopeFrame]:
+        return self._iter_frames()
+
+    async def batches(self, max_batch: int = 256) -> AsyncIterator[list[EnvelopeFrame]]:
+        """Yield whatever is buffered, up to ``max_batch`` frames, as one batch.
+
+        Frames of a batch are acknowledged when the next batch is requested.
+        """
+        self._start()
+        while True:
+            item = await self._frames.get()
+            if item is _END:
+                self._frames.put_nowait(_END)
+                return
+            if isinstance(item, BaseException):
+                raise item
+            batch = [item]
+            while len(batch) < max_batch and not self._frames.empty():
+                item = self._frames.get_nowait()
+                if item is _END or isinstance(item, BaseException):
+                    self._frames.put_nowait(item)  # surfaced after this batch
+                    break
+                batch.append(item)
+            yield batch  # type: ignore[misc]
+            self._ack(batch)  # type: ignore[arg-type]
+
+    async def run(self, handler: FrameHandler, max_batch: int = 256) -> None:
+        async for batch in self.batches(max_batch):
+            await handler(batch)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+    async def _iter_frames(self) -> AsyncIterator[EnvelopeFrame]:
+        async for batch in self.batches(1):
+            yield batch[0]
+
+    def _start(self) -> None:
+        if self._reader is None:
+            self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    def _ack(self, batch: list[EnvelopeFrame]) -> None:
+        if batch[-1].stream_sequence:
+            self._last_sequence = batch[-1].stream_sequence
+        self._in_flight -= len(batch)
+        for _ in batch:
+            self._credits.release()
+
+    async def _read(self) -> None:
+        failures = 0
+        while True:
+            call = None
+            try:
+                if self._channel is None:
+                    self._channel = aio.insecure_channel(self._target, options=self._options)
+                self._request.start_sequence = self._last_received + 1 if self._last_received else 0
+                call = self._channel.unary_stream(
+                    SUBSCRIBE_METHOD,
+                    request_serializer=pb2.SubscribeRequest.SerializeToString,
+                    response_deserializer=pb2.EnvelopeFrame.FromString,
+                )(self._request)
+                while True:
+                    await self._credits.acquire()
+                    message = await call.read()
+                    if message is aio.EOF:
+                        self._credits.release()
+                        self._frames.put_nowait(_END)
+                        return
+                    failures = 0
+                    sequence = message.stream_sequence
+                    if sequence and sequence <= self._last_received:
+                        self._credits.release()  # redelivered after a reconnect
+                        continue
+                    self._last_received = max(self._last_received, sequence)
+                    self._in_flight += 1
+                    self._frames.put_nowait(_to_frame(message))
+            except aio.AioRpcError as exc:
+                self._credits.release()
+                if exc.code() not in _RECONNECT_CODES:
+                    self._frames.put_nowait(exc)
+                    return
+                failures += 1
+                delay = min(self._backoff_max, self._backoff * (2 ** (failures - 1)))
+                logger.warning(
+                    "subscription %r interrupted (%s); resuming after sequence %d in %.2fs",
+                    self._request.subject_filter,
+                    exc.code().name,
+                    self._last_received,
+                    delay,
+                )
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            except Exception as exc:  # noqa: BLE001 - the consumer must not wait on a dead reader
+                self._frames.put_nowait(exc)
+                return
+            finally:
+                if call is not None:
+                    call.cancel()
@@ -1,12 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import struct
+import time
 from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Sequence
 
+from atr_core.proto import atr_transport_pb2 as pb2
 
 try:
+    from tachyon_core import configure_packet_queue as _configure_packet_queue
+    from tachyon_core import drain_packets as _drain_packets
+    from tachyon_core import packet_queue_depth as _packet_queue_depth
     from tachyon_core import submit_packet as _submit_packet
+    from tachyon_core import submit_packets as _submit_packets
 except ImportError:  # pragma: no cover - optional native path
+    _configure_packet_queue = None
+    _drain_packets = None
+    _packet_queue_depth = None
     _submit_packet = None
+    _submit_packets = None
+
+logger = logging.getLogger(__name__)
+
+
+# Little-endian image of the 64-byte `TachyonPacket` in rust/tachyon-core:
+# event_id (u128, low word first), sequence, unix_ns, payload_len, flags,
+# reserved, payload_head[20], 4 bytes of alignment padding.
+PACKET_SIZE = 64
+PACKET_LAYOUT = struct.Struct("<QQQQIHH20s4x")
+PAYLOAD_HEAD_SIZE = 20
+
+# NumPy structured dtype with the same layout: numpy.dtype(PACKET_DTYPE).
+PACKET_DTYPE = [
+    ("event_id_lo", "<u8"),
+    ("event_id_hi", "<u8"),
+    ("sequence", "<u8"),
+    ("unix_ns", "<u8"),
+    ("payload_len", "<u4"),
+    ("flags", "<u2"),
+    ("reserved", "<u2"),
+    ("payload_head", "V20"),
+    ("padding", "V4"),
+]
+
+PacketFields = tuple[int, int, int, int, bytes, int]
+PacketPublish = Callable[[Sequence[pb2.PublishRequest]], Awaitable[Sequence[Any]]]
+
+# SequenceClock layout: milliseconds since SEQUENCE_EPOCH_MS, shard, counter.
+SEQUENCE_EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+SEQUENCE_SHARD_BITS = 10
+SEQUENCE_COUNTER_BITS = 12
 
 
 @dataclass(frozen=True)
@@ -16,9 +61,255 @@ class PacketSubmitResult:
     error: str = ""
 
 
-def submit_packet(event_id_hi: int, event_id_lo: int, sequence: int, unix_ns: int, payload: bytes, flags: int) -> PacketSubmitResult:
+@dataclass(frozen=True)
+class TachyonAck:
+    accepted: bool
+    stream_sequence: int = 0
+    queue_depth: int = 0
+    error_message: str = ""
+
+
+@dataclass(frozen=True)
+class DrainedPacket:
+    event_id_hi: int
+    event_id_lo: int
+    sequence: int
+    unix_ns: int
+    flags: int
+    payload: bytes
+
+
+def configure_packet_queue(capacity: int) -> None:
+    if _configure_packet_queue is not None:
+        _configure_packet_queue(capacity)
+
+
+def packet_queue_depth() -> int:
+    return _packet_queue_depth() if _packet_queue_depth is not None else 0
+
+
+def submit_packet(
+    event_id_hi: int,
+    event_id_lo: int,
+    sequence: int,
+    unix_ns: int,
+    payload: bytes | bytearray | memoryview,
+    flags: int,
+) -> PacketSubmitResult:
     if _submit_packet is None:
         return PacketSubmitResult(False, 0, "tachyon_core extension not available")
 
-    queue_depth = _submit_packet(event_id_hi, event_id_lo, sequence, unix_ns, payload, flags)
+    try:
+        queue_depth = _submit_packet(event_id_hi, event_id_lo, sequence, unix_ns, payload, flags)
+    except OverflowError as exc:
+        return PacketSubmitResult(False, packet_queue_depth(), str(exc))
+    return PacketSubmitResult(True, queue_depth)
+
+
+def pack_packets(packets: Iterable[PacketFields]) -> bytearray:
+    """Encode ``submit_packet`` argument tuples into one contiguous packet buffer."""
+    items = list(packets)
+    buffer = bytearray(PACKET_SIZE * len(items))
+    for index, (event_id_hi, event_id_lo, sequence, unix_ns, payload, flags) in enumerate(items):
+        PACKET_LAYOUT.pack_into(
+            buffer,
+            index * PACKET_SIZE,
+            event_id_lo,
+            event_id_hi,
+            sequence,
+            unix_ns,
+            len(payload),
+            flags,
+            0,
+            bytes(payload[:PAYLOAD_HEAD_SIZE]),
+        )
+    return buffer
+
+
+def submit_packets(packets: Any) -> PacketSubmitResult:
+    """Enqueue every packet in a contiguous buffer with one extension call.
+
+    ``packets`` is any C-contiguous buffer of whole 64-byte packets: the
+    result of ``pack_packets``, a NumPy array of ``PACKET_DTYPE`` or a
+    ``memoryview`` over either. It is handed to the extension without a copy.
+    """
+    view = memoryview(packets)
+    if not view.c_contiguous:
+        raise ValueError("packet buffer must be C-contiguous")
+    view = view.cast("B")
+    if view.nbytes % PACKET_SIZE:
+        raise ValueError(f"packet buffer length {view.nbytes} is not a multiple of {PACKET_SIZE}")
+    if _submit_packets is None:
+        return PacketSubmitResult(False, 0, "tachyon_core extension not available")
+
+    try:
+        queue_depth = _submit_packets(view)
+    except OverflowError as exc:
+        return PacketSubmitResult(False, packet_queue_depth(), str(exc))
     return PacketSubmitResult(True, queue_depth)
+
+
+def drain_packets(max_packets: int) -> list[DrainedPacket]:
+    """Remove up to ``max_packets`` queued packets, oldest first."""
+    if _drain_packets is None:
+        return []
+    drained = []
+    for image, payload in _drain_packets(max_packets):
+        event_id_lo, event_id_hi, sequence, unix_ns, _, flags, _, _ = PACKET_LAYOUT.unpack(image)
+        drained.append(DrainedPacket(event_id_hi, event_id_lo, sequence, unix_ns, flags, payload))
+    return drained
+
+
+def split_event_id(event_id: str) -> tuple[int, int]:
+    """Split a UUID string (``header.id``, UUIDv7) into its high and low 64 bits."""
+    value = int(event_id.replace("-", ""), 16)
+    return value >> 64, value & 0xFFFF_FFFF_FFFF_FFFF
+
+
+class SequenceClock:
+    """Assigns time-ordered 63-bit sequences without coordination.
+
+    A sequence is the milliseconds since ``SEQUENCE_EPOCH_MS``, the shard and
+    a per-millisecond counter; when the counter runs out the clock moves to
+    the next millisecond, so sequences from one clock strictly increase and
+    never collide with another shard's.
+    """
+
+    def __init__(self, shard: int = 0, clock: Callable[[], int] = time.time_ns) -> None:
+        if not 0 <= shard < 1 << SEQUENCE_SHARD_BITS:
+            raise ValueError(f"shard must be in [0, {1 << SEQUENCE_SHARD_BITS})")
+        self._shard = shard
+        self._clock = clock
+        self._last_ms = 0
+        self._counter = 0
+
+    def next(self) -> int:
+        now_ms = self._clock() // 1_000_000 - SEQUENCE_EPOCH_MS
+        if now_ms > self._last_ms:
+            self._last_ms, self._counter = now_ms, 0
+        else:
+            self._counter += 1
+            if self._counter >> SEQUENCE_COUNTER_BITS:
+                self._last_ms, self._counter = self._last_ms + 1, 0
+        return (
+            self._last_ms << (SEQUENCE_SHARD_BITS + SEQUENCE_COUNTER_BITS)
+            | self._shard << SEQUENCE_COUNTER_BITS
+            | self._counter
+        )
+
+
+class TachyonEgress:
+    """Publishes accepted envelopes as TachyonPackets for the ``tachyon`` profile.
+
+    ``publish`` assigns the packet a ``SequenceClock`` sequence and queues it,
+    canonical bytes included, in ``tachyon_core``; nothing is serialized to
+    protobuf on the request path. A background task drains the queue and
+    persists the envelopes to JetStream through the sidecar in batches,
+    retrying failed items until they are acknowledged. ``close`` forwards
+    what is still queued.
+    """
+
+    def __init__(
+        self,
+        flags: int = 0,
+        shard: int = 0,
+        batch_size: int = 256,
+        retry_interval_s: float = 1.0,
+    ) -> None:
+        self._flags = flags
+        self._sequences = SequenceClock(shard)
+        self._batch_size = max(1, batch_size)
+        self._retry_interval = retry_interval_s
+        # Subject and correlation id per queued sequence; packets carry neither.
+        self._routes: dict[int, tuple[str, str]] = {}
+        self._pending: list[DrainedPacket] = []
+        self._publish_batch: PacketPublish | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._forwarded = 0
+
+    @property
+    def forwarded(self) -> int:
+        return self._forwarded
+
+    def publish(
+        self, header: Mapping[str, Any], canonical_envelope: bytes, subject: str, correlation_id: str = ""
+    ) -> TachyonAck:
+        event_id_hi, event_id_lo = split_event_id(header["id"])
+        sequence = self._sequences.next()
+        self._routes[sequence] = (subject, correlation_id)
+        result = submit_packet(event_id_hi, event_id_lo, sequence, header["timestamp"], canonical_envelope, self._flags)
+        if not result.accepted:
+            del self._routes[sequence]
+            return TachyonAck(False, queue_depth=result.queue_depth, error_message=result.error)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return TachyonAck(True, sequence, result.queue_depth)
+
+    def start(self, publish_batch: PacketPublish) -> None:
+        self._publish_batch = publish_batch
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._wakeup = None
+        while self._publish_batch is not None:
+            batch = self._pending or drain_packets(self._batch_size)
+            if not batch:
+                break
+            self._pending = await self._forward(batch)
+            if self._pending:
+                break
+        unsent = len(self._pending) + packet_queue_depth()
+        if unsent:
+            logger.error("%d tachyon packets not persisted at shutdown: sidecar unavailable", unsent)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                self._pending = drain_packets(self._batch_size)
+                if not self._pending:
+                    await self._wakeup.wait()
+                    continue
+            # Cancelled mid-send, the batch stays pending and ``close`` resends it.
+            self._pending = await self._forward(self._pending)
+            if self._pending:
+                await asyncio.sleep(self._retry_interval)
+
+    async def _forward(self, packets: list[DrainedPacket]) -> list[DrainedPacket]:
+        assert self._publish_batch is not None
+        requests = []
+        for packet in packets:
+            subject, correlation_id = self._routes[packet.sequence]
+            requests.append(
+                pb2.PublishRequest(
+                    canonical_envelope=packet.payload,
+                    subject=subject,
+                    correlation_id=correlation_id,
+                    require_persisted_ack=True,
+                )
+            )
+        try:
+            acks = await self._publish_batch(requests)
+        except Exception as exc:  # noqa: BLE001 - the whole batch is retried
+            logger.warning("forwarding %d tachyon packets failed: %s", len(packets), exc)
+            return packets
+        failed = []
+        for packet, ack in zip(packets, acks):
+            if getattr(ack, "accepted", False):
+                del self._routes[packet.sequence]
+                self._forwarded += 1
+            else:
+                failed.append(packet)
+        return failed
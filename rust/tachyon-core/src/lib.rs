@@ -1,8 +1,10 @@
 mod ruleset_rcu;
 
 use once_cell::sync::Lazy;
-use pyo3::exceptions::PyOverflowError;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyOverflowError, PyValueError};
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
 use std::collections::VecDeque;
 use std::sync::Mutex;
 
@@ -21,6 +23,11 @@ pub struct TachyonPacket {
     pub payload_head: [u8; 20],
 }
 
+/// Size of one packet in the little-endian wire image accepted by `submit_packets`.
+pub const PACKET_SIZE: usize = 64;
+
+const _: () = assert!(std::mem::size_of::<TachyonPacket>() == PACKET_SIZE);
+
 impl TachyonPacket {
     pub fn new(event_id: u128, sequence: u64, unix_ns: u64, payload: &[u8], flags: u16) -> Self {
         let mut payload_head = [0u8; 20];
@@ -37,61 +44,200 @@ impl TachyonPacket {
             payload_head,
         }
     }
+
+    /// Decode the `repr(C)` layout written by `atr_core.transport.tachyon.pack_packets`.
+    pub fn from_le_bytes(raw: &[u8; PACKET_SIZE]) -> Self {
+        let mut event_id = [0u8; 16];
+        let mut sequence = [0u8; 8];
+        let mut unix_ns = [0u8; 8];
+        let mut payload_len = [0u8; 4];
+        let mut flags = [0u8; 2];
+        let mut reserved = [0u8; 2];
+        let mut payload_head = [0u8; 20];
+        event_id.copy_from_slice(&raw[0..16]);
+        sequence.copy_from_slice(&raw[16..24]);
+        unix_ns.copy_from_slice(&raw[24..32]);
+        payload_len.copy_from_slice(&raw[32..36]);
+        flags.copy_from_slice(&raw[36..38]);
+        reserved.copy_from_slice(&raw[38..40]);
+        payload_head.copy_from_slice(&raw[40..60]);
+
+        Self {
+            event_id: u128::from_le_bytes(event_id),
+            sequence: u64::from_le_bytes(sequence),
+            unix_ns: u64::from_le_bytes(unix_ns),
+            payload_len: u32::from_le_bytes(payload_len),
+            flags: u16::from_le_bytes(flags),
+            reserved: u16::from_le_bytes(reserved),
+            payload_head,
+        }
+    }
+
+    /// Encode the `repr(C)` layout read by `from_le_bytes`.
+    pub fn to_le_bytes(&self) -> [u8; PACKET_SIZE] {
+        let mut raw = [0u8; PACKET_SIZE];
+        raw[0..16].copy_from_slice(&self.event_id.to_le_bytes());
+        raw[16..24].copy_from_slice(&self.sequence.to_le_bytes());
+        raw[24..32].copy_from_slice(&self.unix_ns.to_le_bytes());
+        raw[32..36].copy_from_slice(&self.payload_len.to_le_bytes());
+        raw[36..38].copy_from_slice(&self.flags.to_le_bytes());
+        raw[38..40].copy_from_slice(&self.reserved.to_le_bytes());
+        raw[40..60].copy_from_slice(&self.payload_head);
+        raw
+    }
+}
+
+/// Default bound on queued packets until `configure_packet_queue` is called.
+pub const DEFAULT_QUEUE_CAPACITY: usize = 65_536;
+
+/// Bounded FIFO of packets and their payloads, drained by `drain_packets`.
+///
+/// A full queue refuses new packets instead of evicting queued ones: every
+/// queued packet has already been acknowledged to its submitter.
+pub struct PacketQueue {
+    entries: VecDeque<(TachyonPacket, Vec<u8>)>,
+    capacity: usize,
+}
+
+impl PacketQueue {
+    pub fn new(capacity: usize) -> Self {
+        Self { entries: VecDeque::new(), capacity: capacity.max(1) }
+    }
+
+    pub fn len(&self) -> usize {
+        self.entries.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+
+    pub fn free(&self) -> usize {
+        self.capacity.saturating_sub(self.entries.len())
+    }
+
+    pub fn push(&mut self, packet: TachyonPacket, payload: Vec<u8>) -> bool {
+        if self.free() == 0 {
+            return false;
+        }
+        self.entries.push_back((packet, payload));
+        true
+    }
+
+    pub fn pop(&mut self, max_packets: usize) -> Vec<(TachyonPacket, Vec<u8>)> {
+        let count = max_packets.min(self.entries.len());
+        self.entries.drain(..count).collect()
+    }
 }
 
-static PACKET_QUEUE: Lazy<Mutex<VecDeque<TachyonPacket>>> =
-    Lazy::new(|| Mutex::new(VecDeque::with_capacity(4096)));
+static PACKET_QUEUE: Lazy<Mutex<PacketQueue>> =
+    Lazy::new(|| Mutex::new(PacketQueue::new(DEFAULT_QUEUE_CAPACITY)));
+
+fn lock_queue() -> PyResult<std::sync::MutexGuard<'static, PacketQueue>> {
+    PACKET_QUEUE
+        .lock()
+        .map_err(|_| PyOverflowError::new_err("packet queue lock poisoned"))
+}
+
+/// Set the queue bound; packets already queued beyond it are kept.
+#[pyfunction]
+pub fn configure_packet_queue(capacity: usize) -> PyResult<()> {
+    lock_queue()?.capacity = capacity.max(1);
+    Ok(())
+}
+
+#[pyfunction]
+pub fn packet_queue_depth() -> PyResult<usize> {
+    Ok(lock_queue()?.len())
+}
 
 /// Submit packet data from Python without JSON serialization in the hot path.
+///
+/// `payload` is any contiguous byte buffer (`bytes`, `bytearray`, `memoryview`);
+/// it is copied once into the queue so `drain_packets` can hand it to the
+/// persistence worker. Raises `OverflowError` when the queue is full.
 #[pyfunction]
 pub fn submit_packet(
     event_id_hi: u64,
     event_id_lo: u64,
     sequence: u64,
     unix_ns: u64,
-    payload: &[u8],
+    payload: PyBuffer<u8>,
     flags: u16,
 ) -> PyResult<usize> {
-    let payload_len = u32::try_from(payload.len())
+    if !payload.is_c_contiguous() {
+        return Err(PyValueError::new_err("payload buffer must be C-contiguous"));
+    }
+    let payload_len = u32::try_from(payload.len_bytes())
         .map_err(|_| PyOverflowError::new_err("payload exceeds u32::MAX"))?;
     let event_id = ((event_id_hi as u128) << 64) | (event_id_lo as u128);
 
-    let packet = TachyonPacket {
-        event_id,
-        sequence,
-        unix_ns,
-        payload_len,
-        flags,
-        reserved: 0,
-        payload_head: {
-            let mut out = [0u8; 20];
-            let n = payload.len().min(20);
-            out[..n].copy_from_slice(&payload[..n]);
-            out
-        },
-    };
-
-    let mut queue = PACKET_QUEUE
-        .lock()
-        .map_err(|_| PyOverflowError::new_err("packet queue lock poisoned"))?;
-    queue.push_back(packet);
+    // SAFETY: the buffer is C-contiguous with `payload_len` bytes and stays
+    // exported until `payload` is dropped at the end of this call.
+    let bytes = unsafe { std::slice::from_raw_parts(payload.buf_ptr() as *const u8, payload_len as usize) };
+    let packet = TachyonPacket::new(event_id, sequence, unix_ns, bytes, flags);
+
+    let mut queue = lock_queue()?;
+    if !queue.push(packet, bytes.to_vec()) {
+        return Err(PyOverflowError::new_err("packet queue full"));
+    }
     Ok(queue.len())
 }
 
+/// Submit a contiguous buffer of packets with one FFI crossing and one lock.
+///
+/// The packets carry no payload beyond their head. The buffer is accepted
+/// whole or, if the queue cannot hold all of it, refused with `OverflowError`.
 #[pyfunction]
-fn drain_packet_count() -> PyResult<usize> {
-    let mut queue = PACKET_QUEUE
-        .lock()
-        .map_err(|_| PyOverflowError::new_err("packet queue lock poisoned"))?;
-    let count = queue.len();
-    queue.clear();
-    Ok(count)
+pub fn submit_packets(packets: PyBuffer<u8>) -> PyResult<usize> {
+    if !packets.is_c_contiguous() {
+        return Err(PyValueError::new_err("packet buffer must be C-contiguous"));
+    }
+    let len = packets.len_bytes();
+    if len % PACKET_SIZE != 0 {
+        return Err(PyValueError::new_err(format!(
+            "packet buffer length {len} is not a multiple of {PACKET_SIZE}"
+        )));
+    }
+    // SAFETY: the buffer is C-contiguous and stays exported (and so alive and
+    // unresized) until `packets` is dropped at the end of this call.
+    let raw = unsafe { std::slice::from_raw_parts(packets.buf_ptr() as *const u8, len) };
+
+    let mut queue = lock_queue()?;
+    if queue.free() < len / PACKET_SIZE {
+        return Err(PyOverflowError::new_err("packet queue full"));
+    }
+    for chunk in raw.chunks_exact(PACKET_SIZE) {
+        let mut packet = [0u8; PACKET_SIZE];
+        packet.copy_from_slice(chunk);
+        queue.push(TachyonPacket::from_le_bytes(&packet), Vec::new());
+    }
+    Ok(queue.len())
+}
+
+/// Remove up to `max_packets` from the head of the queue, oldest first, as
+/// `(packet image, payload)` pairs; the image is the layout of `from_le_bytes`.
+#[pyfunction]
+pub fn drain_packets(py: Python<'_>, max_packets: usize) -> PyResult<Vec<(Py<PyBytes>, Py<PyBytes>)>> {
+    let drained = lock_queue()?.pop(max_packets);
+    Ok(drained
+        .into_iter()
+        .map(|(packet, payload)| {
+            (
+                PyBytes::new_bound(py, &packet.to_le_bytes()).unbind(),
+                PyBytes::new_bound(py, &payload).unbind(),
+            )
+        })
+        .collect())
 }
 
 #[pymodule]
 fn tachyon_core(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
+    m.add_function(wrap_pyfunction!(configure_packet_queue, m)?)?;
+    m.add_function(wrap_pyfunction!(packet_queue_depth, m)?)?;
     m.add_function(wrap_pyfunction!(submit_packet, m)?)?;
-    m.add_function(wrap_pyfunction!(drain_packet_count, m)?)?;
+    m.add_function(wrap_pyfunction!(submit_packets, m)?)?;
+    m.add_function(wrap_pyfunction!(drain_packets, m)?)?;
     Ok(())
 }
 
@@ -112,4 +258,38 @@ mod tests {
         assert_eq!(packet.payload_len, payload.len() as u32);
         assert_eq!(&packet.payload_head[..], &payload[..20]);
     }
+
+    #[test]
+    fn packet_decodes_from_little_endian_image() {
+        let mut raw = [0u8; PACKET_SIZE];
+        raw[0..8].copy_from_slice(&2u64.to_le_bytes());
+        raw[8..16].copy_from_slice(&1u64.to_le_bytes());
+        raw[16..24].copy_from_slice(&10u64.to_le_bytes());
+        raw[24..32].copy_from_slice(&11u64.to_le_bytes());
+        raw[32..36].copy_from_slice(&26u32.to_le_bytes());
+        raw[36..38].copy_from_slice(&0x1u16.to_le_bytes());
+        raw[40..60].copy_from_slice(b"abcdefghijklmnopqrst");
+
+        let expected = TachyonPacket::new((1u128 << 64) | 2, 10, 11, b"abcdefghijklmnopqrstuvwxyz", 0x1);
+        assert_eq!(TachyonPacket::from_le_bytes(&raw), expected);
+    }
+
+    #[test]
+    fn packet_roundtrips_through_little_endian_image() {
+        let packet = TachyonPacket::new((7u128 << 64) | 3, 42, 43, b"payload", 0x2);
+        assert_eq!(TachyonPacket::from_le_bytes(&packet.to_le_bytes()), packet);
+    }
+
+    #[test]
+    fn full_queue_refuses_packets_and_drains_in_order() {
+        let mut queue = PacketQueue::new(2);
+        assert!(queue.push(TachyonPacket::new(1, 1, 0, b"a", 0), b"a".to_vec()));
+        assert!(queue.push(TachyonPacket::new(2, 2, 0, b"b", 0), b"b".to_vec()));
+        assert!(!queue.push(TachyonPacket::new(3, 3, 0, b"c", 0), b"c".to_vec()));
+
+        let drained = queue.pop(8);
+        assert_eq!(drained.iter().map(|(p, _)| p.sequence).collect::<Vec<_>>(), vec![1, 2]);
+        assert_eq!(drained[1].1, b"b".to_vec());
+        assert!(queue.is_empty());
+    }
 }
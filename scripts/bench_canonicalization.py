@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from atr_core.core.canonicalization import (  # noqa: E402
+    canonicalize_json,
+    canonicalize_json_reference,
+)
+
+
+def build_envelope(target_bytes: int) -> dict[str, Any]:
+    envelope: dict[str, Any] = {
+        "header": {
+            "id": "018f3c3b-9b5f-7b2b-9f5c-0d2b4c2f8f11",
+            "source_agent": "agent.bench",
+            "timestamp": 1710000000000000000,
+            "type": "intent.created",
+            "version": "2.0.0",
+        },
+        "meta": {"correlation_id": "bench"},
+        "payload": {},
+    }
+    index = 0
+    while len(canonicalize_json(envelope)) < target_bytes:
+        envelope["payload"][f"k{index:03d}"] = {
+            "v": index,
+            "f": index / 3,
+            "s": f"valeur-é{index}",
+            "l": [1, 2, True, None],
+        }
+        index += 1
+    return envelope
+
+
+def time_us(fn: Callable[[Any], bytes], value: Any, number: int, repeat: int) -> float:
+    return min(timeit.repeat(lambda: fn(value), number=number, repeat=repeat)) / number * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare single-pass and reference canonical encoders")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 4096], help="payload sizes in bytes")
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bytes':>8} {'reference_us':>13} {'single_pass_us':>15} {'speedup':>8}")
+    for size in args.sizes:
+        envelope = build_envelope(size)
+        encoded = canonicalize_json(envelope)
+        if encoded != canonicalize_json_reference(envelope):
+            print(f"output mismatch at {size} bytes")
+            return 1
+        reference = time_us(canonicalize_json_reference, envelope, args.number, args.repeat)
+        single_pass = time_us(canonicalize_json, envelope, args.number, args.repeat)
+        print(f"{len(encoded):>8} {reference:>13.1f} {single_pass:>15.1f} {reference / single_pass:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,7 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-echo "Benchmark entrypoint placeholder."
-echo "Use specs/benchmark_contract.yaml as the source of thresholds and pass/fail rules."
+# Runtime benchmark against specs/benchmark_contract.yaml (default workload W_B).
+# Extra arguments are passed through, e.g. --calibrate, --url, --batch-size.
+cd "$(dirname "$0")/.."
+exec python3 tools/runtime_benchmark.py "$@"
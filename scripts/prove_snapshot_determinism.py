@@ -4,53 +4,226 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
 
-def apply_event(state: dict[str, Any], event: dict[str, Any]) -> None:
-    payload = event.get("payload", {})
-    op = payload.get("op")
-    key = payload.get("key")
+from atr_core.store.state import apply_event, canonical_snapshot_hash  # noqa: E402
+
+# Per-key effect of a contiguous slice of the log, so byte ranges can be
+# replayed independently and folded back in log order:
+#   (kind, value, needs_int_prior, delta)
+# kind "rel" adds delta to the prior value; "set"/"delete" replace it.
+# needs_int_prior records that an incr read the prior value first, so int()
+# conversion errors surface exactly as they would in a sequential replay.
+Effect = tuple[str, Any, bool, int]
+_ABSENT = object()
 
-    if op == "set":
-        state[key] = payload.get("value")
-    elif op == "delete":
-        state.pop(key, None)
-    elif op == "incr":
-        state[key] = int(state.get(key, 0)) + int(payload.get("value", 0))
 
+def iter_events(path: Path, start: int = 0, end: int | None = None) -> Iterator[tuple[int, dict[str, Any]]]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        offset = start
+        for line in handle:
+            offset += len(line)
+            if line.strip():
+                yield offset, json.loads(line)
+            if end is not None and offset >= end:
+                break
 
-def rebuild_snapshot(events: list[dict[str, Any]]) -> dict[str, Any]:
-    state: dict[str, Any] = {}
+
+def rebuild_snapshot(events: Iterator[dict[str, Any]], state: dict[str, Any] | None = None) -> dict[str, Any]:
+    state = {} if state is None else state
     for event in events:
         apply_event(state, event)
     return state
 
 
-def canonical_snapshot_hash(snapshot: dict[str, Any]) -> str:
-    canonical = json.dumps(snapshot, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    return hashlib.blake2b(canonical, digest_size=32).hexdigest()
+def partition_of(key: Any, partitions: int) -> int:
+    digest = hashlib.blake2b(json.dumps(key, sort_keys=True).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % partitions
 
 
-def load_events(path: Path) -> list[dict[str, Any]]:
-    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+def merge_partition_hashes(partition_hashes: list[str]) -> str:
+    merged = hashlib.blake2b(digest_size=32)
+    for index, partition_hash in enumerate(partition_hashes):
+        merged.update(f"{index}:{partition_hash}\n".encode("ascii"))
+    return merged.hexdigest()
+
+
+def _fold(effect: Effect | None, payload: dict[str, Any]) -> Effect | None:
+    op = payload.get("op")
+    needs_int_prior = effect is not None and effect[2]
+    if op == "set":
+        return ("set", payload.get("value"), needs_int_prior, 0)
+    if op == "delete":
+        return ("delete", None, needs_int_prior, 0)
+    if op != "incr":
+        return effect
+    amount = int(payload.get("value", 0))
+    if effect is None or effect[0] == "rel":
+        return ("rel", None, True, (effect[3] if effect else 0) + amount)
+    base = 0 if effect[0] == "delete" else int(effect[1])
+    return ("set", base + amount, needs_int_prior, 0)
+
+
+def _resolve(effect: Effect, prior: Any) -> Any:
+    kind, value, needs_int_prior, delta = effect
+    if needs_int_prior:
+        current = int(0 if prior is _ABSENT else prior)
+        if kind == "rel":
+            return current + delta
+    if kind == "set":
+        return value
+    if kind == "delete":
+        return _ABSENT
+    return prior
+
+
+def replay_range(path: str, start: int, end: int, partitions: int) -> list[dict[Any, Effect]]:
+    effects: list[dict[Any, Effect]] = [{} for _ in range(partitions)]
+    for _, event in iter_events(Path(path), start, end):
+        payload = event.get("payload", {})
+        if payload.get("op") not in ("set", "delete", "incr"):
+            continue
+        key = payload.get("key")
+        table = effects[partition_of(key, partitions)]
+        folded = _fold(table.get(key), payload)
+        if folded is not None:
+            table[key] = folded
+    return effects
+
+
+def reduce_partition(initial: dict[str, Any], ranges: list[dict[Any, Effect]]) -> tuple[str, dict[str, Any]]:
+    state = dict(initial)
+    for effects in ranges:
+        for key, effect in effects.items():
+            value = _resolve(effect, state.get(key, _ABSENT))
+            if value is _ABSENT:
+                state.pop(key, None)
+            else:
+                state[key] = value
+    return canonical_snapshot_hash(state), state
+
+
+def split_ranges(path: Path, start: int, chunks: int) -> list[tuple[int, int]]:
+    size = path.stat().st_size
+    if start >= size:
+        return []
+    step = max(1, (size - start) // max(1, chunks))
+    bounds = [start]
+    with open(path, "rb") as handle:
+        for raw in range(start + step, size, step):
+            handle.seek(raw)
+            handle.readline()  # advance to the next line start
+            aligned = handle.tell()
+            if bounds[-1] < aligned < size:
+                bounds.append(aligned)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def partitioned_rebuild(
+    path: Path,
+    executor: Executor,
+    workers: int,
+    partitions: int,
+    start: int = 0,
+    state: dict[str, Any] | None = None,
+) -> tuple[str, dict[str, Any]]:
+    # Phase 1 replays byte ranges in parallel into per-key effects; phase 2
+    # folds each key partition's effects in log order and hashes it.
+    ranges = split_ranges(path, start, workers * 4)
+    range_effects = list(
+        executor.map(
+            replay_range,
+            [str(path)] * len(ranges),
+            [begin for begin, _ in ranges],
+            [finish for _, finish in ranges],
+            [partitions] * len(ranges),
+        )
+    )
+    initial: list[dict[str, Any]] = [{} for _ in range(partitions)]
+    for key, value in (state or {}).items():
+        initial[partition_of(key, partitions)][key] = value
+    reduced = list(
+        executor.map(
+            reduce_partition,
+            initial,
+            [[effects[partition] for effects in range_effects] for partition in range(partitions)],
+        )
+    )
+    merged_state: dict[str, Any] = {}
+    for _, partition_state in reduced:
+        merged_state.update(partition_state)
+    return merge_partition_hashes([partition_hash for partition_hash, _ in reduced]), merged_state
+
+
+def load_checkpoint(path: Path) -> tuple[int, dict[str, Any]]:
+    if not path.exists():
+        return 0, {}
+    checkpoint = json.loads(path.read_text())
+    state = checkpoint["state"]
+    if canonical_snapshot_hash(state) != checkpoint["snapshot_hash"]:
+        raise ValueError(f"checkpoint {path} does not match its snapshot hash")
+    return int(checkpoint["offset"]), state
+
+
+def write_checkpoint(path: Path, offset: int, state: dict[str, Any]) -> None:
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_text(
+        json.dumps(
+            {"offset": offset, "snapshot_hash": canonical_snapshot_hash(state), "state": state},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+    )
+    os.replace(temporary, path)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Prove deterministic snapshot rebuild from immutable event log")
     parser.add_argument("event_log", type=Path, help="JSONL immutable event log")
     parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1, help=">1: key-partitioned replay across processes")
+    parser.add_argument("--partitions", type=int, default=0, help="key partitions (default: --workers)")
+    parser.add_argument("--checkpoint", type=Path, help="resume from, then advance, this snapshot checkpoint")
     args = parser.parse_args()
 
-    events = load_events(args.event_log)
-    hashes = {canonical_snapshot_hash(rebuild_snapshot(events)) for _ in range(args.runs)}
+    start, initial = load_checkpoint(args.checkpoint) if args.checkpoint else (0, {})
+    end = args.event_log.stat().st_size
+    hashes: set[str] = set()
+    final_state: dict[str, Any] = dict(initial)
+
+    if args.workers > 1:
+        partitions = args.partitions or args.workers
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for _ in range(args.runs):
+                run_hash, final_state = partitioned_rebuild(
+                    args.event_log, executor, args.workers, partitions, start, initial
+                )
+                hashes.add(run_hash)
+        label = f"partitions={partitions} partitioned_hash"
+    else:
+        for _ in range(args.runs):
+            events = (event for _, event in iter_events(args.event_log, start))
+            final_state = rebuild_snapshot(events, dict(initial))
+            hashes.add(canonical_snapshot_hash(final_state))
+        label = "snapshot_hash"
+
     if len(hashes) != 1:
         print("non-deterministic rebuild detected")
         return 1
 
+    if args.checkpoint:
+        write_checkpoint(args.checkpoint, end, final_state)
     stable_hash = next(iter(hashes))
-    print(f"deterministic: runs={args.runs} snapshot_hash={stable_hash}")
+    print(f"deterministic: runs={args.runs} resumed_at={start} {label}={stable_hash}")
     return 0
 
 
@@ -1,5 +1,6 @@
 use anyhow::Result;
 use async_nats::jetstream;
+use async_nats::jetstream::consumer::{pull, AckPolicy, DeliverPolicy};
 use futures_util::StreamExt;
 use std::pin::Pin;
 use std::time::{SystemTime, UNIX_EPOCH};
@@ -13,8 +14,8 @@ pub mod transport {
 
 use transport::atr_transport_server::{AtrTransport, AtrTransportServer};
 use transport::{
-    EnvelopeFrame, HealthRequest, HealthResponse, PublishRequest, PublishResponse, RequestReplyRequest,
-    RequestReplyResponse, SubscribeRequest,
+    EnvelopeFrame, HealthRequest, HealthResponse, PublishBatchRequest, PublishBatchResponse, PublishRequest,
+    PublishResponse, RequestReplyRequest, RequestReplyResponse, SubscribeRequest,
 };
 
 type SubscribeStream = Pin<Box<dyn tokio_stream::Stream<Item = Result<EnvelopeFrame, Status>> + Send>>;
@@ -49,26 +50,138 @@ impl AtrTransport for Sidecar {
         }))
     }
 
+    async fn publish_batch(
+        &self,
+        request: Request<PublishBatchRequest>,
+    ) -> Result<Response<PublishBatchResponse>, Status> {
+        let items = request.into_inner().items;
+
+        // Send every item before awaiting any ack so the whole batch shares one
+        // JetStream round trip instead of paying one per message.
+        let mut pending = Vec::with_capacity(items.len());
+        for item in items {
+            let sent = self
+                .js
+                .publish(item.subject.clone(), item.canonical_envelope.into())
+                .await
+                .map_err(|e| e.to_string());
+            pending.push((item.subject, sent));
+        }
+
+        let mut acks = Vec::with_capacity(pending.len());
+        for (subject, sent) in pending {
+            let ack = match sent {
+                Ok(future) => future.await.map_err(|e| format!("ack failed: {e}")),
+                Err(e) => Err(format!("publish failed: {e}")),
+            };
+            acks.push(match ack {
+                Ok(ack) => PublishResponse {
+                    accepted: true,
+                    persisted: true,
+                    stream_sequence: ack.sequence,
+                    consumer_sequence: 0,
+                    subject,
+                    server_time_unix_ns: now_ns(),
+                    error_code: String::new(),
+                    error_message: String::new(),
+                },
+                Err(message) => PublishResponse {
+                    accepted: false,
+                    persisted: false,
+                    stream_sequence: 0,
+                    consumer_sequence: 0,
+                    subject,
+                    server_time_unix_ns: now_ns(),
+                    error_code: "UNAVAILABLE".to_string(),
+                    error_message: message,
+                },
+            });
+        }
+
+        Ok(Response::new(PublishBatchResponse { acks }))
+    }
+
     type SubscribeStream = SubscribeStream;
 
     async fn subscribe(&self, request: Request<SubscribeRequest>) -> Result<Response<Self::SubscribeStream>, Status> {
         let req = request.into_inner();
-        let mut sub = self
-            .nats
-            .subscribe(req.subject_filter)
+        // Honor the subscriber's credit window; 0 means the previous default.
+        let capacity = match req.max_in_flight {
+            0 => 64,
+            n => n as usize,
+        };
+        let stream_name = self
+            .js
+            .stream_by_subject(req.subject_filter.clone())
+            .await
+            .map_err(|e| Status::not_found(format!("no stream for {}: {e}", req.subject_filter)))?;
+        let stream = self
+            .js
+            .get_stream(stream_name)
+            .await
+            .map_err(|e| Status::unavailable(format!("stream lookup failed: {e}")))?;
+
+        let deliver_policy = if req.start_sequence > 0 {
+            DeliverPolicy::ByStartSequence {
+                start_sequence: req.start_sequence,
+            }
+        } else if req.deliver_all {
+            DeliverPolicy::All
+        } else {
+            DeliverPolicy::New
+        };
+        let config = pull::Config {
+            durable_name: (!req.durable_name.is_empty()).then(|| req.durable_name.clone()),
+            filter_subject: req.subject_filter.clone(),
+            deliver_policy,
+            ack_policy: AckPolicy::Explicit,
+            max_ack_pending: capacity as i64,
+            ..Default::default()
+        };
+        let consumer = if req.durable_name.is_empty() {
+            stream.create_consumer(config).await
+        } else {
+            if req.start_sequence > 0 {
+                // A durable keeps the deliver policy it was created with, so
+                // resuming where the client asks means recreating it there.
+                let _ = stream.delete_consumer(&req.durable_name).await;
+            }
+            stream.get_or_create_consumer(&req.durable_name, config).await
+        }
+        .map_err(|e| Status::unavailable(format!("consumer setup failed: {e}")))?;
+        let mut messages = consumer
+            .messages()
             .await
             .map_err(|e| Status::unavailable(format!("subscribe failed: {e}")))?;
-        let (tx, rx) = tokio::sync::mpsc::channel(64);
+
+        let (tx, rx) = tokio::sync::mpsc::channel(capacity);
         tokio::spawn(async move {
-            while let Some(msg) = sub.next().await {
-                let _ = tx
-                    .send(Ok(EnvelopeFrame {
-                        canonical_envelope: msg.payload.to_vec(),
-                        subject: msg.subject.to_string(),
-                        stream_sequence: 0,
-                        broker_time_unix_ns: now_ns(),
-                    }))
-                    .await;
+            while let Some(next) = messages.next().await {
+                let msg = match next {
+                    Ok(msg) => msg,
+                    Err(e) => {
+                        let _ = tx.send(Err(Status::unavailable(format!("consumer failed: {e}")))).await;
+                        return;
+                    }
+                };
+                let (stream_sequence, broker_time_unix_ns) = match msg.info() {
+                    Ok(info) => (info.stream_sequence, info.published.unix_timestamp_nanos() as i64),
+                    Err(e) => {
+                        let _ = tx.send(Err(Status::internal(format!("bad JetStream reply subject: {e}")))).await;
+                        return;
+                    }
+                };
+                let frame = EnvelopeFrame {
+                    canonical_envelope: msg.payload.to_vec(),
+                    subject: msg.subject.to_string(),
+                    stream_sequence,
+                    broker_time_unix_ns,
+                };
+                // Unacked messages are redelivered to the durable if the client is gone.
+                if tx.send(Ok(frame)).await.is_err() {
+                    return;
+                }
+                let _ = msg.ack().await;
             }
         });
 
@@ -92,6 +92,7 @@ def main() -> int:
     allowed_label_keys: Set[str] = set(contract["allowed_label_keys"])
     forbidden_label_keys: Set[str] = set(contract.get("forbidden_label_keys", []))
     counter_suffixes: List[str] = contract.get("counter_must_end_with", ["_total"])
+    histogram_suffixes: List[str] = contract.get("histogram_must_end_with", ["_seconds", "_bytes"])
 
     found: List[Tuple[str, List[str], str, str]] = []  # (name, labels, kind, file)
 
@@ -130,6 +131,11 @@ def main() -> int:
             if not any(name.endswith(suf) for suf in counter_suffixes):
                 errors.append(f"Counter metric must end with {counter_suffixes}: {name} in {file}")
 
+        # Histograms/summaries observe a unit (stage timers, sizes)
+        if kind in ("Histogram", "Summary"):
+            if not any(name.endswith(suf) for suf in histogram_suffixes):
+                errors.append(f"{kind} metric must end with {histogram_suffixes}: {name} in {file}")
+
     if errors:
         print("[FAIL] Metrics contract violations:")
         for e in errors:
@@ -11,221 +11,25 @@ Output:
 This is a formula-based analytical estimator, not a runtime benchmark.
 """
 
-from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 import os
-
-
-# =============================
-# MODEL
-# =============================
-
-
-@dataclass
-class PerfParams:
-    # Base times (microseconds)
-    t_py_us: float = 5.0
-    t_bridge_us: float = 50.0
-    t_persist_us: float = 0.0
-    t_rust_us_per_msg: float = 0.1
-
-    # Multi-core scaling
-    cores: int = 8
-    parallel_fraction: float = 0.90
-
-    # Optional ceilings (ops/sec)
-    io_ceiling_ops_sec: Optional[float] = None
-    nic_ceiling_ops_sec: Optional[float] = None
-    app_ceiling_ops_sec: Optional[float] = None
-
-
-@dataclass
-class BatchOptSpec:
-    latency_budget_us: float = 0.5
-    target_ops_sec: Optional[float] = None
-    n_min: int = 1
-    n_max: int = 65536
-    use_powers_of_two: bool = True
-    include_round_numbers: bool = True
-
-
-# =============================
-# CORE MATH
-# =============================
-
-
-def amdahl_speedup(cores: int, parallel_fraction: float) -> float:
-    if cores <= 1:
-        return 1.0
-    p = max(0.0, min(1.0, parallel_fraction))
-    return 1.0 / ((1.0 - p) + (p / float(cores)))
-
-
-def batch_time_us(params: PerfParams, batch_size: int) -> float:
-    if batch_size <= 0:
-        raise ValueError("batch_size must be >= 1")
-    return (
-        params.t_py_us
-        + params.t_bridge_us
-        + params.t_persist_us
-        + (batch_size * params.t_rust_us_per_msg)
-    )
-
-
-def effective_latency_us(params: PerfParams, batch_size: int) -> float:
-    return batch_time_us(params, batch_size) / float(batch_size)
-
-
-def throughput_single_core_ops_sec(params: PerfParams, batch_size: int) -> float:
-    t_batch = batch_time_us(params, batch_size)
-    return (batch_size / t_batch) * 1_000_000.0
-
-
-def apply_ceilings(params: PerfParams, ops_sec: float) -> float:
-    for cap in (
-        params.io_ceiling_ops_sec,
-        params.nic_ceiling_ops_sec,
-        params.app_ceiling_ops_sec,
-    ):
-        if cap is not None:
-            ops_sec = min(ops_sec, float(cap))
-    return ops_sec
-
-
-def throughput_scaled_ops_sec(params: PerfParams, batch_size: int) -> float:
-    r1 = throughput_single_core_ops_sec(params, batch_size)
-    speedup = amdahl_speedup(params.cores, params.parallel_fraction)
-    return apply_ceilings(params, r1 * speedup)
-
-
-def rust_ceiling_single_core_ops_sec(params: PerfParams) -> float:
-    return 1_000_000.0 / params.t_rust_us_per_msg
-
-
-def rust_ceiling_scaled_ops_sec(params: PerfParams) -> float:
-    speedup = amdahl_speedup(params.cores, params.parallel_fraction)
-    return apply_ceilings(params, rust_ceiling_single_core_ops_sec(params) * speedup)
-
-
-# =============================
-# OPTIMIZER
-# =============================
-
-
-def candidate_batch_sizes(spec: BatchOptSpec) -> List[int]:
-    candidates = {max(1, spec.n_min), spec.n_max}
-
-    if spec.use_powers_of_two:
-        n = 1
-        while n <= spec.n_max:
-            if n >= spec.n_min:
-                candidates.add(n)
-            n <<= 1
-
-    if spec.include_round_numbers:
-        for n in (
-            2,
-            4,
-            8,
-            16,
-            32,
-            64,
-            128,
-            256,
-            512,
-            1000,
-            1024,
-            2048,
-            4096,
-            8192,
-            16384,
-            32768,
-            65536,
-        ):
-            if spec.n_min <= n <= spec.n_max:
-                candidates.add(n)
-
-    return sorted(candidates)
-
-
-def optimize_batch_size(params: PerfParams, spec: BatchOptSpec) -> Dict[str, object]:
-    candidates = candidate_batch_sizes(spec)
-
-    best: Optional[Tuple[int, float]] = None
-    feasible: List[Tuple[int, float, float]] = []
-
-    for batch_size in candidates:
-        latency = effective_latency_us(params, batch_size)
-        throughput = throughput_scaled_ops_sec(params, batch_size)
-
-        if latency > spec.latency_budget_us:
-            continue
-        if spec.target_ops_sec is not None and throughput < spec.target_ops_sec:
-            continue
-
-        feasible.append((batch_size, throughput, latency))
-        if best is None or throughput > best[1]:
-            best = (batch_size, throughput)
-
-    if best is None:
-        by_latency = min(
-            (
-                (n, throughput_scaled_ops_sec(params, n), effective_latency_us(params, n))
-                for n in candidates
-            ),
-            key=lambda x: x[2],
-        )
-        by_throughput = max(
-            (
-                (n, throughput_scaled_ops_sec(params, n), effective_latency_us(params, n))
-                for n in candidates
-            ),
-            key=lambda x: x[1],
-        )
-        return {
-            "ok": False,
-            "reason": "No batch size satisfies constraints.",
-            "constraints": {
-                "latency_budget_us": spec.latency_budget_us,
-                "target_ops_sec": spec.target_ops_sec,
-                "n_min": spec.n_min,
-                "n_max": spec.n_max,
-            },
-            "closest_lowest_latency": {
-                "N": by_latency[0],
-                "throughput_ops_sec": by_latency[1],
-                "latency_us": by_latency[2],
-            },
-            "closest_highest_throughput": {
-                "N": by_throughput[0],
-                "throughput_ops_sec": by_throughput[1],
-                "latency_us": by_throughput[2],
-            },
-        }
-
-    n_best, throughput_best = best
-    latency_best = effective_latency_us(params, n_best)
-    frontier = [
-        {"N": n, "throughput_ops_sec": t, "latency_us": l}
-        for (n, t, l) in sorted(feasible, key=lambda x: x[1], reverse=True)[:5]
-    ]
-
-    return {
-        "ok": True,
-        "best": {
-            "N": n_best,
-            "throughput_ops_sec": throughput_best,
-            "latency_us": latency_best,
-        },
-        "constraints": {
-            "latency_budget_us": spec.latency_budget_us,
-            "target_ops_sec": spec.target_ops_sec,
-            "n_min": spec.n_min,
-            "n_max": spec.n_max,
-        },
-        "frontier_top5": frontier,
-    }
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from atr_core.perf_model import (  # noqa: E402
+    BatchOptSpec,
+    PerfParams,
+    amdahl_speedup,
+    effective_latency_us,
+    optimize_batch_size,
+    rust_ceiling_scaled_ops_sec,
+    rust_ceiling_single_core_ops_sec,
+    throughput_scaled_ops_sec,
+    throughput_single_core_ops_sec,
+)
 
 
 def estimate_curve(params: PerfParams, batch_sizes: Iterable[int]) -> Dict[int, Dict[str, float]]:
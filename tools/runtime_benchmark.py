@@ -0,0 +1,580 @@
+"""
+ATR Runtime Benchmark — load generator for specs/benchmark_contract.yaml
+Document: ATR-PERF-REPORT-2026
+
+Usage:
+    python tools/runtime_benchmark.py [--workload W_B] [--requests 20000] [--concurrency 64]
+    python tools/runtime_benchmark.py --url http://127.0.0.1:8080      # drive a running server
+    python tools/runtime_benchmark.py --calibrate                      # also fit PerfParams
+
+Output:
+    reports/runtime_benchmark_<workload>.md
+    reports/runtime_benchmark_<workload>.json
+    reports/atr_performance_report_calibrated.md   (--calibrate)
+
+Signs synthetic envelopes up front, then drives /v1/submit (or /v1/submit/batch)
+either on a running server or in-process against the FastAPI app wired to a
+local stub ATB-ET gRPC server. Latency is measured from each request's
+intended start time, so an open-loop --rate does not hide queueing delay.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import yaml
+from nacl.signing import SigningKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from atr_core.core.canonicalization import canonical_input, canonicalize_json  # noqa: E402
+from atr_core.core.security import canonical_hash  # noqa: E402
+from atr_core.perf_model import BatchOptSpec, PerfParams  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CONTRACT_PATH = REPO_ROOT / "specs" / "benchmark_contract.yaml"
+# Latency histogram upper bounds in milliseconds; the last bucket is open.
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0)
+PERCENTILES = (("p50", 50.0), ("p95", 95.0), ("p99", 99.0), ("p99_9", 99.9), ("max", 100.0))
+
+
+# =============================
+# WORKLOAD
+# =============================
+
+
+@dataclass(frozen=True)
+class Workload:
+    id: str
+    name: str
+    payload_bytes: int
+    target_throughput_msg_s: float
+    e2e_latency_p99_ms: float
+
+
+def load_workload(workload_id: str, profile: str, contract_path: Path = CONTRACT_PATH) -> Workload:
+    contract = yaml.safe_load(contract_path.read_text())
+    for workload in contract["workloads"]:
+        if workload["id"] == workload_id:
+            return Workload(
+                id=workload["id"],
+                name=workload["name"],
+                payload_bytes=int(workload["payload_bytes"]),
+                target_throughput_msg_s=float(workload["target_throughput_msg_s"][profile]),
+                e2e_latency_p99_ms=float(workload["e2e_latency_p99_ms"][profile]),
+            )
+    raise ValueError(f"workload {workload_id!r} not found in {contract_path}")
+
+
+def _b64u(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def uuid7() -> str:
+    value = (time.time_ns() // 1_000_000) << 80 | 0x7 << 76 | secrets.randbits(12) << 64
+    value |= 0b10 << 62 | secrets.randbits(62)
+    text = f"{value:032x}"
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def make_envelopes(workload: Workload, count: int, agents: int = 16) -> List[Dict[str, Any]]:
+    keys = [SigningKey.generate() for _ in range(max(1, agents))]
+    envelopes: List[Dict[str, Any]] = []
+    for index in range(count):
+        signing_key = keys[index % len(keys)]
+        body: Dict[str, Any] = {
+            "header": {
+                "id": uuid7(),
+                "timestamp": time.time_ns(),
+                "source_agent": signing_key.verify_key.encode().hex(),
+                "type": "telemetry.standard",
+                "version": "2.0.0",
+            },
+            "meta": {"security_level": "public", "correlation_id": f"bench-{index}"},
+            "payload": {"op": "set", "key": f"sensor-{index % 1024}", "value": ""},
+        }
+        # Pad the payload so its canonical form is workload.payload_bytes long.
+        padding = workload.payload_bytes - len(canonicalize_json(body["payload"]))
+        body["payload"]["value"] = "x" * max(0, padding)
+        digest = canonical_hash(canonicalize_json(canonical_input(body)))
+        body["signature"] = _b64u(signing_key.sign(digest).signature)
+        envelopes.append(body)
+    return envelopes
+
+
+# =============================
+# STUB ATB-ET SIDECAR
+# =============================
+
+
+class StubSidecar:
+    """In-process stand-in for the ATB-ET gRPC sidecar.
+
+    Acknowledges every publish with a monotonically increasing stream
+    sequence after an optional simulated persist delay, and counts what it
+    persisted so lost events can be detected.
+    """
+
+    def __init__(self, persist_us: float = 0.0, workers: int = 16) -> None:
+        from atr_core.proto import atr_transport_pb2 as pb2
+        import grpc
+
+        self._pb2 = pb2
+        self._persist_s = persist_us / 1_000_000.0
+        self._lock = threading.Lock()
+        self.persisted: Dict[str, int] = {}
+        self._sequence = 0
+        self._directory = tempfile.TemporaryDirectory(prefix="atr-bench-")
+        self.target = f"unix://{self._directory.name}/atb_et.sock"
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+        self._server.add_generic_rpc_handlers(
+            (
+                grpc.method_handlers_generic_handler(
+                    "atr.transport.v1.AtrTransport",
+                    {
+                        "Publish": grpc.unary_unary_rpc_method_handler(
+                            self._publish,
+                            request_deserializer=pb2.PublishRequest.FromString,
+                            response_serializer=pb2.PublishResponse.SerializeToString,
+                        ),
+                        "PublishBatch": grpc.unary_unary_rpc_method_handler(
+                            self._publish_batch,
+                            request_deserializer=pb2.PublishBatchRequest.FromString,
+                            response_serializer=pb2.PublishBatchResponse.SerializeToString,
+                        ),
+                        "Health": grpc.unary_unary_rpc_method_handler(
+                            self._health,
+                            request_deserializer=pb2.HealthRequest.FromString,
+                            response_serializer=pb2.HealthResponse.SerializeToString,
+                        ),
+                    },
+                ),
+            )
+        )
+        self._server.add_insecure_port(self.target)
+
+    def start(self) -> "StubSidecar":
+        self._server.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.stop(None)
+        self._directory.cleanup()
+
+    def persisted_total(self, subject_prefix: str = "") -> int:
+        with self._lock:
+            return sum(count for subject, count in self.persisted.items() if subject.startswith(subject_prefix))
+
+    def _ack(self, request: Any) -> Any:
+        if self._persist_s:
+            time.sleep(self._persist_s)
+        with self._lock:
+            self.persisted[request.subject] = self.persisted.get(request.subject, 0) + 1
+            self._sequence += 1
+            sequence = self._sequence
+        return self._pb2.PublishResponse(accepted=True, persisted=True, stream_sequence=sequence)
+
+    def _publish(self, request: Any, context: Any) -> Any:  # noqa: ARG002
+        return self._ack(request)
+
+    def _publish_batch(self, request: Any, context: Any) -> Any:  # noqa: ARG002
+        return self._pb2.PublishBatchResponse(acks=[self._ack(item) for item in request.items])
+
+    def _health(self, request: Any, context: Any) -> Any:  # noqa: ARG002
+        return self._pb2.HealthResponse(ok=True, backlog_msgs=0)
+
+
+# =============================
+# LOAD GENERATION
+# =============================
+
+
+@dataclass
+class RunResult:
+    latencies_ms: List[float] = field(default_factory=list)
+    completions: List[float] = field(default_factory=list)  # seconds since start, per accepted envelope
+    errors: Dict[str, int] = field(default_factory=dict)
+    accepted: int = 0
+    sent: int = 0
+    elapsed_s: float = 0.0
+
+    def error(self, kind: str, count: int = 1) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + count
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    envelopes: List[Dict[str, Any]],
+    concurrency: int,
+    batch_size: int = 1,
+    rate: Optional[float] = None,
+) -> RunResult:
+    requests = [envelopes[i : i + batch_size] for i in range(0, len(envelopes), batch_size)]
+    result = RunResult()
+    next_request = iter(range(len(requests)))
+    start = time.perf_counter()
+
+    async def worker() -> None:
+        for index in next_request:
+            intended = start + index / rate if rate else time.perf_counter()
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            items = requests[index]
+            try:
+                if batch_size == 1:
+                    response = await client.post("/v1/submit", json=items[0])
+                else:
+                    response = await client.post("/v1/submit/batch", json=items)
+            except httpx.HTTPError as exc:
+                result.error(f"transport:{type(exc).__name__}", len(items))
+                continue
+            finished = time.perf_counter()
+            result.latencies_ms.append((finished - intended) * 1000.0)
+            result.sent += len(items)
+            accepted = _count_accepted(response, items, result, batch_size > 1)
+            result.accepted += accepted
+            result.completions.extend([finished - start] * accepted)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def _count_accepted(response: httpx.Response, items: List[Dict[str, Any]], result: RunResult, batch: bool) -> int:
+    if response.status_code >= 300:
+        result.error(f"http_{response.status_code}", len(items))
+        return 0
+    if not batch:
+        return 1
+    accepted = 0
+    for item in response.json()["results"]:
+        if item["status"] == "accepted":
+            accepted += 1
+        else:
+            result.error(f"item_{item['status']}_{item['status_code']}")
+    return accepted
+
+
+# =============================
+# STATISTICS
+# =============================
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))  # nearest-rank
+    return ordered[min(len(ordered), int(rank)) - 1]
+
+
+def latency_percentiles(latencies_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies_ms)
+    return {name: percentile(ordered, pct) for name, pct in PERCENTILES}
+
+
+def latency_histogram(latencies_ms: List[float]) -> List[Dict[str, Any]]:
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for latency in latencies_ms:
+        for position, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if latency <= bound:
+                counts[position] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<= {bound:g}" for bound in HISTOGRAM_BOUNDS_MS] + [f"> {HISTOGRAM_BOUNDS_MS[-1]:g}"]
+    return [{"le_ms": label, "count": count} for label, count in zip(labels, counts)]
+
+
+def throughput_over_time(completions: List[float], elapsed_s: float, interval_s: float) -> List[Dict[str, float]]:
+    buckets = [0] * max(1, int(-(-elapsed_s // interval_s)))
+    for finished in completions:
+        buckets[min(len(buckets) - 1, int(finished // interval_s))] += 1
+    return [
+        {"t_s": round(position * interval_s, 3), "msg_s": count / interval_s}
+        for position, count in enumerate(buckets)
+    ]
+
+
+def summarize(
+    workload: Workload,
+    profile: str,
+    result: RunResult,
+    interval_s: float,
+    lost_events: Optional[int],
+) -> Dict[str, Any]:
+    throughput = result.accepted / result.elapsed_s if result.elapsed_s else 0.0
+    percentiles = latency_percentiles(result.latencies_ms)
+    return {
+        "workload": asdict(workload),
+        "profile": profile,
+        "sent": result.sent,
+        "accepted": result.accepted,
+        "elapsed_s": result.elapsed_s,
+        "throughput_msg_s": throughput,
+        "latency_ms": percentiles,
+        "latency_histogram": latency_histogram(result.latencies_ms),
+        "throughput_over_time": throughput_over_time(result.completions, result.elapsed_s, interval_s),
+        "error_breakdown": dict(sorted(result.errors.items())),
+        "lost_event_count": lost_events,
+        "slo": {
+            "throughput_ok": throughput >= workload.target_throughput_msg_s,
+            "latency_p99_ok": percentiles["p99"] <= workload.e2e_latency_p99_ms,
+            "lost_events_ok": not lost_events,
+        },
+    }
+
+
+# =============================
+# CALIBRATION
+# =============================
+
+
+@dataclass
+class StageTimer:
+    samples_us: List[float] = field(default_factory=list)
+
+    def median_us(self) -> float:
+        ordered = sorted(self.samples_us)
+        return percentile(ordered, 50.0)
+
+
+def _timed_sync(timer: StageTimer, call: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            timer.samples_us.append((time.perf_counter() - started) * 1_000_000.0)
+
+    return wrapper
+
+
+def _timed_async(timer: StageTimer, call: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await call(*args, **kwargs)
+        finally:
+            timer.samples_us.append((time.perf_counter() - started) * 1_000_000.0)
+
+    return wrapper
+
+
+async def calibrate(
+    app_module: Any,
+    client: httpx.AsyncClient,
+    envelopes: List[Dict[str, Any]],
+    persist_us: float,
+) -> Dict[str, Any]:
+    # Serial requests so the stage timings are service times, not queueing.
+    immune_timer, publish_timer, request_timer = StageTimer(), StageTimer(), StageTimer()
+    evaluate, publish = app_module.immune.evaluate, app_module.transport.publish
+    app_module.immune.evaluate = _timed_sync(immune_timer, evaluate)
+    app_module.transport.publish = _timed_async(publish_timer, publish)
+    try:
+        for envelope in envelopes:
+            started = time.perf_counter()
+            await client.post("/v1/submit", json=envelope)
+            request_timer.samples_us.append((time.perf_counter() - started) * 1_000_000.0)
+    finally:
+        app_module.immune.evaluate = evaluate
+        app_module.transport.publish = publish
+
+    stages = {
+        "request_us": request_timer.median_us(),
+        "immune_us": immune_timer.median_us(),
+        "publish_us": publish_timer.median_us(),
+    }
+    params = replace(
+        PerfParams(),
+        t_py_us=round(max(0.0, stages["request_us"] - stages["publish_us"]), 3),
+        t_bridge_us=round(max(0.0, stages["publish_us"] - persist_us), 3),
+        t_persist_us=persist_us,
+        cores=os.cpu_count() or 1,
+    )
+    return {"samples": len(envelopes), "stages_median_us": stages, "perf_params": asdict(params)}
+
+
+# =============================
+# REPORTING
+# =============================
+
+
+def generate_markdown_report(summary: Dict[str, Any], calibration: Optional[Dict[str, Any]]) -> str:
+    timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    workload = summary["workload"]
+    slo = summary["slo"]
+
+    lines: List[str] = []
+    lines.append(f"# ATR Runtime Benchmark — {workload['id']} ({workload['name']})")
+    lines.append(f"_Generated: {timestamp}_")
+    lines.append("")
+
+    lines.append("## 1) Run")
+    lines.append(f"- Profile: **{summary['profile']}**")
+    lines.append(f"- Payload: **{workload['payload_bytes']} bytes**")
+    lines.append(f"- Envelopes sent / accepted: **{summary['sent']:,} / {summary['accepted']:,}**")
+    lines.append(f"- Elapsed: **{summary['elapsed_s']:.2f} s**")
+    lines.append(
+        f"- Throughput: **{summary['throughput_msg_s']:,.0f} msg/s** "
+        f"(target {workload['target_throughput_msg_s']:,.0f}, {'PASS' if slo['throughput_ok'] else 'FAIL'})"
+    )
+    lost = summary["lost_event_count"]
+    lines.append(f"- Lost events: **{'n/a' if lost is None else lost}**")
+    lines.append("")
+
+    lines.append("## 2) Latency Percentiles (ms)")
+    lines.append("| " + " | ".join(summary["latency_ms"]) + " |")
+    lines.append("|" + "---:|" * len(summary["latency_ms"]))
+    lines.append("| " + " | ".join(f"{value:.3f}" for value in summary["latency_ms"].values()) + " |")
+    lines.append(
+        f"- p99 target: **{workload['e2e_latency_p99_ms']:g} ms** ({'PASS' if slo['latency_p99_ok'] else 'FAIL'})"
+    )
+    lines.append("")
+
+    lines.append("## 3) Latency Histogram")
+    lines.append("| Bucket (ms) | Count |")
+    lines.append("|---|---:|")
+    for bucket in summary["latency_histogram"]:
+        lines.append(f"| {bucket['le_ms']} | {bucket['count']:,} |")
+    lines.append("")
+
+    lines.append("## 4) Throughput Over Time")
+    lines.append("| t (s) | msg/s |")
+    lines.append("|---:|---:|")
+    for point in summary["throughput_over_time"]:
+        lines.append(f"| {point['t_s']:g} | {point['msg_s']:,.0f} |")
+    lines.append("")
+
+    lines.append("## 5) Error Breakdown")
+    if summary["error_breakdown"]:
+        lines.append("| Error | Count |")
+        lines.append("|---|---:|")
+        for kind, count in summary["error_breakdown"].items():
+            lines.append(f"| {kind} | {count:,} |")
+    else:
+        lines.append("- No errors.")
+    lines.append("")
+
+    if calibration is not None:
+        lines.append("## 6) Calibrated PerfParams")
+        for stage, value in calibration["stages_median_us"].items():
+            lines.append(f"- {stage} (median): **{value:.1f} µs**")
+        params = ", ".join(f"{key}={value}" for key, value in calibration["perf_params"].items())
+        lines.append(f"- `PerfParams({params})`")
+        lines.append("")
+
+    lines.append("---")
+    lines.append("Single-process measurement; reconcile with the contract's cluster conditions before sign-off.")
+    return "\n".join(lines)
+
+
+# =============================
+# ENTRYPOINT
+# =============================
+
+
+async def _run(args: argparse.Namespace, workload: Workload) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    envelopes = make_envelopes(workload, args.requests + args.warmup, agents=args.agents)
+    warmup, measured = envelopes[: args.warmup], envelopes[args.warmup :]
+    timeout = httpx.Timeout(30.0)
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            await run_load(client, warmup, args.concurrency, args.batch_size)
+            result = await run_load(client, measured, args.concurrency, args.batch_size, args.rate)
+        return summarize(workload, args.profile, result, args.interval_s, None), None
+
+    from atr_core.api import app as app_module
+    from atr_core.transport.aio import AsyncAtrTransportClient
+
+    sidecar = StubSidecar(persist_us=args.persist_us).start()
+    app_module.transport = AsyncAtrTransportClient(
+        sidecar.target,
+        app_module.config.transport.timeout_ms,
+        max_in_flight=app_module.config.transport.max_in_flight,
+    )
+    calibration = None
+    try:
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://atr", timeout=timeout) as client:
+            await run_load(client, warmup, args.concurrency, args.batch_size)
+            before = sidecar.persisted_total("aether.stream.")
+            result = await run_load(client, measured, args.concurrency, args.batch_size, args.rate)
+            lost = result.accepted - (sidecar.persisted_total("aether.stream.") - before)
+            if args.calibrate:
+                samples = make_envelopes(workload, args.calibration_samples, agents=args.agents)
+                calibration = await calibrate(app_module, client, samples, args.persist_us)
+    finally:
+        await app_module.transport.close()
+        sidecar.stop()
+    return summarize(workload, args.profile, result, args.interval_s, lost), calibration
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Runtime benchmark for specs/benchmark_contract.yaml")
+    parser.add_argument("--workload", default="W_B")
+    parser.add_argument("--profile", default="containerized", choices=("containerized", "tachyon"))
+    parser.add_argument("--requests", type=int, default=20000, help="envelopes in the measured run")
+    parser.add_argument("--warmup", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1, help=">1: drive /v1/submit/batch")
+    parser.add_argument("--rate", type=float, help="open-loop request rate per second (default: closed loop)")
+    parser.add_argument("--agents", type=int, default=16, help="distinct signing keys")
+    parser.add_argument("--interval-s", type=float, default=1.0, help="throughput-over-time bucket width")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--persist-us", type=float, default=0.0, help="stub sidecar persist delay")
+    parser.add_argument("--calibrate", action="store_true", help="fit PerfParams from measured stage costs")
+    parser.add_argument("--calibration-samples", type=int, default=2000)
+    parser.add_argument("--output-dir", type=Path, default=Path("reports"))
+    parser.add_argument("--enforce", action="store_true", help="exit 1 when a contract threshold is missed")
+    args = parser.parse_args()
+    if args.url and args.calibrate:
+        parser.error("--calibrate needs the in-process app; drop --url")
+
+    workload = load_workload(args.workload, args.profile)
+    summary, calibration = asyncio.run(_run(args, workload))
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stem = args.output_dir / f"runtime_benchmark_{workload.id}"
+    stem.with_suffix(".json").write_text(
+        json.dumps({"summary": summary, "calibration": calibration}, indent=2) + "\n", encoding="utf-8"
+    )
+    stem.with_suffix(".md").write_text(generate_markdown_report(summary, calibration) + "\n", encoding="utf-8")
+    print(f"Report generated: {stem.with_suffix('.md')}")
+    print(
+        f"{workload.id}: {summary['throughput_msg_s']:,.0f} msg/s, "
+        + ", ".join(f"{name}={value:.3f}ms" for name, value in summary["latency_ms"].items())
+    )
+
+    if calibration is not None:
+        from perf_estimator import generate_markdown_report as estimator_report
+
+        calibrated = args.output_dir / "atr_performance_report_calibrated.md"
+        calibrated.write_text(estimator_report(PerfParams(**calibration["perf_params"]), BatchOptSpec()), encoding="utf-8")
+        print(f"Calibrated estimator report: {calibrated}")
+
+    if args.enforce and not all(summary["slo"].values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())